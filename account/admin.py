@@ -1,21 +1,24 @@
-from django.contrib import admin
-from .models import User, Application
-from django.contrib.auth.admin import UserAdmin
-
-# Register your models here.
-
-class Useradmin(UserAdmin):
-    list_display=('email','name')
-    search_fields = ('email',)
-    ordering = ('email',)
-    
-    filter_horizontal=()
-    list_filter=()
-    fieldsets=()
-
-
-admin.site.register(User, Useradmin)
-
-admin.site.register(Application)
-
+from django.contrib import admin
+from .models import User, Application, Job, SchoolSetting
+from django.contrib.auth.admin import UserAdmin
+
+# Register your models here.
+
+class Useradmin(UserAdmin):
+    list_display=('email','name')
+    search_fields = ('email',)
+    ordering = ('email',)
+    
+    filter_horizontal=()
+    list_filter=()
+    fieldsets=()
+
+
+admin.site.register(User, Useradmin)
+
+admin.site.register(Application)
+
+admin.site.register(Job)
+admin.site.register(SchoolSetting)
+
 # admin.site.register(User)
\ No newline at end of file
@@ -0,0 +1,66 @@
+# account/async_api.py
+"""
+Plumbing for the async read endpoints mounted under /api/async/.
+
+DRF views are synchronous, so these are plain Django async views: token
+authentication through `aauthenticate` (same caches as the DRF path), a role
+check, and responses rendered with the first DEFAULT_RENDERER_CLASSES entry
+so bodies match the synchronous endpoints byte for byte. Database access goes
+through the async ORM (afirst / async for); Django still runs each query on
+its thread-sensitive executor, but the request does not occupy a worker
+thread while it waits.
+Reads go through the replica alias when the production SQLite profile is on.
+"""
+from functools import wraps
+
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+
+from home.db_routers import read_replica
+
+from .authentication import aauthenticate
+
+_renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        _renderer.render(data), status=status_code, headers=headers,
+        content_type=_renderer.media_type,
+    )
+
+
+def async_endpoint(*roles):
+    """
+    Decorator for async GET views: authenticates the request (401 otherwise),
+    requires `request.user.role` in `roles` (403 otherwise), then sets
+    `request.user` and awaits the view. A ValidationError from the view is a
+    400, as in DRF.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return render({"detail": f'Method "{request.method}" not allowed.'},
+                              status.HTTP_405_METHOD_NOT_ALLOWED, headers={"Allow": "GET, HEAD"})
+            try:
+                user = await aauthenticate(request)
+            except exceptions.AuthenticationFailed as exc:
+                return render({"detail": exc.detail}, status.HTTP_401_UNAUTHORIZED,
+                              headers={"WWW-Authenticate": "Token"})
+            if user is None:
+                return render({"detail": exceptions.NotAuthenticated.default_detail},
+                              status.HTTP_401_UNAUTHORIZED, headers={"WWW-Authenticate": "Token"})
+            if roles and user.role not in roles:
+                return render({"detail": exceptions.PermissionDenied.default_detail},
+                              status.HTTP_403_FORBIDDEN)
+            request.user = user
+            # every endpoint here is read-only
+            with read_replica():
+                try:
+                    return await view(request, *args, **kwargs)
+                except exceptions.ValidationError as exc:  # e.g. an unknown ?fields= name
+                    return render(exc.detail, status.HTTP_400_BAD_REQUEST)
+        return wrapper
+    return decorator
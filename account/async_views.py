@@ -0,0 +1,28 @@
+# account/async_views.py
+"""Async counterparts of the application listings (see account.async_api)."""
+from asgiref.sync import sync_to_async
+from rest_framework.request import Request
+
+from .async_api import async_endpoint, render
+from .models import Application
+from .pagination import ApplicationQueueCursorPagination
+from .serializers import ApplicationSerializer
+
+
+async def _application_page(request, status):
+    paginator = ApplicationQueueCursorPagination()
+    reader = ApplicationSerializer.compiled_reader({'request': request})
+    applications = reader.values(Application.objects.filter(status=status), keep=paginator.ordering)
+    # CursorPagination slices and evaluates the queryset itself
+    page = await sync_to_async(paginator.paginate_queryset)(applications, Request(request))
+    return render(paginator.get_paginated_response(reader.data(page)).data)
+
+
+@async_endpoint('schooladmin')
+async def pending_applications(request):
+    return await _application_page(request, 'pending')
+
+
+@async_endpoint('superadmin')
+async def school_verified_applications(request):
+    return await _application_page(request, 'school_verified')
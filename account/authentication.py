@@ -0,0 +1,138 @@
+# account/authentication.py
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from student.models import Student
+from teacher.models import Teacher
+from .caching import LRUCache, shared_ttl
+from .models import User
+
+TOKEN_CACHE_TTL = shared_ttl(getattr(settings, "AUTH_TOKEN_CACHE_TTL", 300))
+
+# Per-process copy in front of the shared cache (settings.CACHES). Other workers
+# cannot evict it, so with a shared cache its TTL bounds how long a logout or
+# deactivation takes to reach every process; shared_ttl() keeps that bound if
+# the cache is process-local after all.
+_local_tokens = LRUCache(
+    maxsize=getattr(settings, "AUTH_TOKEN_LOCAL_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "AUTH_TOKEN_LOCAL_CACHE_TTL", 30),
+)
+
+
+def _cache_key(key):
+    return f"auth:token:{key}"
+
+
+def _deferred_instance(model, **values):
+    """Model instance with only `values` loaded; other fields load lazily on access."""
+    names = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db(None, names, [values[name] for name in names])
+
+
+def _identity_query(key):
+    return Token.objects.filter(key=key).values(
+        "user_id", "user__role", "user__is_active", "user__teacher", "user__student"
+    )
+
+
+def _identity(row):
+    if row is None:
+        raise exceptions.AuthenticationFailed(_("Invalid token."))
+    return {
+        "user_id": row["user_id"],
+        "role": row["user__role"],
+        "is_active": row["user__is_active"],
+        "teacher_pk": row["user__teacher"],
+        "student_pk": row["user__student"],
+    }
+
+
+def _load_identity(key):
+    return _identity(_identity_query(key).first())
+
+
+async def _aload_identity(key):
+    return _identity(await _identity_query(key).afirst())
+
+
+def _build_user(identity):
+    user = _deferred_instance(
+        User, id=identity["user_id"], role=identity["role"], is_active=identity["is_active"]
+    )
+    # Prime the reverse one-to-one caches so `request.user.teacher` (or its
+    # absence) costs no query. A cached None raises RelatedObjectDoesNotExist.
+    for name, model, pk in (("teacher", Teacher, identity["teacher_pk"]),
+                            ("student", Student, identity["student_pk"])):
+        profile = None
+        if pk is not None:
+            profile = _deferred_instance(model, user_id=pk)
+            profile._state.fields_cache["user"] = user
+        user._state.fields_cache[name] = profile
+    return user
+
+
+def invalidate_token(key):
+    _local_tokens.delete(key)
+    cache.delete(_cache_key(key))
+
+
+def invalidate_user(user_ids):
+    """Drop cached identities for these users (role/active/profile changed)."""
+    for key in Token.objects.filter(user_id__in=list(user_ids)).values_list("key", flat=True):
+        invalidate_token(key)
+
+
+async def aauthenticate(request):
+    """
+    CachedTokenAuthentication for plain Django async views: the user for the
+    request's "Authorization: Token <key>" header, or None without one.
+    Raises AuthenticationFailed for unknown or inactive tokens.
+    """
+    auth = request.headers.get("Authorization", "").split()
+    if not auth or auth[0].lower() != "token":
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed(_("Invalid token header."))
+    key = auth[1]
+
+    identity = _local_tokens.get(key)
+    if identity is None:
+        identity = await cache.aget(_cache_key(key))
+        if identity is None:
+            identity = await _aload_identity(key)
+            await cache.aset(_cache_key(key), identity, TOKEN_CACHE_TTL)
+        _local_tokens.set(key, identity)
+
+    if not identity["is_active"]:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+    return _build_user(identity)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that caches token -> (user id, role, is_active,
+    teacher/student pk) in a process-local LRU backed by Django's cache, so a
+    warm request reaches the view without touching authtoken_token or
+    account_user. `request.user` only has id/role/is_active loaded; views that
+    render other user columns should read the row themselves.
+    """
+
+    def authenticate_credentials(self, key):
+        identity = _local_tokens.get(key)
+        if identity is None:
+            identity = cache.get(_cache_key(key))
+            if identity is None:
+                identity = _load_identity(key)
+                cache.set(_cache_key(key), identity, TOKEN_CACHE_TTL)
+            _local_tokens.set(key, identity)
+
+        if not identity["is_active"]:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        user = _build_user(identity)
+        token = Token(key=key, user=user)
+        return (user, token)
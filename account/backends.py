@@ -1,21 +1,21 @@
-
-from django.contrib.auth.backends import ModelBackend
-from .models import User
-
-class EmailAuthBackend(ModelBackend):
-    def authenticate(self, request, email=None, password=None, **kwargs):
-        
-        try:
-            user = User.objects.get(email=email)
-            if user.check_password(password) and self.user_can_authenticate(user):
-                return user
-        except User.DoesNotExist:
-            return None
-        return None
-
-    def get_user(self, user_id):
-       
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
+
+from django.contrib.auth.backends import ModelBackend
+from .models import User
+
+class EmailAuthBackend(ModelBackend):
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        
+        try:
+            user = User.objects.get(email=email)
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        except User.DoesNotExist:
+            return None
+        return None
+
+    def get_user(self, user_id):
+       
+        try:
+            return User.objects.get(pk=user_id)
+        except User.DoesNotExist:
             return None
\ No newline at end of file
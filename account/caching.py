@@ -0,0 +1,85 @@
+# account/caching.py
+"""
+Small process-local caches used in front of Django's cache framework, and the
+TTL guard for entries kept in a cache other processes cannot invalidate.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+# longest an entry may live in a process-local cache that other workers and
+# management commands invalidate through their own (separate) copy
+LOCAL_CACHE_MAX_TTL = getattr(settings, 'LOCAL_CACHE_MAX_TTL', 30)
+
+# backend class names is_server_backed() accepts, Django's and django-redis's
+SERVER_CACHE_BACKENDS = {'RedisCache', 'PyMemcacheCache', 'PyLibMCCache'}
+
+
+def is_process_local(alias='default'):
+    """True if the `alias` cache lives in this process only (LocMemCache)."""
+    return isinstance(caches[alias], LocMemCache)
+
+
+def is_server_backed(alias='default'):
+    """
+    True if the `alias` cache is a cache server (Redis, Memcached) that every
+    worker on every host reaches, with atomic incr.
+    """
+    return caches[alias].__class__.__name__ in SERVER_CACHE_BACKENDS
+
+
+def shared_ttl(ttl, alias='default'):
+    """
+    `ttl` for an entry that other processes invalidate by deleting its key.
+    Capped at LOCAL_CACHE_MAX_TTL when the cache is process-local, since
+    those deletes never reach this process.
+    """
+    return min(ttl, LOCAL_CACHE_MAX_TTL) if is_process_local(alias) else ttl
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache whose entries also expire after
+    `ttl` seconds. Lives in one worker process, so keep the TTL short for data
+    that other processes may invalidate.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,22 @@
+# account/checks.py
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .caching import is_server_backed
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Token, assignment and response caches are invalidated by deleting keys, so
+    with several workers every one of them must see the same cache. The file
+    cache fallback culls on every set and has no atomic incr; it is for
+    development only.
+    """
+    if not getattr(settings, 'REQUIRE_SHARED_CACHE', False) or is_server_backed():
+        return []
+    return [Error(
+        f"The default cache ({settings.CACHES['default']['BACKEND']}) is not shared by all workers.",
+        hint="Set REDIS_URL, or configure a Memcached backend, for multi-process deployments.",
+        id='account.E001',
+    )]
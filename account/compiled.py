@@ -0,0 +1,174 @@
+# account/compiled.py
+"""
+Compiled read-only serialization for the hot list endpoints.
+
+For a serializer using `CompiledReadMixin`, the readable fields are turned
+(once per field set) into a generated function that builds each output dict
+straight from a `values_list()` row, so listing N rows no longer creates N
+model instances or runs Serializer.to_representation() field by field.
+
+Output is identical to `Serializer(rows, many=True).data`: same keys in the
+same order. Columns that DRF would return unchanged (ints, strings, bools,
+primary keys) are copied as they are; everything else (Decimal, dates,
+choices, files) goes through the field's own to_representation(), so the
+COERCE_DECIMAL_TO_STRING and date format settings still apply.
+
+A serializer with a field that is not a plain column (source='*', a
+SerializerMethodField, a nested serializer, a many-to-many) is not compiled;
+its reader falls back to the normal serializer.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+# serializer fields that return the values() value of these model fields unchanged
+_PASSTHROUGH = (
+    ((serializers.IntegerField,), models.IntegerField),
+    ((serializers.CharField, serializers.EmailField), (models.CharField, models.TextField)),
+    ((serializers.BooleanField,), models.BooleanField),
+)
+
+
+def _column(model, attrs):
+    """(ORM path, model field) of the column `attrs` read, or None if it is not one."""
+    for i, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        if i == len(attrs) - 1:
+            return '__'.join(attrs), field
+        if not (field.many_to_one or field.one_to_one):
+            return None
+        model = field.related_model
+    return None
+
+
+def _converter(field, model_field):
+    """
+    None if DRF would return the values() value unchanged, a callable doing
+    what DRF would do otherwise, or False if the field cannot be compiled.
+    """
+    if isinstance(field, PrimaryKeyRelatedField):
+        # values('student') is the raw foreign key, i.e. value.pk
+        if not model_field.target_field.primary_key:
+            return False
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if model_field.is_relation:
+        return False
+    if isinstance(field, serializers.FileField):
+        # rebuild the FieldFile the instance attribute would have been
+        attr_class = model_field.attr_class
+        return lambda name: field.to_representation(attr_class(None, model_field, name))
+    if type(field) is serializers.ChoiceField and isinstance(model_field, (models.CharField, models.TextField)):
+        if all(isinstance(key, str) for key in field.choices):
+            return None
+    for field_classes, model_classes in _PASSTHROUGH:
+        if type(field) in field_classes and isinstance(model_field, model_classes):
+            return None
+    return field.to_representation
+
+
+def _plan(model, fields):
+    """
+    (names, paths, columns, converters) for the readable `fields`, or None if
+    one of them is not a plain column. columns[i] indexes into paths.
+    """
+    names, paths, columns, converters = [], [], [], []
+    for name, field in fields.items():
+        if field.write_only:
+            continue
+        if field.source == '*' or isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+        column = _column(model, field.source_attrs)
+        if column is None:
+            return None
+        path, model_field = column
+        converter = _converter(field, model_field)
+        if converter is False:
+            return None
+        if path not in paths:
+            paths.append(path)
+        names.append(name)
+        columns.append(paths.index(path))
+        converters.append(converter)
+    return names, paths, columns, converters
+
+
+@lru_cache(maxsize=256)
+def _compile(names, columns, converted):
+    """
+    bind(*converters) -> rows(data): a list comprehension building one dict
+    per row, with a literal key and tuple index for every field.
+    """
+    items = []
+    for i, (name, column) in enumerate(zip(names, columns)):
+        value = f'r[{column}]'
+        if i in converted:
+            value = f'(None if {value} is None else c{i}({value}))'
+        items.append(f'{name!r}: {value}')
+    source = (
+        f"def bind({', '.join(f'c{i}' for i in converted)}):\n"
+        f"    def rows(data):\n"
+        f"        return [{{{', '.join(items)}}} for r in data]\n"
+        f"    return rows\n"
+    )
+    namespace = {}
+    exec(compile(source, '<compiled serializer>', 'exec'), namespace)
+    return namespace['bind']
+
+
+class CompiledReader:
+    """
+    Reads rows for one serializer and context:
+
+        reader = EnrollmentSerializer.compiled_reader(context)
+        data = reader.data(reader.values(queryset))
+
+    `values()` narrows the queryset to the columns the fields read (plus
+    `keep`, e.g. a cursor paginator's ordering, as named rows), and `data()`
+    turns the rows, or any slice of them, into the serializer's output.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.serializer_class = serializer_class
+        self.context = context or {}
+        serializer = serializer_class(context=self.context)
+        plan = _plan(serializer_class.Meta.model, serializer.fields)
+        self.compiled = plan is not None
+        if self.compiled:
+            names, self.paths, columns, converters = plan
+            converted = tuple(i for i, converter in enumerate(converters) if converter is not None)
+            bind = _compile(tuple(names), tuple(columns), converted)
+            self._rows = bind(*(converters[i] for i in converted))
+
+    def values(self, queryset, keep=()):
+        if not self.compiled:
+            setup = getattr(self.serializer_class, 'setup_eager_loading', None)
+            return queryset if setup is None else setup(queryset, self.context, keep=keep)
+        extra = [name for name in (key.lstrip('-') for key in keep) if name not in self.paths]
+        return queryset.values_list(*self.paths, *extra, named=bool(keep))
+
+    def data(self, rows):
+        if not self.compiled:
+            return self.serializer_class(rows, many=True, context=self.context).data
+        return self._rows(rows)
+
+
+class CompiledReadMixin:
+    """Serializer mixin; see the module docstring."""
+
+    @classmethod
+    def compiled_reader(cls, context=None):
+        return CompiledReader(cls, context)
+
+    @classmethod
+    def read_many(cls, queryset, context=None):
+        """Same output as cls(queryset, many=True, context=context).data."""
+        reader = CompiledReader(cls, context)
+        return reader.data(reader.values(queryset))
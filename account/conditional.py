@@ -0,0 +1,145 @@
+# account/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) for per-user read endpoints.
+
+Each user has a version token in the cache, dropped by signal handlers
+whenever something their own endpoints render changes (their profile, their
+enrollments or teaching assignments). A global epoch covers shared data such
+as course names. The ETag is derived from those tokens alone, so a matching
+If-None-Match is answered with 304 before the view runs a single query.
+
+Tokens are dropped after the writing transaction commits; a reader that
+raced the write at worst gets fresh data under an old ETag and refetches once.
+Bumps from other workers and management commands (rollover_year) only reach
+a worker through the shared cache configured in settings.CACHES. On a
+process-local cache the tokens live at most LOCAL_CACHE_MAX_TTL seconds
+(account.caching.shared_ttl), which bounds how long a stale 304 can be served.
+"""
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .caching import shared_ttl
+
+VERSION_TTL = shared_ttl(getattr(settings, "CONDITIONAL_VERSION_TTL", 86400))
+
+_GLOBAL = "global"
+
+
+def _cache_key(scope):
+    return f"conditional:version:{scope}"
+
+
+def _issued_key(scope):
+    return f"conditional:issued:{scope}"
+
+
+def _version(scope):
+    """(token, unix time it was issued) for `scope`, issuing one if there is none."""
+    key = _cache_key(scope)
+    version = cache.get(key)
+    if version is None:
+        # strictly later than any earlier version of this scope, so an
+        # If-Modified-Since from before a change (even in the same second) never matches
+        issued = max(int(time.time()), cache.get(_issued_key(scope), 0) + 1)
+        cache.set(_issued_key(scope), issued, VERSION_TTL)
+        cache.add(key, (uuid.uuid4().hex, issued), VERSION_TTL)
+        # another request may have added first; everyone uses whichever won
+        version = cache.get(key) or (uuid.uuid4().hex, issued)
+    return version
+
+
+def _bump(*scopes):
+    keys = [_cache_key(scope) for scope in scopes]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def bump_user_versions(*user_ids):
+    """Something rendered by these users' own endpoints changed."""
+    _bump(*(user_id for user_id in user_ids if user_id is not None))
+
+
+def bump_global_version():
+    """Shared data (e.g. a course name) changed; every per-user ETag changes."""
+    _bump(_GLOBAL)
+
+
+def _validators(view, request, user_version, global_version):
+    """(headers, last_modified) for this user's view of `view` at these versions."""
+    (user_token, user_time), (global_token, global_time) = user_version, global_version
+    digest = hashlib.md5(
+        f"{view.__qualname__}|{request.user.pk}|{user_token}|{global_token}|"
+        f"{request.get_full_path()}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    last_modified = max(user_time, global_time)
+    headers = {
+        "ETag": f'"{digest}"',
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "private, no-cache",
+    }
+    return headers, last_modified
+
+
+def _not_modified(request, headers, last_modified):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return headers["ETag"] in etags or "*" in etags
+    since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return since is not None and last_modified <= since
+
+
+def _tag(response, headers):
+    if response.status_code == status.HTTP_200_OK:
+        for name, value in headers.items():
+            response[name] = value
+    return response
+
+
+def conditional_get(view):
+    """
+    Viewset action decorator: ETag and Last-Modified from the requesting user's
+    version, 304 for a matching If-None-Match (or, without one, an
+    If-Modified-Since no older than Last-Modified). Only 200 responses are tagged.
+    """
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        headers, last_modified = _validators(view, request, _version(request.user.pk), _version(_GLOBAL))
+        if _not_modified(request, headers, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return _tag(view(self, request, *args, **kwargs), headers)
+    return wrapper
+
+
+async def _aversion(scope):
+    key = _cache_key(scope)
+    version = await cache.aget(key)
+    if version is None:
+        issued = max(int(time.time()), await cache.aget(_issued_key(scope), 0) + 1)
+        await cache.aset(_issued_key(scope), issued, VERSION_TTL)
+        await cache.aadd(key, (uuid.uuid4().hex, issued), VERSION_TTL)
+        version = await cache.aget(key) or (uuid.uuid4().hex, issued)
+    return version
+
+
+def aconditional_get(view):
+    """conditional_get for async function views (see account.async_api)."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        headers, last_modified = _validators(
+            view, request, await _aversion(request.user.pk), await _aversion(_GLOBAL)
+        )
+        if _not_modified(request, headers, last_modified):
+            return HttpResponseNotModified(headers=headers)
+        return _tag(await view(request, *args, **kwargs), headers)
+    return wrapper
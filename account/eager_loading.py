@@ -0,0 +1,140 @@
+# account/eager_loading.py
+"""
+Serializers declare the relations they read; querysets are prepared to match.
+
+A serializer using `EagerLoadingMixin` lists the relations its fields
+traverse in `Meta.select_related` / `Meta.prefetch_related`. Whenever it is
+given an unevaluated QuerySet with `many=True`, the queryset gets those
+relations plus an `only()` limited to the columns the serializer's fields
+read, so the number of queries no longer depends on each view remembering
+its `select_related`.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+
+# a field that reads no column of its own (a prefetched many-to-many)
+_NO_COLUMN = object()
+
+
+def _column_for(model, attrs, select_paths):
+    """
+    ORM path of the column a field with these `source_attrs` reads, or None if it
+    does not map onto concrete fields through the select_related relations.
+    """
+    path = []
+    for i, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        path.append(field.name)
+        if i == len(attrs) - 1:
+            if field.many_to_many or field.one_to_many:
+                return _NO_COLUMN
+            return '__'.join(path) if field.concrete else None
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            return None
+        if '__'.join(path) not in select_paths:
+            return None
+        model = field.related_model
+    return None
+
+
+def only_fields(model, serializer_fields, select_related=()):
+    """
+    Names for `only()` covering every readable field in `serializer_fields`, or
+    None if some field reads something other than a column (a method, '*'),
+    in which case nothing is deferred.
+    """
+    select_paths = set()
+    for path in select_related:
+        parts = path.split('__')
+        select_paths.update('__'.join(parts[:i]) for i in range(1, len(parts) + 1))
+
+    # select_related cannot follow a deferred foreign key; naming the related
+    # pk keeps a followed model to the columns fields actually read
+    names = {model._meta.pk.name} | select_paths
+    for path in select_paths:
+        related = model
+        for attr in path.split('__'):
+            related = related._meta.get_field(attr).related_model
+        names.add(f'{path}__{related._meta.pk.name}')
+    for field in serializer_fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return None
+        column = _column_for(model, field.source_attrs, select_paths)
+        if column is None:
+            return None
+        if column is not _NO_COLUMN:
+            names.add(column)
+    return names
+
+
+def _paths(tree, prefix=''):
+    """Flatten Query.select_related ({'student': {'user': {}}}) into ORM paths."""
+    paths = []
+    for name, children in tree.items():
+        path = prefix + name
+        paths.append(path)
+        paths.extend(_paths(children, path + '__'))
+    return paths
+
+
+class EagerLoadingMixin:
+    """
+    ModelSerializer mixin; see the module docstring. Declare in Meta:
+
+        select_related = ('student__user', 'course')
+        prefetch_related = ('teachers',)
+
+    Views that paginate before serializing should pass their queryset (and
+    serializer context) through `setup_eager_loading` first.
+    """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, context=None, keep=()):
+        """
+        Apply the declared relations and an only() to `queryset`. Relations no
+        remaining field reads (see SparseFieldsetsMixin) are skipped; `keep`
+        names columns to load regardless, e.g. a cursor paginator's ordering.
+        """
+        meta = cls.Meta
+        fields = cls(context=context or {}).fields
+        sources = [
+            '__'.join(f.source_attrs) for f in fields.values() if not f.write_only
+        ] if all(f.source != '*' for f in fields.values()) else None
+
+        def used(path, prefetch=False):
+            return sources is None or any(
+                s.startswith(path + '__') or (prefetch and s == path) for s in sources
+            )
+
+        select_related = tuple(p for p in getattr(meta, 'select_related', ()) if used(p))
+        prefetch_related = tuple(p for p in getattr(meta, 'prefetch_related', ()) if used(p, prefetch=True))
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        # leave querysets the view has already narrowed (only/defer/values) alone
+        query = queryset.query
+        if (queryset._fields is None and query.deferred_loading == (frozenset(), True)
+                and query.select_related is not True):
+            # relations the view selected itself must not be deferred either
+            names = only_fields(queryset.model, fields, _paths(query.select_related or {}))
+            if names is not None:
+                queryset = queryset.only(*names, *(k.lstrip('-') for k in keep))
+        return queryset
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        instance = args[0] if args else kwargs.get('instance')
+        if isinstance(instance, QuerySet) and instance._result_cache is None:
+            instance = cls.setup_eager_loading(instance, kwargs.get('context'))
+            if args:
+                args = (instance,) + args[1:]
+            else:
+                kwargs['instance'] = instance
+        return super().many_init(*args, **kwargs)
@@ -0,0 +1,98 @@
+# account/exports.py
+"""
+Constant-memory CSV / NDJSON dumps of Applications and Enrollments.
+
+Rows come straight from `values_list(...).iterator()` (a server-side cursor
+where the backend has one) and are encoded and flushed in small buffers, so
+neither model instances nor the full result set are ever held in memory.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from student.models import Enrollment
+from .models import Application
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# every admission column except the (hashed) password
+APPLICATION_COLUMNS = [f.attname for f in Application._meta.concrete_fields if f.name != "password"]
+
+ENROLLMENT_COLUMNS = [
+    "id",
+    "student_id",
+    "student__student_id",
+    "student__user__name",
+    "standard",
+    "course_id",
+    "course__course_code",
+    "course__course_name",
+    "academic_year",
+    "enrollment_date",
+    "grade",
+    "marks_obtained",
+    "total_marks",
+    "attendance_percentage",
+]
+
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def application_rows(status=None, role=None, standard=None):
+    applications = Application.objects.order_by("id")
+    if status:
+        applications = applications.filter(status=status)
+    if role:
+        applications = applications.filter(role=role)
+    if standard:
+        applications = applications.filter(admission_class=standard)
+    return APPLICATION_COLUMNS, applications.values_list(*APPLICATION_COLUMNS)
+
+
+def enrollment_rows(academic_year=None, standard=None, course_id=None):
+    enrollments = Enrollment.objects.order_by("id")
+    if academic_year:
+        enrollments = enrollments.filter(academic_year=academic_year)
+    if standard:
+        enrollments = enrollments.filter(standard=standard)
+    if course_id:
+        enrollments = enrollments.filter(course_id=course_id)
+    return ENROLLMENT_COLUMNS, enrollments.values_list(*ENROLLMENT_COLUMNS)
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def stream_rows(columns, queryset, fmt="csv"):
+    """Yield the encoded export in ~64 KB strings."""
+    lines = _csv_lines if fmt == "csv" else _ndjson_lines
+    buffer, size = [], 0
+    for line in lines(columns, queryset.iterator(chunk_size=CHUNK_SIZE)):
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,53 @@
+# account/fieldsets.py
+"""
+Sparse fieldsets: `?fields=name,email` keeps only those fields of a
+response, `?omit=notes,documents` drops fields.
+
+Together with EagerLoadingMixin the same selection narrows the SELECT, since
+the `only()` it builds is derived from the fields that are left. Naming a
+field the response does not have is a 400, so a typo is not silently
+answered with the wrong shape.
+"""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _names(request, param):
+    value = request.GET.get(param)
+    if not value:
+        return set()
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def sparse_fields(request, available):
+    """
+    The names in `available` (order kept) left after ?fields= / ?omit=. Only
+    read requests are narrowed; writes always see every field. Raises
+    ValidationError (400) for names not in `available`.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return list(available)
+    keep = _names(request, 'fields')
+    omit = _names(request, 'omit')
+    errors = {
+        param: [f"Unknown field(s): {', '.join(sorted(unknown))}."]
+        for param, names in (('fields', keep), ('omit', omit))
+        if (unknown := names.difference(available))
+    }
+    if errors:
+        raise serializers.ValidationError(errors)
+    return [name for name in available if (not keep or name in keep) and name not in omit]
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin applying ?fields= / ?omit= from `context['request']`.
+    Unknown names raise ValidationError (see sparse_fields).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = set(sparse_fields(self.context.get('request'), self.fields))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
@@ -0,0 +1,139 @@
+# account/jobs.py
+"""
+Database-backed background job queue.
+
+`enqueue()` inserts a Job in the caller's transaction, so the job exists
+exactly when the change that needs it commits. The run_jobs worker calls
+`run_batch()`, which:
+- claims up to `batch_size` due jobs;
+- runs each kind's handler once for all of its jobs;
+- records the outcomes.
+
+If a batch fails it is retried one job at a time, so one bad row does not hold
+up the rest. A failing job is retried with exponential backoff until
+max_attempts, then marked failed.
+
+A worker that dies mid-batch leaves its jobs `running` under a lease. Once the
+lease expires they are claimed again, so handlers must be idempotent.
+"""
+import logging
+import traceback
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_LEASE_SECONDS = getattr(settings, "JOB_LEASE_SECONDS", 300)
+JOB_RETRY_BASE_SECONDS = getattr(settings, "JOB_RETRY_BASE_SECONDS", 10)
+
+_handlers = {}
+
+
+def handler(kind):
+    """
+    Register `func(payloads) -> results` for jobs of `kind`: one JSON-serialisable
+    result per payload, in the same order. It runs in a transaction; raising
+    rolls back and retries the jobs.
+    """
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload, **fields):
+    return Job.objects.create(kind=kind, payload=payload, **fields)
+
+
+def claim(batch_size, worker):
+    """Mark up to `batch_size` due jobs as running under `worker` and return them."""
+    now = timezone.now()
+    due = Q(status="queued", run_after__lte=now) | Q(status="running", locked_until__lt=now)
+    ids = list(Job.objects.filter(due).order_by("run_after", "id").values_list("id", flat=True)[:batch_size])
+    if not ids:
+        return []
+    # conditional update: a job another worker claimed since the SELECT no longer matches `due`
+    Job.objects.filter(due, pk__in=ids).update(
+        status="running", claimed_by=worker, attempts=F("attempts") + 1,
+        locked_until=now + timedelta(seconds=JOB_LEASE_SECONDS),
+    )
+    return list(Job.objects.filter(pk__in=ids, status="running", claimed_by=worker).order_by("id"))
+
+
+def _record(job, **fields):
+    # a worker that outlived its lease must not overwrite the new owner's outcome
+    return Job.objects.filter(pk=job.pk, status="running", claimed_by=job.claimed_by).update(
+        locked_until=None, **fields
+    )
+
+
+def _succeed(job, result):
+    _record(job, status="done", result=result, last_error="", finished_at=timezone.now())
+    return "done"
+
+
+def _fail(job, error):
+    if job.attempts >= job.max_attempts:
+        _record(job, status="failed", last_error=error, finished_at=timezone.now())
+        return "failed"
+    delay = JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+    _record(job, status="queued", last_error=error, run_after=timezone.now() + timedelta(seconds=delay))
+    return "retried"
+
+
+def _run(func, jobs):
+    with transaction.atomic():
+        results = list(func([job.payload for job in jobs]))
+    if len(results) != len(jobs):
+        raise ValueError(f"handler returned {len(results)} results for {len(jobs)} jobs")
+    return results
+
+
+def run_batch(batch_size=50, worker=None):
+    """Claim and run one batch. Returns a Counter of outcomes (done / retried / failed)."""
+    worker = worker or uuid.uuid4().hex
+    outcomes = Counter()
+    by_kind = defaultdict(list)
+    for job in claim(batch_size, worker):
+        if job.attempts > job.max_attempts:
+            # its last attempt's worker died; don't start another
+            outcomes[_fail(job, job.last_error or "Lease expired during the last attempt.")] += 1
+        else:
+            by_kind[job.kind].append(job)
+
+    for kind, jobs in by_kind.items():
+        func = _handlers.get(kind)
+        if func is None:
+            for job in jobs:
+                job.attempts = job.max_attempts  # retrying won't register a handler
+                outcomes[_fail(job, f"No handler registered for {kind!r}.")] += 1
+            continue
+        try:
+            done = list(zip(jobs, _run(func, jobs)))
+        except Exception:
+            if len(jobs) == 1:
+                logger.exception("Job %s (%s) failed.", jobs[0].pk, kind)
+                outcomes[_fail(jobs[0], traceback.format_exc(limit=5))] += 1
+                continue
+            logger.warning("Batch of %d %s jobs failed; running them one by one.",
+                           len(jobs), kind, exc_info=True)
+            done = None
+        if done is None:
+            done = []
+            for job in jobs:
+                try:
+                    done.append((job, _run(func, [job])[0]))
+                except Exception:
+                    logger.exception("Job %s (%s) failed.", job.pk, kind)
+                    outcomes[_fail(job, traceback.format_exc(limit=5))] += 1
+        for job, result in done:
+            outcomes[_succeed(job, result)] += 1
+    return outcomes
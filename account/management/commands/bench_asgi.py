@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .bench_endpoints import Command as BenchEndpoints, percentile, route_params
+
+# (role, url name of the synchronous DRF route, path under /api/async/)
+ENDPOINTS = [
+    ('student', 'student-profile', 'student/profile/'),
+    ('student', 'student-performance-my-performance', 'student-performance/my-performance/'),
+    ('teacher', 'student-performance-class-results', 'student-performance/class-results/'),
+    ('teacher', 'teacher-profile', 'teacher/profile/'),
+    ('teacher', 'teacher-my-courses', 'teacher/my-courses/'),
+    ('schooladmin', 'applications-list-pending', 'applications/pending/'),
+    ('superadmin', 'applications-list-school-verified', 'applications/awaiting-super/'),
+]
+
+
+def summarise(name, timings, elapsed, errors):
+    return {
+        'name': name,
+        'requests': len(timings),
+        'errors': errors,
+        'rps': len(timings) / elapsed,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+    }
+
+
+def run_wsgi(path, params, headers, requests, concurrency):
+    """`requests` GETs through the WSGI handler from `concurrency` threads, one Client per thread."""
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, 'client'):
+            local.client = Client(HTTP_HOST='localhost')
+        start = time.perf_counter()
+        response = local.client.get(path, params, headers=headers)
+        return (time.perf_counter() - start) * 1000, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    return summarise('wsgi', [t for t, _ in results], time.perf_counter() - start,
+                     sum(status != 200 for _, status in results))
+
+
+async def run_asgi(path, params, headers, requests, concurrency):
+    """`requests` GETs through the ASGI handler with at most `concurrency` in flight."""
+    client = AsyncClient(HTTP_HOST='localhost')
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            start = time.perf_counter()
+            # what ASGIHandler does per request: its own thread for sync and ORM work
+            async with ThreadSensitiveContext():
+                response = await client.get(path, params, headers=headers)
+            return (time.perf_counter() - start) * 1000, response.status_code
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(requests)))
+    return summarise('asgi', [t for t, _ in results], time.perf_counter() - start,
+                     sum(status != 200 for _, status in results))
+
+
+class Command(BaseCommand):
+    help = ("Compare throughput and p50/p95 latency of the synchronous /api/ read endpoints under "
+            "the WSGI handler (thread pool) with their /api/async/ versions under the ASGI handler "
+            "(event loop) at the same concurrency. Requests are made in-process, without a server "
+            "or network. Run `seed_school` first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint and handler.")
+        parser.add_argument('--concurrency', type=int, action='append',
+                            help="Requests in flight (repeatable; default 1 and 20).")
+        parser.add_argument('--endpoint', action='append',
+                            help="Only endpoints whose async path contains this (repeatable).")
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        levels = options['concurrency'] or [1, 20]
+        if min(levels) < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        endpoints = ENDPOINTS
+        if options['endpoint']:
+            endpoints = [e for e in endpoints if any(name in e[2] for name in options['endpoint'])]
+
+        picker = BenchEndpoints()
+        for role, url_name, async_path in endpoints:
+            user = picker.pick_user(role)
+            if user is None:
+                self.stderr.write(f"No active {role} user; skipping {async_path}.")
+                continue
+            headers = {'Authorization': 'Token ' + Token.objects.get_or_create(user=user)[0].key}
+            params = route_params(user).get(url_name, {})
+            for concurrency in levels:
+                # one untimed request each to warm the auth and application caches
+                Client(HTTP_HOST='localhost').get(reverse(url_name), params, headers=headers)
+                wsgi = run_wsgi(reverse(url_name), params, headers, options['requests'], concurrency)
+                asgi = asyncio.run(run_asgi('/api/async/' + async_path, params, headers,
+                                            options['requests'], concurrency))
+                for result in (wsgi, asgi):
+                    self.stdout.write(
+                        f"{async_path:38} c={concurrency:<4} {result['name']} {result['rps']:8.1f} req/s "
+                        f"p50 {result['p50_ms']:8.2f}ms p95 {result['p95_ms']:8.2f}ms"
+                        + (f" ({result['errors']} non-200)" if result['errors'] else "")
+                    )
@@ -0,0 +1,184 @@
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from account.models import User
+from home.middleware import QueryCounter
+from student.models import Enrollment
+from teacher.models import CourseTeaching
+
+ROLES = [value for value, _ in User.ROLE_CHOICES]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def get_routes():
+    """(url name, path) of every GET route the API router exposes without a pk."""
+    from home.urls import router
+
+    routes = []
+    for prefix, viewset, basename in router.registry:
+        if hasattr(viewset, 'list'):
+            routes.append(f'{basename}-list')
+        for extra in viewset.get_extra_actions():
+            if not extra.detail and 'get' in extra.mapping:
+                routes.append(f'{basename}-{extra.url_name}')
+    return [(name, reverse(name)) for name in routes]
+
+
+def route_params(user):
+    """Query parameters the parametrised endpoints need, picked from the user's own data."""
+    params = {}
+    teachings = CourseTeaching.objects.select_related('course').order_by('-academic_year', 'id')
+    teaching = teachings.filter(teacher__user=user).first() or teachings.first()
+    if teaching is not None:
+        cls = {'course_id': teaching.course_id, 'standard': teaching.standard,
+               'academic_year': teaching.academic_year}
+        params['student-performance-class-results'] = cls
+        params['teacher-course-performance'] = cls
+        params['teacher-course-statistics'] = {
+            'course_code': teaching.course.course_code, 'standard': teaching.standard,
+            'academic_year': teaching.academic_year,
+        }
+        enrollment = Enrollment.objects.filter(
+            course_id=teaching.course_id, academic_year=teaching.academic_year,
+            standard=teaching.standard,
+        ).first()
+        if enrollment is not None:
+            params['student-performance-student-performance'] = {'student_id': enrollment.student_id}
+    return params
+
+
+class Command(BaseCommand):
+    help = ("Call every GET route in the API router as each role and write p50/p95 latency, "
+            "query counts and peak memory to JSON. Run `seed_school` first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--output', default='bench.json')
+        parser.add_argument('--baseline', help="Earlier --output file to compare against.")
+        parser.add_argument('--role', action='append', choices=ROLES, help="Only these roles (repeatable).")
+        parser.add_argument('--route', action='append', help="Only routes whose name contains this (repeatable).")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        routes = get_routes()
+        if options['route']:
+            routes = [(name, path) for name, path in routes if any(r in name for r in options['route'])]
+
+        results = []
+        for role in options['role'] or ROLES:
+            user = self.pick_user(role)
+            if user is None:
+                self.stderr.write(f"No active {role} user; skipping.")
+                continue
+            client = APIClient(HTTP_HOST='localhost')
+            client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get_or_create(user=user)[0].key)
+            params = route_params(user)
+            for name, path in routes:
+                result = self.bench(client, path, params.get(name, {}), options['iterations'])
+                result.update(route=name, role=role)
+                results.append(result)
+                self.stdout.write(
+                    f"{role:12} {name:45} {result['status']} p50 {result['p50_ms']:8.2f}ms "
+                    f"p95 {result['p95_ms']:8.2f}ms {result['queries']:4d} queries "
+                    f"{result['peak_kb']:9.1f}KB"
+                )
+
+        report = {
+            'meta': {
+                'created': datetime.now(timezone.utc).isoformat(),
+                'iterations': options['iterations'],
+                'database': connections['default'].vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as out:
+            json.dump(report, out, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}."))
+
+        if options['baseline']:
+            self.compare(options['baseline'], results)
+
+    def pick_user(self, role):
+        users = User.objects.filter(role=role, is_active=True).order_by('id')
+        if role == 'teacher':
+            # a teacher with assignments exercises the authorised paths
+            return users.filter(teacher__courseteaching__isnull=False).first() or users.first()
+        if role == 'student':
+            return users.filter(student__enrollments__isnull=False).first() or users.first()
+        return users.first()
+
+    def request(self, client, path, params):
+        """One request including streamed content, returning (status, queries)."""
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = client.get(path, params)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            else:
+                response.content
+        return response.status_code, counter.count
+
+    def bench(self, client, path, params, iterations):
+        status, queries = self.request(client, path, params)  # warm caches
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            self.request(client, path, params)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        # separate pass: tracemalloc slows every allocation down
+        tracemalloc.start()
+        try:
+            self.request(client, path, params)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'path': path,
+            'params': params,
+            'status': status,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'queries': queries,
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def compare(self, path, results):
+        with open(path, encoding='utf-8') as f:
+            baseline = {(r['role'], r['route']): r for r in json.load(f)['results']}
+        self.stdout.write(f"\nAgainst {path}:")
+        for result in results:
+            before = baseline.get((result['role'], result['route']))
+            if before is None:
+                continue
+            change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+            self.stdout.write(
+                f"{result['role']:12} {result['route']:45} p50 {before['p50_ms']:8.2f} -> "
+                f"{result['p50_ms']:8.2f}ms ({change:+.0f}%)  queries {before['queries']} -> {result['queries']}"
+            )
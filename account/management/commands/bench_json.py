@@ -0,0 +1,72 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from account.models import Application
+from account.renderers import FastJSONParser, FastJSONRenderer, orjson
+from account.serializers import ApplicationSerializer, EnrollmentSerializer
+from student.models import Enrollment
+from student.views import EnrollmentViewSet
+
+
+def payloads(rows):
+    """(name, data) shaped like the responses of the heaviest endpoints."""
+    return [
+        # class_results / course_performance: DecimalFields already coerced to strings
+        ('class_results', EnrollmentSerializer.read_many(Enrollment.objects.order_by('id')[:rows])),
+        ('applications', ApplicationSerializer.read_many(Application.objects.order_by('applied_on', 'id')[:rows])),
+        # the enrollment list returns values() rows: raw Decimal and date objects
+        ('enrollments (values)', list(
+            Enrollment.objects.order_by('id').values(*EnrollmentViewSet.LIST_COLUMNS.values())[:rows]
+        )),
+    ]
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = ("Render and parse large class_results, applications and enrollment-list payloads "
+            "with DRF's JSONRenderer/JSONParser and with account.renderers, check the bodies "
+            "are byte-identical, and print MB/s. Run `seed_school` first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be at least 1.")
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; the fast classes fall back to DRF's."))
+
+        repeat = options['repeat']
+        for name, data in payloads(options['rows']):
+            if not data:
+                self.stdout.write(f"{name:21} no rows, skipped")
+                continue
+            drf_render, expected = best_of(repeat, lambda: JSONRenderer().render(data))
+            fast_render, actual = best_of(repeat, lambda: FastJSONRenderer().render(data))
+            if actual != expected:
+                raise CommandError(f"{name}: FastJSONRenderer output differs from JSONRenderer.")
+            drf_parse, parsed = best_of(repeat, lambda: JSONParser().parse(io.BytesIO(expected)))
+            fast_parse, fast_parsed = best_of(repeat, lambda: FastJSONParser().parse(io.BytesIO(expected)))
+            if fast_parsed != parsed:
+                raise CommandError(f"{name}: FastJSONParser result differs from JSONParser.")
+
+            mb = len(expected) / 1e6
+            self.stdout.write(
+                f"{name:21} {len(data):6d} rows {mb:6.2f} MB  "
+                f"render {mb / drf_render:7.1f} -> {mb / fast_render:7.1f} MB/s (x{drf_render / fast_render:.1f})  "
+                f"parse {mb / drf_parse:7.1f} -> {mb / fast_parse:7.1f} MB/s (x{drf_parse / fast_parse:.1f})"
+            )
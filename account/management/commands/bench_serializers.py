@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from account.models import Application
+from account.serializers import ApplicationSerializer, CourseTeachingSerializer, EnrollmentSerializer
+from student.models import Enrollment
+from teacher.models import CourseTeaching
+
+# (name, serializer, queryset) - the querysets the list endpoints serialize
+CASES = [
+    ('enrollments', EnrollmentSerializer, lambda: Enrollment.objects.order_by('id')),
+    ('course teachings', CourseTeachingSerializer, lambda: CourseTeaching.objects.order_by('id')),
+    ('applications', ApplicationSerializer, lambda: Application.objects.order_by('applied_on', 'id')),
+]
+
+
+def best_of(repeat, fn):
+    """Fastest of `repeat` runs, in seconds, and the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = ("Serialize the first --rows enrollments, course teachings and applications with the "
+            "DRF serializers and with their compiled readers (account.compiled), check the "
+            "rendered JSON is byte-identical, and print rows/second. Run `seed_school` first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help="Rows per serialization (a class_results page).")
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--fields', help="Also apply ?fields= (comma-separated), as a sparse request would.")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be at least 1.")
+        query = {'fields': options['fields']} if options['fields'] else {}
+        context = {'request': Request(RequestFactory().get('/', query))}
+        renderer = JSONRenderer()
+
+        for name, serializer_class, queryset in CASES:
+            rows = options['rows']
+
+            def drf():
+                return serializer_class(queryset()[:rows], many=True, context=context).data
+
+            def compiled():
+                return serializer_class.read_many(queryset()[:rows], context)
+
+            drf_time, expected = best_of(options['repeat'], drf)
+            compiled_time, actual = best_of(options['repeat'], compiled)
+            if not expected:
+                self.stdout.write(f"{name:17} no rows, skipped")
+                continue
+            if renderer.render(expected) != renderer.render(actual):
+                raise CommandError(f"{name}: compiled output differs from {serializer_class.__name__}.")
+            count = len(expected)
+            self.stdout.write(
+                f"{name:17} {count:6d} rows  DRF {count / drf_time:10.0f} rows/s  "
+                f"compiled {count / compiled_time:10.0f} rows/s  x{drf_time / compiled_time:.1f}  (identical JSON)"
+            )
@@ -0,0 +1,77 @@
+import re
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from rest_framework.authtoken.models import Token
+
+from account.models import Application, Job, User
+from student.models import CourseStatistics, Enrollment, Student
+from teacher.models import CourseTeaching
+
+YEAR = '2024-2025'
+CURSOR = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# A bare "SCAN <table>" line in EXPLAIN QUERY PLAN reads every row of the table.
+# "SCAN <table> USING [COVERING] INDEX ..." walks an index instead and is fine.
+FULL_SCAN = re.compile(r'\bSCAN (\w+)(?! USING)(\s|$)')
+
+
+def endpoint_queries():
+    """The selective queries behind each router endpoint, with representative arguments."""
+    return {
+        'auth: token lookup': Token.objects.filter(key='x').values(
+            'user_id', 'user__role', 'user__is_active', 'user__teacher', 'user__student'),
+        'admin/applications (status, next page)': Application.objects.filter(
+            status='pending', applied_on__gt=CURSOR).order_by('applied_on', 'id')[:51],
+        'admin/users (role, next page)': User.objects.filter(
+            role='student', date_joined__gt=CURSOR).order_by('date_joined', 'id')[:51],
+        'applications/pending': Application.objects.filter(status='pending').order_by('-applied_on', '-id')[:51],
+        'teacher: assignment check': CourseTeaching.objects.filter(
+            teacher_id=1, course_id=1, standard='5', academic_year=YEAR),
+        'teacher/my-courses': CourseTeaching.objects.filter(teacher_id=1),
+        'teacher/course-performance': Enrollment.objects.filter(
+            course_id=1, standard='5', academic_year=YEAR).select_related('student__user'),
+        'teacher/course-statistics': CourseStatistics.objects.filter(
+            course_id=1, standard='5', academic_year=YEAR),
+        'teacher/my-students': Enrollment.objects.filter(
+            student__in=Student.objects.filter(standard__in=['5', '6'], left_in__isnull=True),
+            course_id__in=[1, 2]).select_related('student__user', 'course'),
+        'student-performance/class-results': Enrollment.objects.filter(
+            standard='5', course_id=1, academic_year=YEAR).select_related('student__user', 'course'),
+        'student-performance/my-performance': Enrollment.objects.filter(student_id=1),
+        'enrollments (next page)': Enrollment.objects.filter(id__gt=100).order_by('id')[:51],
+        'enrollments (course, year, next page)': Enrollment.objects.filter(
+            course_id=1, academic_year=YEAR, id__gt=100).order_by('id')[:51],
+        'enrollments (student, next page)': Enrollment.objects.filter(
+            student_id=1, id__gt=100).order_by('id')[:51],
+        'run_jobs: claim': Job.objects.filter(
+            Q(status='queued', run_after__lte=CURSOR) | Q(status='running', locked_until__lt=CURSOR),
+        ).order_by('run_after', 'id').values_list('id', flat=True)[:50],
+    }
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN QUERY PLAN on each endpoint's queries and fail on full table scans (SQLite)."
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("check_query_plans understands SQLite query plans only.")
+
+        failures = []
+        for name, queryset in endpoint_queries().items():
+            plan = queryset.explain()
+            scans = [m.group(1) for line in plan.splitlines() if (m := FULL_SCAN.search(line))]
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN {name}: {', '.join(scans)}"))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(f"ok        {name}")
+            if options['verbosity'] > 1:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint queries do a full table scan.")
+        self.stdout.write(self.style.SUCCESS("No full table scans."))
@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from account.exports import EXPORT_FORMATS, application_rows, enrollment_rows, stream_rows
+
+
+class Command(BaseCommand):
+    help = "Stream Applications or Enrollments to CSV/NDJSON with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=['applications', 'enrollments'])
+        parser.add_argument('--output', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--file', help="Write here instead of stdout.")
+        parser.add_argument('--status', help="applications: filter by status")
+        parser.add_argument('--role', help="applications: filter by role")
+        parser.add_argument('--academic-year', help="enrollments: filter by academic year")
+        parser.add_argument('--standard', help="admission class / student standard")
+        parser.add_argument('--course-id', type=int, help="enrollments: filter by course")
+
+    def handle(self, *args, **options):
+        if options['dataset'] == 'applications':
+            if options['academic_year'] or options['course_id']:
+                raise CommandError("--academic-year/--course-id only apply to enrollments.")
+            columns, rows = application_rows(
+                status=options['status'], role=options['role'], standard=options['standard'],
+            )
+        else:
+            if options['status'] or options['role']:
+                raise CommandError("--status/--role only apply to applications.")
+            columns, rows = enrollment_rows(
+                academic_year=options['academic_year'],
+                standard=options['standard'],
+                course_id=options['course_id'],
+            )
+
+        out = open(options['file'], 'w', newline='', encoding='utf-8') if options['file'] else sys.stdout
+        try:
+            for chunk in stream_rows(columns, rows, options['output']):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
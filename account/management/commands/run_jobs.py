@@ -0,0 +1,38 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from account import jobs
+
+
+class Command(BaseCommand):
+    help = ("Process background jobs (account.jobs) in batches: application provisioning and "
+            "anything else queued with jobs.enqueue(). Runs until interrupted, or with --once "
+            "until nothing is due. Several workers can run side by side.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help="Seconds to sleep when no job is due.")
+        parser.add_argument('--once', action='store_true', help="Exit once no job is due.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        worker = uuid.uuid4().hex
+        self.stdout.write(f"Worker {worker} started.")
+        try:
+            while True:
+                close_old_connections()
+                outcomes = jobs.run_batch(options['batch_size'], worker)
+                if outcomes:
+                    self.stdout.write(', '.join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items())))
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Worker {worker} stopped.")
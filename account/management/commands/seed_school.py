@@ -0,0 +1,184 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from account.models import Application, User
+from account.provisioning import provision_applications
+from account.school_year import set_current_academic_year
+from student.models import Enrollment, Student
+from student.statistics import rebuild_course_statistics
+from teacher.assignments import invalidate_assignments
+from teacher.models import Course, CourseTeaching, Teacher
+
+# Everything this command creates is recognisable by these, so --flush can remove it.
+EMAIL_DOMAIN = 'seed.example'
+COURSE_PREFIX = 'SEED'
+
+STANDARDS = [value for value, _ in Student.STANDARD_CHOICES]
+STATUSES = [value for value, _ in Application.STATUS_CHOICES]
+BATCH_SIZE = 2000
+
+
+def academic_years(latest, count):
+    """['2022-2023', '2023-2024', '2024-2025'] for latest='2024-2025', count=3."""
+    start = int(latest.split('-')[0])
+    return [f"{year}-{year + 1}" for year in range(start - count + 1, start + 1)]
+
+
+class Command(BaseCommand):
+    help = ("Fill the database with a synthetic school (students, teachers, courses, "
+            "enrollments with marks, applications in every status) for benchmarking.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students-per-standard', type=int, default=40)
+        parser.add_argument('--courses', type=int, default=10)
+        parser.add_argument('--teachers', type=int, default=20)
+        parser.add_argument('--years', type=int, default=3, help="Academic years of enrollments.")
+        parser.add_argument('--latest-year', default='2024-2025')
+        parser.add_argument('--applications', type=int, default=5000,
+                            help="Applications, spread over every status.")
+        parser.add_argument('--password', default='password123', help="Password of every seeded account.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for reproducible data.")
+        parser.add_argument('--flush', action='store_true', help="Remove previously seeded data first.")
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            self.flush()
+        elif User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists():
+            raise CommandError("The database already holds seeded data; pass --flush to replace it.")
+
+        self.rng = random.Random(options['seed'])
+        # one hash for every account: hashing per user would dominate the run time
+        self.password_hash = make_password(options['password'])
+        years = academic_years(options['latest_year'], options['years'])
+
+        with transaction.atomic():
+            self.create_admins()
+            courses = self.create_courses(options['courses'])
+            teachers = self.create_teachers(options['teachers'])
+            assignments = self.assign_teachers(teachers, courses, years)
+            students = self.create_students(options['students_per_standard'])
+            enrollments = self.enroll(students, courses, years)
+            applications = self.create_applications(options['applications'])
+
+        # bulk_create sends no signals, so the derived tables are rebuilt here
+        statistics = rebuild_course_statistics()
+        invalidate_assignments(*(t.pk for t in teachers))
+        set_current_academic_year(years[-1])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(students)} students, {len(teachers)} teachers, {len(courses)} courses, "
+            f"{assignments} course assignments, {enrollments} enrollments over {len(years)} years, "
+            f"{applications} applications and {statistics} course statistics rows. "
+            f"Log in as superadmin@{EMAIL_DOMAIN} (or schooladmin@, teacher0@, student0@) "
+            f"with password '{options['password']}'."
+        ))
+
+    def flush(self):
+        with transaction.atomic():
+            # profiles and enrollments cascade from their users and courses
+            users, _ = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+            Course.objects.filter(course_code__startswith=COURSE_PREFIX).delete()
+            Application.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+        rebuild_course_statistics()
+        self.stdout.write(f"Removed previously seeded data ({users} rows).")
+
+    def build_users(self, role, names):
+        users = [
+            User.objects.build_user(email=f'{name}@{EMAIL_DOMAIN}', name=name.title(), role=role,
+                                    password_hash=self.password_hash)
+            for name in names
+        ]
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        # re-read so every backend hands us the primary keys
+        return list(User.objects.filter(email__in=[u.email for u in users]).order_by('id'))
+
+    def create_admins(self):
+        for role in ('superadmin', 'schooladmin'):
+            User.objects.create_user(email=f'{role}@{EMAIL_DOMAIN}', name=role.title(), role=role,
+                                     password_hash=self.password_hash)
+
+    def create_courses(self, count):
+        Course.objects.bulk_create([
+            Course(course_code=f'{COURSE_PREFIX}{i:03d}', course_name=f'Course {i}')
+            for i in range(count)
+        ])
+        return list(Course.objects.filter(course_code__startswith=COURSE_PREFIX).order_by('id'))
+
+    def create_teachers(self, count):
+        users = self.build_users('teacher', [f'teacher{i}' for i in range(count)])
+        Teacher.objects.bulk_create([
+            Teacher(user=user, teacher_id=f'TCH{user.pk:04d}',
+                    department='primary' if i % 2 == 0 else 'secondary')
+            for i, user in enumerate(users)
+        ])
+        return list(Teacher.objects.filter(user__in=users).order_by('user_id'))
+
+    def assign_teachers(self, teachers, courses, years):
+        if not teachers:
+            return 0
+        rows = []
+        slot = 0
+        for year in years:
+            for course in courses:
+                for standard in STANDARDS:
+                    rows.append(CourseTeaching(
+                        teacher=teachers[slot % len(teachers)], course=course,
+                        standard=standard, academic_year=year,
+                        is_class_teacher=course == courses[0],
+                    ))
+                    slot += 1
+        CourseTeaching.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        return len(rows)
+
+    def create_students(self, per_standard):
+        names = [f'student{i}' for i in range(per_standard * len(STANDARDS))]
+        users = self.build_users('student', names)
+        Student.objects.bulk_create([
+            Student(user=user, student_id=f'STU{user.pk:04d}', standard=STANDARDS[i % len(STANDARDS)],
+                    guardian_name=f'Guardian {i}')
+            for i, user in enumerate(users)
+        ], batch_size=BATCH_SIZE)
+        return list(Student.objects.filter(user__in=users).order_by('user_id'))
+
+    def marks(self):
+        value = min(100.0, max(0.0, self.rng.gauss(62, 18)))
+        return Decimal(f'{value:.2f}')
+
+    def enroll(self, students, courses, years):
+        current = years[-1]
+        rows = []
+        for year in years:
+            for student in students:
+                for course in courses:
+                    # a few of this year's papers are not marked yet
+                    marks = None if year == current and self.rng.random() < 0.05 else self.marks()
+                    rows.append(Enrollment(
+                        student=student, course=course, academic_year=year, standard=student.standard,
+                        marks_obtained=marks, grade=Enrollment.grade_for(marks),
+                        attendance_percentage=Decimal(f'{self.rng.uniform(60, 100):.2f}'),
+                    ))
+        Enrollment.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        return len(rows)
+
+    def create_applications(self, count):
+        rows = []
+        for i in range(count):
+            role = 'teacher' if i % 10 == 0 else 'student'
+            rows.append(Application(
+                name=f'Applicant {i}', email=f'applicant{i}@{EMAIL_DOMAIN}', role=role,
+                password=self.password_hash, status=STATUSES[i % len(STATUSES)],
+                first_name='Applicant', last_name=str(i), gender=self.rng.choice(['male', 'female']),
+                admission_class=self.rng.choice(STANDARDS) if role == 'student' else '',
+                department=self.rng.choice(['primary', 'secondary']) if role == 'teacher' else None,
+                city='Springfield', pincode=f'{560000 + i % 100:06d}',
+            ))
+        Application.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        # super-verified applicants have accounts, exactly as the verify flow leaves them
+        provision_applications(
+            Application.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}', status='super_verified')
+        )
+        return len(rows)
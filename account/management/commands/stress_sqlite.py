@@ -0,0 +1,128 @@
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from account.models import Application, User
+from home.db_routers import replica_enabled
+from student.models import Enrollment
+from teacher.models import CourseTeaching
+
+# prefix of the applications the writers submit; removed afterwards
+EMAIL_PREFIX = 'stress-'
+
+
+class Command(BaseCommand):
+    help = ("Run reader and writer threads against the API at once for a fixed time and report "
+            "throughput and \"database is locked\" errors. Writers submit registrations and "
+            "re-save marks (to their current value); readers call the read-only endpoints. "
+            "Compare runs with and without DJANGO_SQLITE_PROFILE=production. Run `seed_school` first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run.")
+        parser.add_argument('--readers', type=int, default=16)
+        parser.add_argument('--writers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        if options['duration'] <= 0 or options['readers'] < 0 or options['writers'] < 0:
+            raise CommandError("--duration must be positive and thread counts non-negative.")
+
+        teaching = CourseTeaching.objects.filter(
+            teacher__user__is_active=True,
+        ).order_by('-academic_year', 'id').select_related('teacher__user').first()
+        student = User.objects.filter(role='student', is_active=True, student__enrollments__isnull=False).first()
+        if teaching is None or student is None:
+            raise CommandError("Needs a teacher with assignments and an enrolled student.")
+        marks = list(
+            Enrollment.objects.filter(
+                course_id=teaching.course_id, academic_year=teaching.academic_year,
+                standard=teaching.standard, marks_obtained__isnull=False,
+            ).values_list('id', 'marks_obtained')
+        )
+        if not marks:
+            raise CommandError("The teacher's class has no marks to re-save.")
+
+        teacher_auth = 'Token ' + Token.objects.get_or_create(user=teaching.teacher.user)[0].key
+        student_auth = 'Token ' + Token.objects.get_or_create(user=student)[0].key
+        class_params = {'course_id': teaching.course_id, 'standard': teaching.standard,
+                        'academic_year': teaching.academic_year}
+        reads = [
+            (student_auth, reverse('student-profile'), {}),
+            (student_auth, reverse('student-performance-my-performance'), {}),
+            (teacher_auth, reverse('teacher-my-students'), {}),
+            (teacher_auth, reverse('student-performance-class-results'), class_params),
+        ]
+
+        def write(client, n):
+            if n % 2:
+                return client.post(reverse('auth-register'), {
+                    'name': 'Stress Applicant', 'email': f'{EMAIL_PREFIX}{uuid.uuid4().hex}@seed.example',
+                    'role': 'student', 'password': 'password123',
+                }, content_type='application/json')
+            pk, value = marks[n // 2 % len(marks)]
+            return client.patch(reverse('enrollments-update-marks', args=[pk]),
+                                {'marks_obtained': str(value)}, content_type='application/json',
+                                headers={'Authorization': teacher_auth})
+
+        def read(client, n):
+            auth, path, params = reads[n % len(reads)]
+            return client.get(path, params, headers={'Authorization': auth})
+
+        counts = {'read': Counter(), 'write': Counter()}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def worker(kind, call):
+            client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+            n, seen = 0, Counter()
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        response = call(client, n)
+                        outcome = 'ok' if response.status_code < 400 else f'http {response.status_code}'
+                        if response.status_code == 500 and 'database is locked' in str(response.content):
+                            outcome = 'locked'
+                    except Exception as exc:  # failures are what is being counted
+                        outcome = 'locked' if 'database is locked' in str(exc) else type(exc).__name__
+                    seen[outcome] += 1
+                    n += 1
+            finally:
+                connections.close_all()
+            with lock:
+                counts[kind].update(seen)
+
+        threads = (
+            [threading.Thread(target=worker, args=('read', read)) for _ in range(options['readers'])]
+            + [threading.Thread(target=worker, args=('write', write)) for _ in range(options['writers'])]
+        )
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        with connections['default'].cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        self.stdout.write(
+            f"journal_mode={journal_mode} replica={'on' if replica_enabled() else 'off'} "
+            f"readers={options['readers']} writers={options['writers']} {elapsed:.1f}s"
+        )
+        for kind in ('read', 'write'):
+            seen = counts[kind]
+            total = sum(seen.values())
+            details = ', '.join(f'{outcome}={count}' for outcome, count in sorted(seen.items()))
+            self.stdout.write(f"{kind:6} {total:7d} requests {seen['ok'] / elapsed:9.1f} ok/s  {details or '-'}")
+
+        removed, _ = Application.objects.filter(email__startswith=EMAIL_PREFIX).delete()
+        self.stdout.write(f"Removed {removed} stress applications.")
+        locked = counts['read']['locked'] + counts['write']['locked']
+        if locked:
+            self.stdout.write(self.style.WARNING(f"{locked} requests failed with \"database is locked\"."))
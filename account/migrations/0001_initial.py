@@ -1,32 +1,32 @@
-# Generated by Django 5.2.5 on 2025-08-06 21:01
-
-from django.db import migrations, models
-
-
-class Migration(migrations.Migration):
-
-    initial = True
-
-    dependencies = [
-    ]
-
-    operations = [
-        migrations.CreateModel(
-            name='User',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('password', models.CharField(max_length=128, verbose_name='password')),
-                ('role', models.CharField(choices=[('student', 'Student'), ('teacher', 'Teacher'), ('superadmin', 'Super Admin')], default='student', max_length=50)),
-                ('email', models.EmailField(max_length=60, unique=True)),
-                ('name', models.CharField(max_length=100)),
-                ('date_joined', models.DateTimeField(auto_now_add=True)),
-                ('last_login', models.DateTimeField(auto_now=True)),
-                ('is_active', models.BooleanField(default=True)),
-                ('is_staff', models.BooleanField(default=False)),
-                ('is_superuser', models.BooleanField(default=False)),
-            ],
-            options={
-                'abstract': False,
-            },
-        ),
-    ]
+# Generated by Django 5.2.5 on 2025-08-06 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('role', models.CharField(choices=[('student', 'Student'), ('teacher', 'Teacher'), ('superadmin', 'Super Admin')], default='student', max_length=50)),
+                ('email', models.EmailField(max_length=60, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('date_joined', models.DateTimeField(auto_now_add=True)),
+                ('last_login', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_staff', models.BooleanField(default=False)),
+                ('is_superuser', models.BooleanField(default=False)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
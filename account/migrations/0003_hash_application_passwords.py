@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import migrations
+
+
+def hash_raw_passwords(apps, schema_editor):
+    # Registration hashes passwords now; hash the ones submitted before that
+    # so approving an application never has to.
+    Application = apps.get_model('account', 'Application')
+    pending = []
+    for application in Application.objects.only('id', 'password').iterator(chunk_size=500):
+        try:
+            identify_hasher(application.password)
+        except ValueError:
+            application.password = make_password(application.password)
+            pending.append(application)
+        if len(pending) >= 500:
+            Application.objects.bulk_update(pending, ['password'])
+            pending = []
+    Application.objects.bulk_update(pending, ['password'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_application'),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_raw_passwords, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:40
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0005_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolSetting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('value', models.CharField(max_length=200)),
+            ],
+        ),
+    ]
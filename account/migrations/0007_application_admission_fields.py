@@ -0,0 +1,142 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0006_schoolsetting'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='application',
+            name='guardian_name',
+        ),
+        migrations.RemoveField(
+            model_name='application',
+            name='guardian_phone',
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='aadhaar',
+            field=models.CharField(blank=True, max_length=12, validators=[django.core.validators.RegexValidator('^\\d{12}$', 'Aadhaar must be 12 digits')]),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='admission_class',
+            field=models.CharField(blank=True, choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], max_length=2),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='age',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(40)]),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='area_name',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='blood_group',
+            field=models.CharField(blank=True, max_length=8),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='city',
+            field=models.CharField(blank=True, max_length=80),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='dob',
+            field=models.DateField(blank=True, null=True, verbose_name='Date of Birth'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='family_income',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='father_aadhaar',
+            field=models.CharField(blank=True, max_length=12, validators=[django.core.validators.RegexValidator('^\\d{12}$', 'Aadhaar must be 12 digits')]),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='father_name',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='father_occupation',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='first_name',
+            field=models.CharField(blank=True, max_length=80),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='gender',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='last_name',
+            field=models.CharField(blank=True, max_length=80),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='middle_name',
+            field=models.CharField(blank=True, max_length=80),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='mother_aadhaar',
+            field=models.CharField(blank=True, max_length=12, validators=[django.core.validators.RegexValidator('^\\d{12}$', 'Aadhaar must be 12 digits')]),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='mother_name',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='mother_occupation',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='pincode',
+            field=models.CharField(blank=True, max_length=6, validators=[django.core.validators.RegexValidator('^\\d{6}$', 'Pincode must be 6 digits')]),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='street_name',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='transfer_certificate_provided',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='role',
+            field=models.CharField(choices=[('student', 'Student'), ('teacher', 'Teacher'), ('schooladmin', 'School Admin'), ('superadmin', 'Super Admin')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('school_verified', 'School Admin Verified'), ('super_verified', 'Super Admin Verified'), ('rejected', 'Rejected')], default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('student', 'Student'), ('teacher', 'Teacher'), ('schooladmin', 'School Admin'), ('superadmin', 'Super Admin')], default='student', max_length=50),
+        ),
+    ]
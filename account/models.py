@@ -1,166 +1,273 @@
-from django.db import models
-from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
-from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
-
-
-class UserManager(BaseUserManager):
-    def create_user(self, email, name, role, password=None):
-        if not email:
-            raise ValueError("Email is required")
-        if not role:
-            role = "student"
-
-        user = self.model(
-            email=self.normalize_email(email),
-            name=name,
-            role=role,
-        )
-        user.set_password(password)
-        user.save(using=self._db)
-        return user
-
-    def create_superuser(self, email, name, password):
-        user = self.create_user(
-            email=email,
-            name=name,
-            password=password,
-            role="superadmin",
-        )
-        user.is_staff = True
-        user.is_superuser = True
-        user.save(using=self._db)
-        return user
-
-
-class User(AbstractBaseUser):
-    ROLE_CHOICES = [
-        ("student", "Student"),
-        ("teacher", "Teacher"),
-        ("schooladmin", "School Admin"),
-        ("superadmin", "Super Admin"),
-    ]
-    role = models.CharField(max_length=50, choices=ROLE_CHOICES, default="student")
-    email = models.EmailField(max_length=60, unique=True)
-    name = models.CharField(max_length=100)
-
-    username = None
-    date_joined = models.DateTimeField(auto_now_add=True)
-    last_login = models.DateTimeField(auto_now=True)
-    is_active = models.BooleanField(default=True)
-    is_staff = models.BooleanField(default=False)
-    is_superuser = models.BooleanField(default=False)
-
-    USERNAME_FIELD = "email"
-    REQUIRED_FIELDS = ["name"]
-
-    objects = UserManager()
-
-    def __str__(self):
-        return self.name
-
-    def has_perm(self, perm, obj=None):
-        return self.is_staff
-
-    def has_module_perms(self, app_label):
-        return True
-
-
-
-class Application(models.Model):
-    STATUS_CHOICES = [
-        ("pending", "Pending"),
-        ("school_verified", "School Admin Verified"),
-        ("super_verified", "Super Admin Verified"),
-        ("rejected", "Rejected"),
-    ]
-    
-    STANDARD_CHOICES = [
-        ("1", "Class 1"),
-        ("2", "Class 2"),
-        ("3", "Class 3"),
-        ("4", "Class 4"),
-        ("5", "Class 5"),
-        ("6", "Class 6"),
-        ("7", "Class 7"),
-        ("8", "Class 8"),
-        ("9", "Class 9"),
-        ("10", "Class 10"),
-    ]
-    DEPT_CHOICES = [("primary", "Primary Section"), ("secondary", "Secondary Section")]
-    
-    # for future reference
-    APPLICATION_ROLE_CHOICES = [
-    ("student", "Student"),
-    ("teacher", "Teacher"),
-]
-    #
-
-
-    name = models.CharField(max_length=100)                 # full name shown in admin
-    email = models.EmailField(unique=True)                  # used for account creation
-    role = models.CharField(max_length=50, choices=User.ROLE_CHOICES)
-    password = models.CharField(max_length=128)             # will be hashed when creating User
-
-    applied_on = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
-
-    # ---------------- Admission form: Student Information ----------------
-    # split name as per form (optional: we still keep `name` above for existing flows)
-    first_name = models.CharField(max_length=80, blank=True)
-    middle_name = models.CharField(max_length=80, blank=True)
-    last_name = models.CharField(max_length=80, blank=True)
-
-    aadhaar = models.CharField(
-        max_length=12, blank=True,
-        validators=[RegexValidator(r"^\d{12}$", "Aadhaar must be 12 digits")]
-    )
-    gender = models.CharField(max_length=16, blank=True)
-    dob = models.DateField(null=True, blank=True, verbose_name="Date of Birth")
-    age = models.PositiveSmallIntegerField(null=True, blank=True, validators=[MinValueValidator(1), MaxValueValidator(40)])
-    blood_group = models.CharField(max_length=8, blank=True)
-
-    admission_class = models.CharField(max_length=2, choices=STANDARD_CHOICES, blank=True)  # "Class for Admission"
-    previous_school = models.CharField(max_length=200, blank=True, null=True)
-    transfer_certificate_provided = models.BooleanField(default=False)
-
-    # Address (granular fields per form)
-    street_name = models.CharField(max_length=120, blank=True)
-    area_name = models.CharField(max_length=120, blank=True)
-    city = models.CharField(max_length=80, blank=True)
-    pincode = models.CharField(
-        max_length=6, blank=True,
-        validators=[RegexValidator(r"^\d{6}$", "Pincode must be 6 digits")]
-    )
-
-    # ---------------- Parent / Guardian Information ----------------
-    father_name = models.CharField(max_length=120, blank=True)
-    father_aadhaar = models.CharField(
-        max_length=12, blank=True,
-        validators=[RegexValidator(r"^\d{12}$", "Aadhaar must be 12 digits")]
-    )
-    father_occupation = models.CharField(max_length=120, blank=True)
-
-    mother_name = models.CharField(max_length=120, blank=True)
-    mother_aadhaar = models.CharField(
-        max_length=12, blank=True,
-        validators=[RegexValidator(r"^\d{12}$", "Aadhaar must be 12 digits")]
-    )
-    mother_occupation = models.CharField(max_length=120, blank=True)
-
-    family_income = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-
-    # ---------------- Existing common fields (kept for compatibility) ----------------
-    # Retained to avoid breaking existing APIs; you can deprecate later if desired.
-    date_of_birth = models.DateField(null=True, blank=True)       # legacy
-    address = models.TextField(null=True, blank=True)             # legacy
-    phone_number = models.CharField(max_length=15, null=True, blank=True)  # legacy
-    standard = models.CharField(max_length=10, null=True, blank=True)      # legacy (free-text)
-
-    # Teacher-specific (when role == teacher) — kept from repo and aligned with choices
-    department = models.CharField(max_length=100, choices=DEPT_CHOICES, null=True, blank=True)
-
-    documents = models.FileField(upload_to="application_docs/", null=True, blank=True)
-    notes = models.TextField(null=True, blank=True)
-
-    def __str__(self):
-        return f"Application from {self.name} ({self.status})"
+from django.db import models, transaction
+from django.utils import timezone
+from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
+from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
+from django.dispatch import Signal
+
+from .tracking import FieldTrackerMixin
+
+
+class UserManager(BaseUserManager):
+    def build_user(self, email, name, role, password=None, password_hash=None):
+        """
+        Unsaved User with the password set; used by create_user and bulk_create.
+        Pass `password_hash` (output of make_password) to skip hashing here.
+        """
+        if not email:
+            raise ValueError("Email is required")
+        if not role:
+            role = "student"
+
+        user = self.model(
+            email=self.normalize_email(email),
+            name=name,
+            role=role,
+        )
+        if password_hash is not None:
+            user.password = password_hash
+        else:
+            user.set_password(password)
+        return user
+
+    def create_user(self, email, name, role, password=None, password_hash=None):
+        user = self.build_user(email=email, name=name, role=role, password=password,
+                               password_hash=password_hash)
+        user.save(using=self._db)
+        return user
+
+    def create_superuser(self, email, name, password):
+        user = self.create_user(
+            email=email,
+            name=name,
+            password=password,
+            role="superadmin",
+        )
+        user.is_staff = True
+        user.is_superuser = True
+        user.save(using=self._db)
+        return user
+
+
+class User(FieldTrackerMixin, AbstractBaseUser):
+    ROLE_CHOICES = [
+        ("student", "Student"),
+        ("teacher", "Teacher"),
+        ("schooladmin", "School Admin"),
+        ("superadmin", "Super Admin"),
+    ]
+    role = models.CharField(max_length=50, choices=ROLE_CHOICES, default="student")
+    email = models.EmailField(max_length=60, unique=True)
+    name = models.CharField(max_length=100)
+
+    username = None
+    date_joined = models.DateTimeField(auto_now_add=True)
+    last_login = models.DateTimeField(auto_now=True)
+    is_active = models.BooleanField(default=True)
+    is_staff = models.BooleanField(default=False)
+    is_superuser = models.BooleanField(default=False)
+
+    USERNAME_FIELD = "email"
+    REQUIRED_FIELDS = ["name"]
+
+    objects = UserManager()
+
+    # cached token identities depend on these (see account.authentication)
+    tracked_fields = ("role", "is_active", "name", "email")
+
+    class Meta:
+        indexes = [
+            # AdminViewSet.users: cursor pagination, optionally filtered by role
+            models.Index(fields=["date_joined", "id"], name="user_joined_idx"),
+            models.Index(fields=["role", "date_joined", "id"], name="user_role_joined_idx"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def has_perm(self, perm, obj=None):
+        return self.is_staff
+
+    def has_module_perms(self, app_label):
+        return True
+
+
+
+# Sent when Application.transition() wins; receivers get instance, source and target.
+application_transitioned = Signal()
+
+
+class Application(FieldTrackerMixin, models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("school_verified", "School Admin Verified"),
+        ("super_verified", "Super Admin Verified"),
+        ("rejected", "Rejected"),
+    ]
+    
+    STANDARD_CHOICES = [
+        ("1", "Class 1"),
+        ("2", "Class 2"),
+        ("3", "Class 3"),
+        ("4", "Class 4"),
+        ("5", "Class 5"),
+        ("6", "Class 6"),
+        ("7", "Class 7"),
+        ("8", "Class 8"),
+        ("9", "Class 9"),
+        ("10", "Class 10"),
+    ]
+    DEPT_CHOICES = [("primary", "Primary Section"), ("secondary", "Secondary Section")]
+    
+    # for future reference
+    APPLICATION_ROLE_CHOICES = [
+    ("student", "Student"),
+    ("teacher", "Teacher"),
+]
+    #
+
+
+    name = models.CharField(max_length=100)                 # full name shown in admin
+    email = models.EmailField(unique=True)                  # used for account creation
+    role = models.CharField(max_length=50, choices=User.ROLE_CHOICES)
+    password = models.CharField(max_length=128)             # make_password() output (ApplicationSerializer)
+
+    applied_on = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+
+    # ---------------- Admission form: Student Information ----------------
+    # split name as per form (optional: we still keep `name` above for existing flows)
+    first_name = models.CharField(max_length=80, blank=True)
+    middle_name = models.CharField(max_length=80, blank=True)
+    last_name = models.CharField(max_length=80, blank=True)
+
+    aadhaar = models.CharField(
+        max_length=12, blank=True,
+        validators=[RegexValidator(r"^\d{12}$", "Aadhaar must be 12 digits")]
+    )
+    gender = models.CharField(max_length=16, blank=True)
+    dob = models.DateField(null=True, blank=True, verbose_name="Date of Birth")
+    age = models.PositiveSmallIntegerField(null=True, blank=True, validators=[MinValueValidator(1), MaxValueValidator(40)])
+    blood_group = models.CharField(max_length=8, blank=True)
+
+    admission_class = models.CharField(max_length=2, choices=STANDARD_CHOICES, blank=True)  # "Class for Admission"
+    previous_school = models.CharField(max_length=200, blank=True, null=True)
+    transfer_certificate_provided = models.BooleanField(default=False)
+
+    # Address (granular fields per form)
+    street_name = models.CharField(max_length=120, blank=True)
+    area_name = models.CharField(max_length=120, blank=True)
+    city = models.CharField(max_length=80, blank=True)
+    pincode = models.CharField(
+        max_length=6, blank=True,
+        validators=[RegexValidator(r"^\d{6}$", "Pincode must be 6 digits")]
+    )
+
+    # ---------------- Parent / Guardian Information ----------------
+    father_name = models.CharField(max_length=120, blank=True)
+    father_aadhaar = models.CharField(
+        max_length=12, blank=True,
+        validators=[RegexValidator(r"^\d{12}$", "Aadhaar must be 12 digits")]
+    )
+    father_occupation = models.CharField(max_length=120, blank=True)
+
+    mother_name = models.CharField(max_length=120, blank=True)
+    mother_aadhaar = models.CharField(
+        max_length=12, blank=True,
+        validators=[RegexValidator(r"^\d{12}$", "Aadhaar must be 12 digits")]
+    )
+    mother_occupation = models.CharField(max_length=120, blank=True)
+
+    family_income = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
+    # ---------------- Existing common fields (kept for compatibility) ----------------
+    # Retained to avoid breaking existing APIs; you can deprecate later if desired.
+    date_of_birth = models.DateField(null=True, blank=True)       # legacy
+    address = models.TextField(null=True, blank=True)             # legacy
+    phone_number = models.CharField(max_length=15, null=True, blank=True)  # legacy
+    standard = models.CharField(max_length=10, null=True, blank=True)      # legacy (free-text)
+
+    # Teacher-specific (when role == teacher) — kept from repo and aligned with choices
+    department = models.CharField(max_length=100, choices=DEPT_CHOICES, null=True, blank=True)
+
+    documents = models.FileField(upload_to="application_docs/", null=True, blank=True)
+    notes = models.TextField(null=True, blank=True)
+
+    tracked_fields = ("status",)
+
+    class Meta:
+        indexes = [
+            # status queues (pending / awaiting-super) and cursor pagination on applied_on
+            models.Index(fields=["status", "applied_on", "id"], name="application_status_idx"),
+            models.Index(fields=["applied_on", "id"], name="application_applied_idx"),
+        ]
+
+    def __str__(self):
+        return f"Application from {self.name} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        # post_save receivers (e.g. the provisioning job) commit or roll back with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def transition(self, source, target):
+        """
+        Compare-and-swap the status with a single
+        `UPDATE ... SET status=target WHERE id=? AND status=source`.
+
+        Returns True if this call moved the row. If another request got there
+        first nothing is written and False is returned; side effects
+        (`application_transitioned` receivers) run only for the winner, in the
+        same transaction as the update.
+        """
+        with transaction.atomic():
+            won = Application.objects.filter(pk=self.pk, status=source).update(status=target) == 1
+            if won:
+                self.status = target
+                self._snapshot_tracked(["status"])
+                application_transitioned.send(sender=Application, instance=self, source=source, target=target)
+        return won
+
+
+class Job(models.Model):
+    """
+    A unit of background work (see account.jobs). Enqueued inside the writing
+    transaction, so it exists exactly when the change that needs it commits.
+    """
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    # worker holding the job and until when; an expired lease is claimable again
+    claimed_by = models.CharField(max_length=32, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # the worker's claim query: due jobs in order
+            models.Index(fields=["status", "run_after", "id"], name="job_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class SchoolSetting(models.Model):
+    """School-wide key/value settings; read them through accessors such as account.school_year."""
+    key = models.CharField(max_length=50, unique=True)
+    value = models.CharField(max_length=200)
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
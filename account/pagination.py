@@ -0,0 +1,31 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Keyset pagination used by every list endpoint unless a view overrides it.
+    Each page is a `WHERE key > last_seen ORDER BY key LIMIT n` query, so page
+    1000 costs the same as page 1 (no OFFSET scan).
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('pk',)
+
+
+class ApplicationCursorPagination(DefaultCursorPagination):
+    # `id` breaks ties between applications submitted in the same instant
+    ordering = ('applied_on', 'id')
+
+
+class ApplicationQueueCursorPagination(ApplicationCursorPagination):
+    # the review queues list the newest applications first
+    ordering = ('-applied_on', '-id')
+
+
+class UserCursorPagination(DefaultCursorPagination):
+    ordering = ('date_joined', 'id')
+
+
+class EnrollmentCursorPagination(DefaultCursorPagination):
+    ordering = ('id',)
@@ -0,0 +1,226 @@
+# account/provisioning.py
+"""
+Turns approved Applications into Users plus Student/Teacher profiles.
+
+Shared by the background job the per-row signals enqueue and the bulk
+super-verify endpoint, so both paths end in exactly the same state.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.db import transaction
+
+from student.models import Student
+from teacher.models import Teacher
+from . import jobs
+from .authentication import invalidate_user
+from .models import Application
+
+# --- Helpers ---
+
+def _get(instance, attr, default=None):
+    """Safe getattr that returns default if attr missing or value is empty string."""
+    val = getattr(instance, attr, default)
+    if val in ("", None):
+        return default
+    return val
+
+def _build_full_address(instance):
+    """
+    Prefer granular fields if present; otherwise fall back to legacy Application.address.
+    """
+    street = _get(instance, "street_name", "")
+    area = _get(instance, "area_name", "")
+    city = _get(instance, "city", "")
+    pin = _get(instance, "pincode", "")
+
+    parts = [p for p in [street, area, city, pin] if p]
+    if parts:
+        return ", ".join(parts)
+    return _get(instance, "address", None)
+
+def _generate_student_id(user_id: int) -> str:
+    return f"STU{user_id:04d}"
+
+def _generate_teacher_id(user_id: int) -> str:
+    return f"TCH{user_id:04d}"
+
+def _password_kwargs(value):
+    """
+    Applications store make_password() output since registration hashes it;
+    rows submitted before that still hold the raw password and get hashed here.
+    """
+    try:
+        identify_hasher(value)
+    except ValueError:
+        return {"password": value}
+    return {"password_hash": value}
+
+def _model_kwargs(model, values):
+    """Drop admission fields the profile model does not (yet) have columns for."""
+    names = {f.name for f in model._meta.concrete_fields}
+    return {k: v for k, v in values.items() if k in names}
+
+
+# --- Profile field mapping ---
+
+def student_profile_kwargs(instance, user):
+    # Standard: prefer admissions admission_class; fallback to legacy standard
+    admission_class = _get(instance, "admission_class", None)
+    standard = admission_class or _get(instance, "standard", None) or "1"  # safe fallback
+
+    return _model_kwargs(Student, dict(
+        user=user,
+        student_id=_generate_student_id(user.id),
+
+        # original required field
+        standard=standard,
+
+        # original fields
+        date_of_birth=_get(instance, "dob", _get(instance, "date_of_birth", None)),
+        address=_build_full_address(instance),
+        phone_number=_get(instance, "phone_number", None),
+        guardian_name=_get(instance, "guardian_name", None),
+        guardian_phone=_get(instance, "guardian_phone", None),
+
+        # new admissions-aligned fields (optional)
+        first_name=_get(instance, "first_name", ""),
+        middle_name=_get(instance, "middle_name", ""),
+        last_name=_get(instance, "last_name", ""),
+        aadhaar=_get(instance, "aadhaar", ""),
+        gender=_get(instance, "gender", ""),
+        dob=_get(instance, "dob", None),  # kept separate; primary is date_of_birth above
+        age=_get(instance, "age", None),
+        blood_group=_get(instance, "blood_group", ""),
+
+        admission_class=admission_class or "",
+        previous_school=_get(instance, "previous_school", ""),
+        transfer_certificate_provided=bool(_get(instance, "transfer_certificate_provided", False)),
+
+        street_name=_get(instance, "street_name", ""),
+        area_name=_get(instance, "area_name", ""),
+        city=_get(instance, "city", ""),
+        pincode=_get(instance, "pincode", ""),
+
+        father_name=_get(instance, "father_name", ""),
+        father_aadhaar=_get(instance, "father_aadhaar", ""),
+        father_occupation=_get(instance, "father_occupation", ""),
+
+        mother_name=_get(instance, "mother_name", ""),
+        mother_aadhaar=_get(instance, "mother_aadhaar", ""),
+        mother_occupation=_get(instance, "mother_occupation", ""),
+
+        family_income=_get(instance, "family_income", None),
+    ))
+
+def teacher_profile_kwargs(instance, user):
+    return _model_kwargs(Teacher, dict(
+        user=user,
+        teacher_id=_generate_teacher_id(user.id),
+
+        # keep legacy teacher fields if you have them (address/phone/hire_date set by model defaults)
+        address=_get(instance, "address", None),
+        phone_number=_get(instance, "phone_number", None),
+        department=_get(instance, "department", "primary"),
+
+        # map admissions-common if present (all optional)
+        first_name=_get(instance, "first_name", ""),
+        middle_name=_get(instance, "middle_name", ""),
+        last_name=_get(instance, "last_name", ""),
+        aadhaar=_get(instance, "aadhaar", ""),
+        gender=_get(instance, "gender", ""),
+        date_of_birth=_get(instance, "dob", _get(instance, "date_of_birth", None)),
+
+        street_name=_get(instance, "street_name", ""),
+        area_name=_get(instance, "area_name", ""),
+        city=_get(instance, "city", ""),
+        pincode=_get(instance, "pincode", ""),
+    ))
+
+
+# --- Provisioning ---
+
+def provision_applications(applications):
+    """
+    Create the User and Student/Teacher profile for every super-verified
+    application, reusing any User that already exists for the email and never
+    creating a second profile. Runs a fixed number of queries per batch.
+    """
+    UserModel = get_user_model()
+    applications = list(applications)
+    emails = {UserModel.objects.normalize_email(app.email): app for app in applications}
+
+    users = {u.email: u for u in UserModel.objects.filter(email__in=list(emails))}
+    reused = {u.pk for u in users.values()}
+    new_users = [
+        UserModel.objects.build_user(
+            email=email,
+            name=_get(app, "name", f"User {app.email}"),
+            role=app.role,
+            **_password_kwargs(app.password),
+        )
+        for email, app in emails.items() if email not in users
+    ]
+    if new_users:
+        UserModel.objects.bulk_create(new_users)
+        # re-read so every backend hands us the primary keys
+        users.update((u.email, u) for u in UserModel.objects.filter(email__in=[u.email for u in new_users]))
+
+    by_role = {"student": {}, "teacher": {}}
+    for email, app in emails.items():
+        if app.role in by_role:
+            user = users[email]
+            by_role[app.role][user.pk] = (app, user)
+
+    students = by_role["student"]
+    if students:
+        have = set(Student.objects.filter(user__in=list(students)).values_list("user_id", flat=True))
+        Student.objects.bulk_create([
+            Student(**student_profile_kwargs(app, user))
+            for pk, (app, user) in students.items() if pk not in have
+        ])
+        students = {pk: v for pk, v in students.items() if pk not in have}
+
+    teachers = by_role["teacher"]
+    if teachers:
+        have = set(Teacher.objects.filter(user__in=list(teachers)).values_list("user_id", flat=True))
+        Teacher.objects.bulk_create([
+            Teacher(**teacher_profile_kwargs(app, user))
+            for pk, (app, user) in teachers.items() if pk not in have
+        ])
+        teachers = {pk: v for pk, v in teachers.items() if pk not in have}
+
+    # bulk_create sends no signals: a reused account that just gained a profile
+    # may have a cached token identity without it
+    stale = reused & (set(students) | set(teachers))
+    if stale:
+        transaction.on_commit(lambda: invalidate_user(stale))
+
+    return {
+        "users_created": len(new_users),
+        "students_created": len(students),
+        "teachers_created": len(teachers),
+    }
+
+
+# --- Background provisioning (account.jobs) ---
+
+PROVISION_JOB = "provision_application"
+
+def enqueue_provisioning(application):
+    """Queue provisioning for an application that just became super_verified, in the same transaction."""
+    return jobs.enqueue(PROVISION_JOB, {"application_id": application.pk})
+
+@jobs.handler(PROVISION_JOB)
+def _provision_job(payloads):
+    ids = [payload["application_id"] for payload in payloads]
+    verified = Application.objects.filter(pk__in=ids, status="super_verified").in_bulk()
+    provision_applications(verified.values())
+
+    UserModel = get_user_model()
+    emails = {pk: UserModel.objects.normalize_email(app.email) for pk, app in verified.items()}
+    user_ids = dict(UserModel.objects.filter(email__in=list(emails.values())).values_list("email", "id"))
+    return [
+        {"user_id": user_ids[emails[pk]]} if pk in emails
+        else {"skipped": "Application is no longer super_verified."}
+        for pk in ids
+    ]
@@ -0,0 +1,85 @@
+# account/renderers.py
+"""
+JSON rendering and parsing backed by orjson when it is installed.
+
+orjson encodes dicts, lists, strings and numbers in C. Every other type
+(Decimal, datetime/date/time, timedelta, UUID, lazy strings, querysets) is
+handed to DRF's JSONEncoder.default(). Bodies therefore come out exactly as
+JSONRenderer writes them:
+- COERCE_DECIMAL_TO_STRING still decides whether DecimalFields produce
+  strings or numbers;
+- a raw Decimal still renders as a number;
+- datetimes keep DRF's "Z" suffix;
+- U+2028/U+2029 are still escaped.
+
+Cases where orjson would behave differently go to JSONRenderer/JSONParser:
+- indented output (?indent=, the browsable API);
+- UNICODE_JSON=False and STRICT_JSON=False;
+- non-UTF-8 request bodies, and bodies with numbers of 19 or more digits
+  (orjson reads integers beyond 64 bits as floats);
+- data orjson refuses to encode, such as ints beyond 64 bits or non-string
+  dict keys.
+Two differences remain, both only for floats:
+- NaN and Infinity, which JSONRenderer refuses with a ValueError, render as
+  null;
+- floats that need an exponent are spelled differently ("1e16" rather than
+  "1e+16"). These are equal values, but the bytes differ.
+Without orjson both classes behave exactly like DRF's.
+"""
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # datetimes/dates/times go through DRF's encoder, which formats them its own way
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+# a number that may not fit in 64 bits is a run of 19 digits. Mapping every
+# digit to '0' and looking for b'0' * 19 runs in C; a regex costs several times
+# orjson.loads(). False positives (long strings of digits) take the slow path.
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_LONG_NUMBER = b'0' * 19
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # as JSONRenderer: keep the output a strict JavaScript subset
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            utf8 = codecs.lookup(encoding).name == 'utf-8'
+        except LookupError:
+            utf8 = False
+        if orjson is None or not self.strict or not utf8:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if _LONG_NUMBER not in body.translate(_DIGITS_TO_ZERO):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        # JSONParser's result, or its ParseError message
+        return super().parse(io.BytesIO(body), media_type, parser_context)
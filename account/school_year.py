@@ -0,0 +1,53 @@
+# account/school_year.py
+"""
+The current academic year ("2024-2025"): the default for every
+`academic_year` query parameter and model field.
+
+Stored as a SchoolSetting row and cached for ACADEMIC_YEAR_CACHE_TTL seconds
+(at most LOCAL_CACHE_MAX_TTL on a process-local cache). rollover_year moves it
+forward once the new year's rows exist.
+"""
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .caching import shared_ttl
+from .models import SchoolSetting
+
+DEFAULT_ACADEMIC_YEAR = getattr(settings, 'DEFAULT_ACADEMIC_YEAR', '2024-2025')
+ACADEMIC_YEAR_CACHE_TTL = shared_ttl(getattr(settings, 'ACADEMIC_YEAR_CACHE_TTL', 300))
+
+_SETTING = 'current_academic_year'
+_CACHE_KEY = 'school:setting:current_academic_year'
+_FORMAT = re.compile(r'^(\d{4})-(\d{4})$')
+
+
+def is_academic_year(value):
+    """True for "YYYY-YYYY" spanning consecutive years."""
+    match = _FORMAT.match(value) if isinstance(value, str) else None
+    return bool(match) and int(match.group(2)) == int(match.group(1)) + 1
+
+
+def next_academic_year(year):
+    end = int(year.split('-')[1])
+    return f'{end}-{end + 1}'
+
+
+def current_academic_year():
+    year = cache.get(_CACHE_KEY)
+    if year is None:
+        year = (
+            SchoolSetting.objects.filter(key=_SETTING).values_list('value', flat=True).first()
+            or DEFAULT_ACADEMIC_YEAR
+        )
+        cache.set(_CACHE_KEY, year, ACADEMIC_YEAR_CACHE_TTL)
+    return year
+
+
+def set_current_academic_year(year):
+    if not is_academic_year(year):
+        raise ValueError(f"{year!r} is not an academic year like '2024-2025'.")
+    SchoolSetting.objects.update_or_create(key=_SETTING, defaults={'value': year})
+    transaction.on_commit(lambda: cache.delete(_CACHE_KEY))
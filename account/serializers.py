@@ -1,100 +1,141 @@
-from rest_framework import serializers
-from django.contrib.auth import authenticate
-from .models import User, Application
-from student.models import Student, Enrollment
-from teacher.models import Teacher, Course, CourseTeaching
-
-class UserLoginSerializer(serializers.Serializer):
-    
-    email = serializers.EmailField()
-    password = serializers.CharField(write_only=True)
-    
-    def validate(self, data):
-        email = data.get('email')
-        password = data.get('password')
-        
-        if email and password:
-            user = authenticate(email=email, password=password)
-            if user:
-                if not user.is_active:
-                    raise serializers.ValidationError("User account is disabled.")
-                return user
-            raise serializers.ValidationError("Invalid email or password.")
-        raise serializers.ValidationError("Must include 'email' and 'password'.")
-
-class ApplicationSerializer(serializers.ModelSerializer):
-    
-    class Meta:
-        model = Application
-        fields = '__all__'
-        extra_kwargs = {
-            'password': {'write_only': True},
-            'status': {'read_only': True},
-            'applied_on': {'read_only': True}
-        }
-
-class UserSerializer(serializers.ModelSerializer):
-    
-    class Meta:
-        model = User
-        fields = ['id', 'email', 'name', 'role', 'date_joined']
-
-class StudentSerializer(serializers.ModelSerializer):
-   
-    user_name = serializers.CharField(source='user.name', read_only=True)
-    user_email = serializers.CharField(source='user.email', read_only=True)
-    
-    class Meta:
-        model = Student
-        fields = '__all__'
-
-class TeacherSerializer(serializers.ModelSerializer):
-   
-    user_name = serializers.CharField(source='user.name', read_only=True)
-    user_email = serializers.CharField(source='user.email', read_only=True)
-    
-    class Meta:
-        model = Teacher
-        fields = '__all__'
-
-class CourseSerializer(serializers.ModelSerializer):
-  
-    class Meta:
-        model = Course
-        fields = '__all__'
-
-class CourseTeachingSerializer(serializers.ModelSerializer):
-
-    teacher_name = serializers.CharField(source='teacher.user.name', read_only=True)
-    course_name = serializers.CharField(source='course.course_name', read_only=True)
-    
-    class Meta:
-        model = CourseTeaching
-        fields = '__all__'
-
-class EnrollmentSerializer(serializers.ModelSerializer):
-    
-    student_name = serializers.CharField(source='student.user.name', read_only=True)
-    course_name = serializers.CharField(source='course.course_name', read_only=True)
-    
-    class Meta:
-        model = Enrollment
-        fields = '__all__'
-
-# class EnrollmentSerializer(serializers.ModelSerializer):
-#     student_name = serializers.CharField(source='student.user.name', read_only=True)
-#     course_name = serializers.CharField(source='course.course_name', read_only=True)
-    
-#     class Meta:
-#         model = Enrollment
-#         fields = ['id', 'student', 'student_name', 'course', 'course_name', 
-#                  'enrollment_date', 'academic_year', 'grade', 'marks_obtained', 
-#                  'total_marks', 'attendance_percentage', 'status']
-#         extra_kwargs = {
-#             'id': {'read_only': True}
-#         }
-        
-class EnrollmentCreateSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Enrollment
-        fields = ['student', 'course', 'academic_year', 'marks_obtained', 'total_marks', 'grade']
\ No newline at end of file
+from decimal import Decimal
+
+from rest_framework import serializers
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from .compiled import CompiledReadMixin
+from .eager_loading import EagerLoadingMixin
+from .fieldsets import SparseFieldsetsMixin
+from .models import User, Application, Job
+from student.models import Student, Enrollment
+from teacher.models import Teacher, Course, CourseTeaching
+
+class UserLoginSerializer(serializers.Serializer):
+    
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+    
+    def validate(self, data):
+        email = data.get('email')
+        password = data.get('password')
+        
+        if email and password:
+            user = authenticate(email=email, password=password)
+            if user:
+                if not user.is_active:
+                    raise serializers.ValidationError("User account is disabled.")
+                return user
+            raise serializers.ValidationError("Invalid email or password.")
+        raise serializers.ValidationError("Must include 'email' and 'password'.")
+
+class ApplicationSerializer(CompiledReadMixin, SparseFieldsetsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    
+    class Meta:
+        model = Application
+        fields = '__all__'
+        extra_kwargs = {
+            'password': {'write_only': True},
+            'status': {'read_only': True},
+            'applied_on': {'read_only': True}
+        }
+
+    def validate_password(self, value):
+        # every write path stores make_password() output; approval reuses the hash
+        return make_password(value)
+
+class UserSerializer(SparseFieldsetsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'name', 'role', 'date_joined']
+
+class StudentSerializer(SparseFieldsetsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+   
+    user_name = serializers.CharField(source='user.name', read_only=True)
+    user_email = serializers.CharField(source='user.email', read_only=True)
+    
+    class Meta:
+        model = Student
+        fields = '__all__'
+        select_related = ('user',)
+        prefetch_related = ('courses',)
+
+class TeacherSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+   
+    user_name = serializers.CharField(source='user.name', read_only=True)
+    user_email = serializers.CharField(source='user.email', read_only=True)
+    
+    class Meta:
+        model = Teacher
+        fields = '__all__'
+        select_related = ('user',)
+
+class CourseSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+  
+    class Meta:
+        model = Course
+        fields = '__all__'
+        prefetch_related = ('teachers',)
+
+class CourseTeachingSerializer(CompiledReadMixin, EagerLoadingMixin, serializers.ModelSerializer):
+
+    teacher_name = serializers.CharField(source='teacher.user.name', read_only=True)
+    course_name = serializers.CharField(source='course.course_name', read_only=True)
+    
+    class Meta:
+        model = CourseTeaching
+        fields = '__all__'
+        select_related = ('teacher__user', 'course')
+
+class EnrollmentSerializer(CompiledReadMixin, SparseFieldsetsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    
+    student_name = serializers.CharField(source='student.user.name', read_only=True)
+    course_name = serializers.CharField(source='course.course_name', read_only=True)
+    
+    class Meta:
+        model = Enrollment
+        fields = '__all__'
+        select_related = ('student__user', 'course')
+
+# class EnrollmentSerializer(serializers.ModelSerializer):
+#     student_name = serializers.CharField(source='student.user.name', read_only=True)
+#     course_name = serializers.CharField(source='course.course_name', read_only=True)
+    
+#     class Meta:
+#         model = Enrollment
+#         fields = ['id', 'student', 'student_name', 'course', 'course_name', 
+#                  'enrollment_date', 'academic_year', 'grade', 'marks_obtained', 
+#                  'total_marks', 'attendance_percentage', 'status']
+#         extra_kwargs = {
+#             'id': {'read_only': True}
+#         }
+        
+class EnrollmentCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Enrollment
+        fields = ['student', 'course', 'academic_year', 'marks_obtained', 'total_marks', 'grade']
+
+class EnrollmentMarksSerializer(serializers.ModelSerializer):
+    # teachers only set marks; the grade follows from them as in bulk_marks
+    class Meta:
+        model = Enrollment
+        fields = ['marks_obtained', 'total_marks', 'grade']
+        read_only_fields = ['grade']
+
+    def validate(self, attrs):
+        marks = attrs.get('marks_obtained', getattr(self.instance, 'marks_obtained', None))
+        total = attrs.get('total_marks', getattr(self.instance, 'total_marks', Decimal('100')))
+        if total <= 0:
+            raise serializers.ValidationError({'total_marks': 'Must be greater than 0.'})
+        if marks is not None and not 0 <= marks <= total:
+            raise serializers.ValidationError({'marks_obtained': f'Must be between 0 and {total}.'})
+        attrs['grade'] = Enrollment.grade_for(marks, total)
+        return attrs
+
+class JobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'payload', 'status', 'attempts', 'max_attempts', 'run_after',
+                  'result', 'last_error', 'created_at', 'finished_at']
+        read_only_fields = fields
@@ -1,3 +1,874 @@
-from django.test import TestCase
-
-# Create your tests here.
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from account import authentication, exports, jobs, renderers
+from account.checks import check_shared_cache
+from account.models import Application, Job, User, application_transitioned
+from account.serializers import (
+    ApplicationSerializer, CourseSerializer, CourseTeachingSerializer, EnrollmentSerializer, StudentSerializer,
+    TeacherSerializer,
+)
+from student.models import Enrollment, Student
+from teacher import assignments
+from teacher.models import Course, CourseTeaching, Teacher
+
+# the shared file cache would carry entries between test runs and developers' servers
+LOCAL_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class CacheResetMixin:
+    """
+    Start every test with empty caches: LOCAL_CACHES is one store for the whole
+    test process, and the token and assignment LRUs are module globals.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        authentication._local_tokens.clear()
+        assignments._local_assignments.clear()
+
+
+def token_client(user):
+    """APIClient authenticating through CachedTokenAuthentication, like real clients."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=user)[0].key}')
+    return client
+
+
+def make_application(email='applicant@example.com', role='student', **fields):
+    return Application.objects.create(name='Applicant', email=email, role=role, password='x', **fields)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ApplicationTransitionTests(TestCase):
+
+    def setUp(self):
+        self.application = make_application()
+        self.sent = []
+        application_transitioned.connect(self.record, sender=Application)
+
+    def tearDown(self):
+        application_transitioned.disconnect(self.record, sender=Application)
+
+    def record(self, sender, instance, source, target, **kwargs):
+        self.sent.append((instance.pk, source, target))
+
+    def test_winner_moves_the_row_and_sends_the_signal(self):
+        self.assertTrue(self.application.transition('pending', 'school_verified'))
+        self.assertEqual(self.application.status, 'school_verified')
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, 'school_verified')
+        self.assertEqual(self.sent, [(self.application.pk, 'pending', 'school_verified')])
+
+    def test_loser_writes_nothing_and_sends_no_signal(self):
+        # two admins loaded the same pending application
+        first = Application.objects.get(pk=self.application.pk)
+        second = Application.objects.get(pk=self.application.pk)
+        self.assertTrue(first.transition('pending', 'school_verified'))
+        self.assertFalse(second.transition('pending', 'rejected'))
+
+        self.assertEqual(second.status, 'pending')  # the loser's copy is not touched
+        self.assertEqual(Application.objects.get(pk=self.application.pk).status, 'school_verified')
+        self.assertEqual(self.sent, [(self.application.pk, 'pending', 'school_verified')])
+
+    def test_loser_does_not_overwrite_other_columns(self):
+        stale = Application.objects.get(pk=self.application.pk)
+        Application.objects.filter(pk=self.application.pk).update(status='rejected', notes='duplicate')
+        stale.notes = 'edited in memory'
+        self.assertFalse(stale.transition('pending', 'school_verified'))
+        self.assertEqual(Application.objects.get(pk=self.application.pk).notes, 'duplicate')
+
+    def test_losing_approval_queues_no_provisioning_job(self):
+        Application.objects.filter(pk=self.application.pk).update(status='school_verified')
+        first = Application.objects.get(pk=self.application.pk)
+        second = Application.objects.get(pk=self.application.pk)
+        self.assertTrue(first.transition('school_verified', 'super_verified'))
+        self.assertFalse(second.transition('school_verified', 'super_verified'))
+        self.assertEqual(Job.objects.filter(kind='provision_application').count(), 1)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class JobQueueTests(TestCase):
+    KIND = 'test.echo'
+
+    def setUp(self):
+        self.calls = []
+
+        @jobs.handler(self.KIND)
+        def echo(payloads):
+            self.calls.append([p['n'] for p in payloads])
+            if any(p.get('fail') for p in payloads):
+                raise RuntimeError('boom')
+            return [p['n'] for p in payloads]
+
+    def tearDown(self):
+        jobs._handlers.pop(self.KIND, None)
+
+    def test_claim_takes_due_jobs_only(self):
+        due = jobs.enqueue(self.KIND, {'n': 1})
+        jobs.enqueue(self.KIND, {'n': 2}, run_after=timezone.now() + timedelta(hours=1))
+
+        claimed = jobs.claim(10, 'w1')
+        self.assertEqual([job.pk for job in claimed], [due.pk])
+        job = claimed[0]
+        self.assertEqual((job.status, job.claimed_by, job.attempts), ('running', 'w1', 1))
+        self.assertGreater(job.locked_until, timezone.now())
+        # a running job under a live lease is not claimed again
+        self.assertEqual(jobs.claim(10, 'w2'), [])
+
+    def test_batch_runs_handler_once(self):
+        for n in range(3):
+            jobs.enqueue(self.KIND, {'n': n})
+        self.assertEqual(jobs.run_batch(worker='w1'), {'done': 3})
+        self.assertEqual(self.calls, [[0, 1, 2]])
+        self.assertEqual(sorted(Job.objects.values_list('result', flat=True)), [0, 1, 2])
+
+    def test_failing_job_is_isolated_from_its_batch(self):
+        good = jobs.enqueue(self.KIND, {'n': 1})
+        bad = jobs.enqueue(self.KIND, {'n': 2, 'fail': True})
+        with self.assertLogs('account.jobs', 'WARNING'):
+            self.assertEqual(jobs.run_batch(worker='w1'), {'done': 1, 'retried': 1})
+        self.assertEqual(Job.objects.get(pk=good.pk).status, 'done')
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.locked_until), ('queued', None))
+        self.assertIn('boom', bad.last_error)
+
+    def test_retry_backs_off_exponentially_then_fails(self):
+        job = jobs.enqueue(self.KIND, {'n': 1, 'fail': True}, max_attempts=3)
+        for attempt in (1, 2):
+            delay = jobs.JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+            before = timezone.now()
+            with self.assertLogs('account.jobs', 'ERROR'):
+                self.assertEqual(jobs.run_batch(worker='w1'), {'retried': 1})
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), ('queued', attempt))
+            self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+            self.assertLess(job.run_after, before + timedelta(seconds=delay + 5))
+            # not due yet
+            self.assertEqual(jobs.run_batch(worker='w1'), {})
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+        with self.assertLogs('account.jobs', 'ERROR'):
+            self.assertEqual(jobs.run_batch(worker='w1'), {'failed': 1})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 3))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_expired_lease_is_claimed_again(self):
+        job = jobs.enqueue(self.KIND, {'n': 1})
+        [stale] = jobs.claim(10, 'w1')
+        # w1 died: its lease runs out
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(jobs.run_batch(worker='w2'), {'done': 1})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.claimed_by, job.attempts), ('done', 'w2', 2))
+        # w1 coming back late must not overwrite w2's outcome
+        jobs._fail(stale, 'late')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), ('done', ''))
+
+    def test_expired_lease_on_last_attempt_fails_the_job(self):
+        job = jobs.enqueue(self.KIND, {'n': 1}, max_attempts=1)
+        jobs.claim(10, 'w1')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(jobs.run_batch(worker='w2'), {'failed': 1})
+        self.assertEqual(self.calls, [])
+
+    def test_unknown_kind_fails_without_retrying(self):
+        job = jobs.enqueue('test.unregistered', {})
+        self.assertEqual(jobs.run_batch(worker='w1'), {'failed': 1})
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'failed')
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class EagerLoadingTests(TestCase):
+    """Serializing a list costs the same number of queries for any number of rows."""
+
+    def add_rows(self, n):
+        course = Course.objects.create(course_code=f'C{n}', course_name=f'Course {n}')
+        user = User.objects.create_user(email=f't{n}@example.com', name=f'Teacher {n}', role='teacher')
+        teacher = Teacher.objects.create(user=user, teacher_id=f'T{n}', department='primary')
+        CourseTeaching.objects.create(teacher=teacher, course=course, standard='5', academic_year='2024-2025')
+        user = User.objects.create_user(email=f's{n}@example.com', name=f'Student {n}', role='student')
+        student = Student.objects.create(user=user, student_id=f'S{n}', standard='5')
+        Enrollment.objects.create(student=student, course=course, academic_year='2024-2025')
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        cases = [
+            (StudentSerializer, Student.objects.all(), 2),  # + courses prefetch
+            (TeacherSerializer, Teacher.objects.all(), 1),
+            (CourseSerializer, Course.objects.all(), 2),  # + teachers prefetch
+            (EnrollmentSerializer, Enrollment.objects.all(), 1),
+            (CourseTeachingSerializer, CourseTeaching.objects.all(), 1),
+        ]
+        for rows in (2, 5):
+            while Student.objects.count() < rows:
+                self.add_rows(Student.objects.count())
+            for serializer_class, queryset, queries in cases:
+                with self.subTest(serializer=serializer_class.__name__, rows=rows):
+                    with self.assertNumQueries(queries):
+                        data = serializer_class(queryset.all(), many=True).data
+                    self.assertEqual(len(data), rows)
+
+    def test_sparse_fields_skip_unused_relations(self):
+        self.add_rows(0)
+        context = {'request': Request(APIRequestFactory().get('/', {'fields': 'student_id,standard'}))}
+        with CaptureQueriesContext(connection) as queries:
+            data = StudentSerializer(Student.objects.all(), many=True, context=context).data
+        self.assertEqual(data, [{'student_id': 'S0', 'standard': '5'}])
+        # no courses prefetch and no user join
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('account_user', queries[0]['sql'])
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class CompiledReaderTests(TestCase):
+    """CompiledReadMixin.read_many must produce exactly what the serializer does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            make_application(email=f'a{i}@example.com', first_name=f'F{i}', admission_class=str(i + 1),
+                             family_income=Decimal('1234.50') if i else None)
+        course = Course.objects.create(course_code='MATH', course_name='Maths')
+        teacher_user = User.objects.create_user(email='t@example.com', name='Teacher', role='teacher')
+        teacher = Teacher.objects.create(user=teacher_user, teacher_id='T1', department='primary')
+        CourseTeaching.objects.create(teacher=teacher, course=course, standard='5', academic_year='2024-2025')
+        for i in range(3):
+            user = User.objects.create_user(email=f's{i}@example.com', name=f'Student {i}', role='student')
+            student = Student.objects.create(user=user, student_id=f'S{i}', standard='5')
+            Enrollment.objects.create(student=student, course=course, academic_year='2024-2025',
+                                      marks_obtained=Decimal('70.5') if i else None, grade='B1' if i else None)
+
+    def context(self, **params):
+        return {'request': Request(APIRequestFactory().get('/', params))}
+
+    def assertSameOutput(self, serializer_class, queryset, context):
+        expected = serializer_class(
+            serializer_class.setup_eager_loading(queryset, context), many=True, context=context
+        ).data
+        actual = serializer_class.read_many(queryset, context)
+        # byte-for-byte, so key order and value types must match too
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_full_rows(self):
+        cases = [
+            (ApplicationSerializer, Application.objects.order_by('id')),
+            (EnrollmentSerializer, Enrollment.objects.order_by('id')),
+            (CourseTeachingSerializer, CourseTeaching.objects.order_by('id')),
+        ]
+        for serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertSameOutput(serializer_class, queryset, self.context())
+
+    def test_sparse_fields(self):
+        cases = [
+            (ApplicationSerializer, Application.objects.order_by('id'), {'fields': 'id,first_name,family_income'}),
+            (ApplicationSerializer, Application.objects.order_by('id'), {'omit': 'documents,notes'}),
+            (EnrollmentSerializer, Enrollment.objects.order_by('id'), {'fields': 'student_name,marks_obtained'}),
+        ]
+        for serializer_class, queryset, params in cases:
+            with self.subTest(serializer=serializer_class.__name__, params=params):
+                context = self.context(**params)
+                self.assertSameOutput(serializer_class, queryset, context)
+                self.assertEqual(
+                    list(serializer_class.read_many(queryset, context)[0]),
+                    [name for name, field in serializer_class(context=context).fields.items()
+                     if not field.write_only],
+                )
+
+    def test_empty_queryset(self):
+        self.assertEqual(EnrollmentSerializer.read_many(Enrollment.objects.none(), self.context()), [])
+
+
+class SharedCacheCheckTests(TestCase):
+    FILE_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                               'LOCATION': '/tmp/unused'}}
+    REDIS_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                                'LOCATION': 'redis://localhost:6379'}}
+
+    def test_requires_a_cache_server(self):
+        for caches, required, errors in [
+            (self.FILE_CACHES, True, ['account.E001']),
+            (LOCAL_CACHES, True, ['account.E001']),
+            (self.REDIS_CACHES, True, []),
+            (self.FILE_CACHES, False, []),
+        ]:
+            with self.subTest(backend=caches['default']['BACKEND'], required=required):
+                with self.settings(CACHES=caches, REQUIRE_SHARED_CACHE=required):
+                    self.assertEqual([error.id for error in check_shared_cache(None)], errors)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class CachedTokenAuthenticationTests(CacheResetMixin, TestCase):
+    PROFILE = '/api/student/profile/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='s@example.com', name='Student', role='student')
+        Student.objects.create(user=self.user, student_id='S1', standard='5')
+        self.client = token_client(self.user)
+        self.assertEqual(self.client.get(self.PROFILE).status_code, 200)
+
+    def test_warm_requests_skip_the_token_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.PROFILE).status_code, 200)
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('"authtoken_token"', sql)
+        self.assertNotIn('FROM "account_user"', sql)
+
+    def test_logout(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post('/api/auth/logout/').status_code, 200)
+        self.assertEqual(self.client.get(self.PROFILE).status_code, 401)
+
+    def test_deactivation(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.is_active = False
+            self.user.save()
+            # nothing is forgotten before the change commits
+            self.assertEqual(self.client.get(self.PROFILE).status_code, 200)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(self.PROFILE).status_code, 401)
+
+    def test_role_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = 'teacher'
+            self.user.save()
+        self.assertEqual(self.client.get(self.PROFILE).status_code, 403)
+
+    def test_removed_profile(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.filter(user=self.user).delete()
+        self.assertEqual(self.client.get(self.PROFILE).status_code, 404)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ConditionalGetTests(CacheResetMixin, TestCase):
+    PROFILE = '/api/student/profile/'
+    PERFORMANCE = '/api/student-performance/my-performance/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='s@example.com', name='Student', role='student')
+        self.student = Student.objects.create(user=self.user, student_id='S1', standard='5')
+        self.course = Course.objects.create(course_code='MATH', course_name='Maths')
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.course,
+                                                    academic_year='2024-2025')
+        self.client = token_client(self.user)
+
+    def assertRefetched(self, url, etag):
+        """The old ETag no longer matches: a full 200 under a new one."""
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        return response
+
+    def test_unchanged_is_not_modified(self):
+        response = self.client.get(self.PROFILE)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.PROFILE, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(
+            self.client.get(self.PROFILE, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+    def test_rename_changes_the_etag(self):
+        etag = self.client.get(self.PROFILE)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = 'Renamed'
+            self.user.save()
+        self.assertEqual(self.assertRefetched(self.PROFILE, etag).data['user_name'], 'Renamed')
+
+    def test_marks_change_the_etag(self):
+        etag = self.client.get(self.PERFORMANCE)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollment.marks_obtained = Decimal('88')
+            self.enrollment.save()
+        self.assertEqual(self.assertRefetched(self.PERFORMANCE, etag).data[0]['marks_obtained'], '88.00')
+
+    def test_course_rename_changes_every_etag(self):
+        etag = self.client.get(self.PERFORMANCE)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.course_name = 'Mathematics'
+            self.course.save()
+        self.assertEqual(self.assertRefetched(self.PERFORMANCE, etag).data[0]['course_name'], 'Mathematics')
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ApplicationQueueTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        # two pairs submitted in the same instant
+        offsets = [0, 1, 1, 2, 3, 3, 4]
+        self.applications = [make_application(email=f'a{i}@example.com') for i in range(len(offsets))]
+        for application, minutes in zip(self.applications, offsets):
+            Application.objects.filter(pk=application.pk).update(applied_on=now - timedelta(minutes=minutes))
+        self.newest_first = [
+            application.pk for minutes, application
+            in sorted(zip(offsets, self.applications), key=lambda pair: (pair[0], -pair[1].pk))
+        ]
+        admin = User.objects.create_user(email='admin@example.com', name='Admin', role='schooladmin')
+        self.client = token_client(admin)
+
+    def pages(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+            url = response.data['next']
+        return pages
+
+    def test_newest_first_across_ties(self):
+        pages = self.pages('/api/applications/pending/?page_size=2')
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+        self.assertEqual(sum(pages, []), self.newest_first)
+
+    def test_next_link(self):
+        response = self.client.get('/api/applications/pending/?page_size=3')
+        self.assertTrue(response.data['next'].startswith('http://testserver/api/applications/pending/?'))
+        self.assertIn('cursor=', response.data['next'])
+        self.assertIn('page_size=3', response.data['next'])
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNone(self.client.get('/api/applications/pending/?page_size=10').data['next'])
+
+    def test_new_submissions_do_not_shift_later_pages(self):
+        first = self.client.get('/api/applications/pending/?page_size=3').data
+        make_application(email='late@example.com')
+        rest = self.pages(first['next'])
+        self.assertEqual([row['id'] for row in first['results']] + sum(rest, []), self.newest_first)
+
+    def test_only_the_queue_status(self):
+        Application.objects.filter(pk=self.applications[0].pk).update(status='school_verified')
+        self.assertNotIn(self.applications[0].pk, sum(self.pages('/api/applications/pending/'), []))
+        superadmin = User.objects.create_user(email='super@example.com', name='Super', role='superadmin')
+        self.assertEqual(self.client.get('/api/applications/awaiting-super/').status_code, 403)
+        self.client = token_client(superadmin)
+        self.assertEqual(self.pages('/api/applications/awaiting-super/'), [[self.applications[0].pk]])
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class AdminListPaginationTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        for i, minutes in enumerate([5, 5, 3, 1]):
+            application = make_application(email=f'a{i}@example.com', status='rejected' if i == 2 else 'pending')
+            Application.objects.filter(pk=application.pk).update(applied_on=now - timedelta(minutes=minutes))
+        self.superadmin = User.objects.create_user(email='super@example.com', name='Super', role='superadmin')
+        for i in range(3):
+            User.objects.create_user(email=f't{i}@example.com', name=f'T{i}', role='teacher')
+        self.client = token_client(self.superadmin)
+
+    def ids(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_applications_oldest_first(self):
+        oldest_first = Application.objects.order_by('applied_on', 'id').values_list('id', flat=True)
+        self.assertEqual(self.ids('/api/admin/applications/?page_size=2'), list(oldest_first))
+        self.assertEqual(self.ids('/api/admin/applications/?page_size=2&status=pending'),
+                         list(oldest_first.filter(status='pending')))
+
+    def test_users_by_join_date(self):
+        teachers = list(User.objects.filter(role='teacher').order_by('date_joined', 'id').values_list('id', flat=True))
+        self.assertEqual(self.ids('/api/admin/users/?page_size=2&role=teacher'), teachers)
+        self.assertEqual(len(self.ids('/api/admin/users/?page_size=2')), 4)
+
+    def test_page_size_is_capped(self):
+        for i in range(3):
+            make_application(email=f'extra{i}@example.com')
+        with mock.patch('account.pagination.ApplicationCursorPagination.max_page_size', 3):
+            response = self.client.get('/api/admin/applications/?page_size=100')
+        self.assertEqual(len(response.data['results']), 3)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class BulkSuperVerifyTests(CacheResetMixin, TestCase):
+    URL = '/api/applications/bulk-super-verify/'
+
+    def setUp(self):
+        super().setUp()
+        superadmin = User.objects.create_user(email='super@example.com', name='Super', role='superadmin')
+        self.client = token_client(superadmin)
+        self.student_app = make_application(email='kid@example.com', status='school_verified', admission_class='3')
+        self.teacher_app = make_application(email='teach@example.com', role='teacher', status='school_verified',
+                                            department='secondary')
+        # an account that exists already, without a profile
+        self.existing = User.objects.create_user(email='back@example.com', name='Back', role='student')
+        self.reused_app = make_application(email='back@example.com', status='school_verified')
+        self.pending_app = make_application(email='wait@example.com')
+
+    def verify(self, ids):
+        return self.client.post(self.URL, {'ids': ids}, format='json')
+
+    def test_rejects_non_integer_ids(self):
+        for ids in ([], 'x', [str(self.student_app.pk)], [1.5], [True], [None], [[1]]):
+            with self.subTest(ids=ids):
+                self.assertEqual(self.verify(ids).status_code, 400)
+        self.assertEqual(Application.objects.filter(status='super_verified').count(), 0)
+
+    def test_provisions_in_bulk(self):
+        ids = [self.student_app.pk, self.teacher_app.pk, self.reused_app.pk, self.pending_app.pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.verify(ids)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'verified': sorted(ids[:3]), 'skipped': [self.pending_app.pk],
+            'users_created': 2, 'students_created': 2, 'teachers_created': 1,
+        })
+        self.assertEqual(Student.objects.get(user__email='kid@example.com').standard, '3')
+        self.assertEqual(Teacher.objects.get(user__email='teach@example.com').department, 'secondary')
+        self.assertTrue(Student.objects.filter(user=self.existing).exists())
+        # bulk provisioning does not also queue the per-application job
+        self.assertFalse(Job.objects.exists())
+
+        # a second run finds nothing left to verify
+        response = self.verify(ids)
+        self.assertEqual((response.data['verified'], response.data['users_created']), ([], 0))
+
+    def test_concurrent_status_change_is_a_conflict(self):
+        real_update = QuerySet.update
+
+        def racing_update(queryset, **kwargs):
+            if queryset.model is Application and kwargs.get('status') == 'super_verified':
+                # another admin rejects one of the rows after they were read
+                with connection.cursor() as cursor:
+                    cursor.execute('UPDATE account_application SET status = %s WHERE id = %s',
+                                   ['rejected', self.teacher_app.pk])
+            return real_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', racing_update):
+            response = self.verify([self.student_app.pk, self.teacher_app.pk])
+        self.assertEqual(response.status_code, 409)
+        # nothing from the failed attempt is kept
+        self.assertEqual(
+            set(Application.objects.filter(pk__in=[self.student_app.pk, self.teacher_app.pk])
+                .values_list('status', flat=True)),
+            {'school_verified'},
+        )
+        self.assertFalse(User.objects.filter(email__in=['kid@example.com', 'teach@example.com']).exists())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ExportTests(CacheResetMixin, TestCase):
+    ENROLLMENTS = '/api/admin/export-enrollments/'
+
+    def setUp(self):
+        super().setUp()
+        maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        self.science = Course.objects.create(course_code='SCI', course_name='Science')
+        for i, course in enumerate([maths, maths, self.science]):
+            user = User.objects.create_user(email=f's{i}@example.com', name=f'Student, {i}', role='student')
+            student = Student.objects.create(user=user, student_id=f'S{i}', standard='5')
+            Enrollment.objects.create(student=student, course=course, academic_year='2024-2025',
+                                      marks_obtained=Decimal('70.5') if i else None)
+        make_application()
+        superadmin = User.objects.create_user(email='super@example.com', name='Super', role='superadmin')
+        self.client = token_client(superadmin)
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        response, body = self.export(self.ENROLLMENTS)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="enrollments.csv"')
+        rows = list(csv.reader(body.splitlines()))
+        self.assertEqual(rows[0], exports.ENROLLMENT_COLUMNS)
+        self.assertEqual(len(rows), 4)
+        row = dict(zip(rows[0], rows[2]))
+        self.assertEqual((row['student__user__name'], row['course__course_code'], row['marks_obtained']),
+                         ('Student, 1', 'MATH', '70.50'))
+
+    def test_ndjson(self):
+        response, body = self.export(self.ENROLLMENTS, output='ndjson', course_id=self.science.pk)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(row['course__course_code'], row['marks_obtained']) for row in rows], [('SCI', '70.50')])
+        self.assertEqual(list(rows[0]), exports.ENROLLMENT_COLUMNS)
+
+    def test_streams_in_chunks(self):
+        with mock.patch.object(exports, 'FLUSH_BYTES', 1):
+            response = self.client.get(self.ENROLLMENTS)
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 4)  # flushed after the header and every row
+
+    def test_applications_leave_out_the_password(self):
+        _, body = self.export('/api/admin/export-applications/')
+        header = next(csv.reader(body.splitlines()))
+        self.assertIn('email', header)
+        self.assertNotIn('password', header)
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get(self.ENROLLMENTS, {'course_id': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(self.ENROLLMENTS, {'output': 'xml'}).status_code, 400)
+
+
+@override_settings(CACHES=LOCAL_CACHES, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PasswordHashingTests(CacheResetMixin, TestCase):
+
+    def register(self, email='new@example.com', password='s3cret-pass'):
+        response = APIClient().post('/api/auth/register/', {
+            'name': 'New', 'email': email, 'role': 'student', 'password': password,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Application.objects.get(pk=response.data['application_id'])
+
+    def approve(self, application):
+        Application.objects.filter(pk=application.pk).update(status='school_verified')
+        application.refresh_from_db()
+        self.assertTrue(application.transition('school_verified', 'super_verified'))
+        self.assertEqual(jobs.run_batch(worker='w1'), {'done': 1})
+        return User.objects.get(email=application.email)
+
+    def test_registration_stores_a_hash(self):
+        application = self.register()
+        identify_hasher(application.password)
+        self.assertTrue(check_password('s3cret-pass', application.password))
+        self.assertNotIn('password', ApplicationSerializer(application).data)
+
+    def test_approval_reuses_the_hash(self):
+        application = self.register()
+        user = self.approve(application)
+        self.assertEqual(user.password, application.password)
+        response = APIClient().post('/api/auth/login/', {'email': 'new@example.com', 'password': 's3cret-pass'},
+                                    format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_raw_legacy_password_is_hashed_at_approval(self):
+        # rows submitted before registration hashed passwords
+        user = self.approve(make_application(email='old@example.com'))
+        identify_hasher(user.password)
+        self.assertTrue(user.check_password('x'))
+
+    def test_create_user_with_a_hash(self):
+        hashed = make_password('pw')
+        user = User.objects.create_user(email='h@example.com', name='H', role='teacher', password_hash=hashed)
+        self.assertEqual(user.password, hashed)
+        self.assertTrue(user.check_password('pw'))
+        self.assertTrue(User.objects.create_user(email='p@example.com', name='P', role='teacher',
+                                                 password='pw').check_password('pw'))
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class SparseFieldsetsTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.superadmin = User.objects.create_user(email='super@example.com', name='Super', role='superadmin')
+        self.client = token_client(self.superadmin)
+
+    def get(self, url, status_code=200):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code, response.data)
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_fields_narrow_the_response_and_the_select(self):
+        response, sql = self.get('/api/admin/users/?fields=id,email')
+        self.assertEqual([list(row) for row in response.data['results']], [['id', 'email']])
+        self.assertNotIn('"account_user"."name"', sql)
+
+    def test_omit(self):
+        response, _ = self.get('/api/admin/users/?omit=date_joined,role')
+        self.assertEqual(list(response.data['results'][0]), ['id', 'email', 'name'])
+
+    def test_unknown_names_are_a_bad_request(self):
+        response, _ = self.get('/api/admin/users/?fields=id,emial', 400)
+        self.assertEqual(response.data, {'fields': ['Unknown field(s): emial.']})
+        response, _ = self.get('/api/admin/applications/?omit=pasword', 400)
+        self.assertIn('omit', response.data)
+
+    def test_values_list_endpoint(self):
+        teacher = User.objects.create_user(email='t@example.com', name='Teacher', role='teacher')
+        self.client = token_client(teacher)
+        course = Course.objects.create(course_code='MATH', course_name='Maths')
+        student = Student.objects.create(
+            user=User.objects.create_user(email='s@example.com', name='Student', role='student'),
+            student_id='S1', standard='5',
+        )
+        Enrollment.objects.create(student=student, course=course, academic_year='2024-2025')
+        response, sql = self.get('/api/enrollments/?fields=course,grade')
+        self.assertEqual(response.data['results'], [{'course': course.pk, 'grade': None}])
+        self.assertNotIn('marks_obtained', sql)
+        self.get('/api/enrollments/?fields=student_name', 400)
+
+    async def test_async_endpoints(self):
+        user = await User.objects.acreate(email='s@example.com', name='Student', role='student')
+        await Student.objects.acreate(user=user, student_id='S1', standard='5')
+        token = await Token.objects.acreate(user=user)
+        headers = {'Authorization': f'Token {token.key}'}
+        response = await self.async_client.get('/api/async/student/profile/?fields=student_id,user_name',
+                                               headers=headers)
+        self.assertEqual(json.loads(response.content), {'student_id': 'S1', 'user_name': 'Student'})
+        response = await self.async_client.get('/api/async/student/profile/?fields=nope', headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {'fields': ['Unknown field(s): nope.']})
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class AsyncEndpointTests(CacheResetMixin, TestCase):
+    """/api/async/ must answer exactly like the synchronous endpoint it mirrors."""
+
+    @classmethod
+    def setUpTestData(cls):
+        maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        cls.users = {
+            role: User.objects.create_user(email=f'{role}@example.com', name=role.title(), role=role)
+            for role in ('schooladmin', 'superadmin', 'teacher', 'student')
+        }
+        teacher = Teacher.objects.create(user=cls.users['teacher'], teacher_id='T1', department='primary')
+        CourseTeaching.objects.create(teacher=teacher, course=maths, standard='5', academic_year='2024-2025')
+        student = Student.objects.create(user=cls.users['student'], student_id='S1', standard='5')
+        Enrollment.objects.create(student=student, course=maths, academic_year='2024-2025',
+                                  marks_obtained=Decimal('81.5'), grade='A2')
+        for i, status in enumerate(['pending', 'pending', 'pending', 'school_verified']):
+            make_application(email=f'a{i}@example.com', status=status, family_income=Decimal('100.10'))
+        cls.class_results = f'student-performance/class-results/?standard=5&course_id={maths.pk}&academic_year=2024-2025'
+
+    def fetch(self, role, path):
+        token = Token.objects.get_or_create(user=self.users[role])[0].key
+        sync = token_client(self.users[role]).get(f'/api/{path}')
+        asynchronous = async_to_sync(self.async_client.get)(
+            f'/api/async/{path}', headers={'Authorization': f'Token {token}'}
+        )
+        return sync, asynchronous
+
+    def assertSameResponse(self, role, path):
+        sync, asynchronous = self.fetch(role, path)
+        self.assertEqual(asynchronous.status_code, sync.status_code)
+        self.assertEqual(asynchronous['Content-Type'], sync['Content-Type'])
+        # the async pages link to their own URLs
+        self.assertEqual(asynchronous.content.replace(b'/api/async/', b'/api/'), sync.content)
+
+    def test_same_bodies(self):
+        for role, path in [
+            ('schooladmin', 'applications/pending/'),
+            ('schooladmin', 'applications/pending/?page_size=2&fields=id,email'),
+            ('superadmin', 'applications/awaiting-super/'),
+            ('student', 'student/profile/'),
+            ('student', 'student-performance/my-performance/'),
+            ('teacher', self.class_results),
+            ('teacher', 'teacher/profile/'),
+            ('teacher', 'teacher/my-courses/'),
+        ]:
+            with self.subTest(path=path):
+                self.assertSameResponse(role, path)
+
+    def test_same_errors(self):
+        for role, path in [
+            ('teacher', 'student/profile/'),
+            ('teacher', 'student-performance/class-results/?standard=5'),
+            ('teacher', 'student-performance/class-results/?standard=6&course_id=1&academic_year=2024-2025'),
+            ('student', 'applications/pending/'),
+        ]:
+            with self.subTest(role=role, path=path):
+                sync, asynchronous = self.fetch(role, path)
+                self.assertEqual(asynchronous.status_code, sync.status_code)
+
+    def test_authentication(self):
+        response = async_to_sync(self.async_client.get)('/api/async/student/profile/')
+        self.assertEqual((response.status_code, response['WWW-Authenticate']), (401, 'Token'))
+        response = async_to_sync(self.async_client.get)(
+            '/api/async/student/profile/', headers={'Authorization': 'Token nope'})
+        self.assertEqual(response.status_code, 401)
+        _, response = self.fetch('student', 'student/profile/')
+        self.assertEqual(response.status_code, 200)
+        not_modified = async_to_sync(self.async_client.get)('/api/async/student/profile/', headers={
+            'Authorization': f'Token {Token.objects.get(user=self.users["student"]).key}',
+            'If-None-Match': response['ETag'],
+        })
+        self.assertEqual(not_modified.status_code, 304)
+
+
+class FastJSONTests(TestCase):
+    """FastJSONRenderer/FastJSONParser must match DRF's JSON classes byte for byte."""
+    DATA = {
+        'decimal': Decimal('12.50'),
+        'when': datetime(2024, 6, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        'day': date(2024, 6, 1),
+        'at': time(8, 30),
+        'duration': timedelta(hours=1, seconds=5),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'lazy': gettext_lazy('Class 5'),
+        'text': 'Zoë \u2028 line \u2029 para',
+        'rows': [{'n': 1, 'ok': True, 'none': None, 'float': 0.1}],
+        'huge': 2 ** 70,
+    }
+
+    def assertSameRendering(self, data, media_type=None, context=None):
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(data, media_type, context),
+            JSONRenderer().render(data, media_type, context),
+        )
+
+    def test_render(self):
+        for data in (self.DATA, [self.DATA], {1: 'int key'}, None, 'plain', []):
+            with self.subTest(data=data):
+                self.assertSameRendering(data)
+        self.assertSameRendering(self.DATA, 'application/json; indent=2', {})
+
+    def test_render_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertSameRendering(self.DATA)
+
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), None, {'encoding': encoding})
+
+    def test_parse(self):
+        for body in (b'{"a": [1, 2.5, "x", null, true]}', b'{"n": 12345678901234567890123}',
+                     b'{"t": "Zo\xc3\xab"}', b'[]'):
+            with self.subTest(body=body):
+                fast = self.parse(renderers.FastJSONParser(), body)
+                self.assertEqual(fast, self.parse(JSONParser(), body))
+                self.assertEqual(json.dumps(fast), json.dumps(self.parse(JSONParser(), body)))
+        body = '{"t": "Zoë"}'.encode('latin-1')
+        self.assertEqual(self.parse(renderers.FastJSONParser(), body, 'latin-1'), {'t': 'Zoë'})
+
+    def test_parse_errors(self):
+        for body in (b'{"a": ', b'{"a": NaN}', b'\xff'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as fast:
+                    self.parse(renderers.FastJSONParser(), body)
+                with self.assertRaises(ParseError) as drf:
+                    self.parse(JSONParser(), body)
+                self.assertEqual(str(fast.exception), str(drf.exception))
@@ -0,0 +1,55 @@
+# account/tracking.py
+"""
+In-memory field change tracking for models.
+
+Values of `tracked_fields` are remembered when an instance is loaded from the
+database and again after every save, so signal handlers can ask "did status
+change, and from what" without re-reading the row.
+"""
+
+
+class FieldTrackerMixin:
+    # attnames, e.g. "status" or "student_id" for a ForeignKey
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked()
+        return instance
+
+    def _snapshot_tracked(self, fields=None):
+        originals = getattr(self, "_tracked_originals", {})
+        for field in fields or self.tracked_fields:
+            # deferred fields were never loaded, so there is nothing to compare against
+            if field in self.tracked_fields and field in self.__dict__:
+                originals[field] = self.__dict__[field]
+        self._tracked_originals = originals
+
+    def has_changed(self, field):
+        """True if `field` differs from its loaded value (or was never loaded, e.g. new rows)."""
+        originals = getattr(self, "_tracked_originals", {})
+        if field not in originals:
+            return True
+        return originals[field] != getattr(self, field)
+
+    def is_tracked(self, field):
+        """True if the loaded value of `field` is known, i.e. previous_value() is meaningful."""
+        return field in getattr(self, "_tracked_originals", {})
+
+    def previous_value(self, field):
+        """Value of `field` as last loaded/saved; None for instances not read from the database."""
+        return getattr(self, "_tracked_originals", {}).get(field)
+
+    def changed_fields(self):
+        return {f: self.previous_value(f) for f in self.tracked_fields if self.has_changed(f)}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save receivers have run by now and still saw the old values
+        self._snapshot_tracked(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        # loading a deferred field must not hide unsaved changes to the others
+        self._snapshot_tracked(fields)
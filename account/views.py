@@ -1,174 +1,296 @@
-from rest_framework import viewsets, status
-from rest_framework.response import Response
-from rest_framework.decorators import action
-from django.shortcuts import get_object_or_404
-from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.contrib.auth.hashers import make_password
-from .models import Application, User
-from .serializers import ApplicationSerializer, UserLoginSerializer, UserSerializer
-from .permissions import IsSuperAdmin, IsSchoolAdmin
-
-class AuthViewSet(viewsets.ViewSet):
-    
-    permission_classes = [AllowAny] 
-    
-    @action(detail=False, methods=['post'])
-    def register(self, request):
-        
-        serializer = ApplicationSerializer(data=request.data)
-        if serializer.is_valid():
-            application = serializer.save()
-            return Response({
-                "message": "Application submitted successfully. Waiting for admin verification.",
-                "application_id": application.id,
-                "status": "pending"
-            }, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    @action(detail=False, methods=['post'])
-    def login(self, request):
-        
-        serializer = UserLoginSerializer(data=request.data)
-        if serializer.is_valid():
-            user = serializer.validated_data
-            
-            # Get or create authentication token
-            token, created = Token.objects.get_or_create(user=user)
-            
-            return Response({
-                'token': token.key,
-                'user': UserSerializer(user).data,
-                'message': 'Login successful'
-            })
-        return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
-    
-    @action(detail=False, methods=['post'])
-    def logout(self, request):
-        
-        Token.objects.filter(user=request.user).delete()
-        return Response({"message": "Logout successful"})
-    
-    @action(detail=False, methods=['get'])
-    def me(self, request):
-        
-        return Response(UserSerializer(request.user).data)
-
-class AdminViewSet(viewsets.ViewSet):
-    
-    permission_classes = [IsAuthenticated, IsSuperAdmin]
-    
-    @action(detail=False, methods=['get'])
-    def applications(self, request):
-        
-        status_filter = request.GET.get('status')
-        applications = Application.objects.all()
-        
-        if status_filter:
-            applications = applications.filter(status=status_filter)
-        
-        serializer = ApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=True, methods=['post'])
-    def verify(self, request, pk=None):
-        
-        application = get_object_or_404(Application, pk=pk)
-        
-        if application.status == 'verified':
-            return Response({"message": "Application already verified"}, 
-                          status=status.HTTP_400_BAD_REQUEST)
-        
-        application.status = 'verified'
-        application.save()
-        
-        return Response({"message": "Application verified successfully"})
-    
-    @action(detail=True, methods=['post'])
-    def reject(self, request, pk=None):
-        
-        application = get_object_or_404(Application, pk=pk)
-        
-        if application.status == 'rejected':
-            return Response({"message": "Application already rejected"}, 
-                          status=status.HTTP_400_BAD_REQUEST)
-        
-        application.status = 'rejected'
-        application.save()
-        
-        return Response({"message": "Application rejected"})
-    
-    @action(detail=False, methods=['get'])
-    def users(self, request):
-       
-        role_filter = request.GET.get('role')
-        users = User.objects.all()
-        
-        if role_filter:
-            users = users.filter(role=role_filter)
-        
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
-    
-
-class ApplicationViewSet(viewsets.ModelViewSet):
-    queryset = Application.objects.all().order_by("-applied_on")
-    serializer_class = ApplicationSerializer
-    permission_classes = [IsAuthenticated]  # base gate; per-action overrides below
-
-    # ---------------------------
-    # SCHOOL ADMIN: list pending
-    # ---------------------------
-    @action(detail=False, methods=["get"], url_path="pending", permission_classes=[IsAuthenticated, IsSchoolAdmin])
-    def list_pending(self, request):
-        qs = self.get_queryset().filter(status="pending")
-        page = self.paginate_queryset(qs)
-        if page is not None:
-            ser = self.get_serializer(page, many=True)
-            return self.get_paginated_response(ser.data)
-        ser = self.get_serializer(qs, many=True)
-        return Response(ser.data)
-
-    # ---------------------------------
-    # SCHOOL ADMIN: verify (pending -> school_verified)
-    # ---------------------------------
-    @action(detail=True, methods=["patch"], url_path="school-verify", permission_classes=[IsAuthenticated, IsSchoolAdmin])
-    def school_verify(self, request, pk=None):
-        app = self.get_object()
-        if app.status != "pending":
-            return Response(
-                {"detail": "Only 'pending' applications can be school-verified."},
-                status=drf_status.HTTP_400_BAD_REQUEST,
-            )
-        app.status = "school_verified"
-        app.save()
-        return Response(self.get_serializer(app).data, status=drf_status.HTTP_200_OK)
-
-    # ------------------------------
-    # SUPER ADMIN: list school_verified
-    # ------------------------------
-    @action(detail=False, methods=["get"], url_path="awaiting-super", permission_classes=[IsAuthenticated, IsSuperAdmin])
-    def list_school_verified(self, request):
-        qs = self.get_queryset().filter(status="school_verified")
-        page = self.paginate_queryset(qs)
-        if page is not None:
-            ser = self.get_serializer(page, many=True)
-            return self.get_paginated_response(ser.data)
-        ser = self.get_serializer(qs, many=True)
-        return Response(ser.data)
-
-    # ---------------------------------------
-    # SUPER ADMIN: verify (school_verified -> super_verified)
-    # (This will trigger the signal to create User + Student/Teacher)
-    # ---------------------------------------
-    @action(detail=True, methods=["patch"], url_path="super-verify", permission_classes=[IsAuthenticated, IsSuperAdmin])
-    def super_verify(self, request, pk=None):
-        app = self.get_object()
-        if app.status != "school_verified":
-            return Response(
-                {"detail": "Application must be 'school_verified' before super verification."},
-                status=drf_status.HTTP_400_BAD_REQUEST,
-            )
-        app.status = "super_verified"
-        app.save()  # signals fire here
-        return Response(self.get_serializer(app).data, status=drf_status.HTTP_200_OK)
+from rest_framework import viewsets, status
+from rest_framework import status as drf_status
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated
+from rest_framework.reverse import reverse
+from .models import Application, Job, User
+from .serializers import ApplicationSerializer, JobSerializer, UserLoginSerializer, UserSerializer
+from .permissions import IsSuperAdmin, IsSchoolAdmin
+from .pagination import ApplicationCursorPagination, ApplicationQueueCursorPagination, UserCursorPagination
+from .provisioning import provision_applications
+from .exports import EXPORT_FORMATS, application_rows, enrollment_rows, stream_rows
+from teacher import response_cache
+
+class AuthViewSet(viewsets.ViewSet):
+    
+    permission_classes = [AllowAny] 
+    
+    @action(detail=False, methods=['post'])
+    def register(self, request):
+        
+        serializer = ApplicationSerializer(data=request.data)
+        if serializer.is_valid():
+            # the serializer hashes the password, so approving never has to
+            application = serializer.save()
+            return Response({
+                "message": "Application submitted successfully. Waiting for admin verification.",
+                "application_id": application.id,
+                "status": "pending"
+            }, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['post'])
+    def login(self, request):
+        
+        serializer = UserLoginSerializer(data=request.data)
+        if serializer.is_valid():
+            user = serializer.validated_data
+            
+            # Get or create authentication token
+            token, created = Token.objects.get_or_create(user=user)
+            
+            return Response({
+                'token': token.key,
+                'user': UserSerializer(user).data,
+                'message': 'Login successful'
+            })
+        return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
+    
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        
+        Token.objects.filter(user=request.user).delete()
+        return Response({"message": "Logout successful"})
+    
+    @action(detail=False, methods=['get'])
+    def me(self, request):
+        # request.user from the token cache only carries id/role/is_active
+        context = {'request': request}
+        user = UserSerializer.setup_eager_loading(User.objects.filter(pk=request.user.pk), context).get()
+        return Response(UserSerializer(user, context=context).data)
+
+class AdminViewSet(viewsets.ViewSet):
+    
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+    
+    @action(detail=False, methods=['get'])
+    def applications(self, request):
+        
+        status_filter = request.GET.get('status')
+        applications = Application.objects.all()
+        
+        if status_filter:
+            applications = applications.filter(status=status_filter)
+        
+        paginator = ApplicationCursorPagination()
+        reader = ApplicationSerializer.compiled_reader({'request': request})
+        page = paginator.paginate_queryset(reader.values(applications, keep=paginator.ordering), request, view=self)
+        return paginator.get_paginated_response(reader.data(page))
+    
+    @action(detail=True, methods=['post'])
+    def verify(self, request, pk=None):
+        
+        application = get_object_or_404(Application, pk=pk)
+        
+        if application.status == 'verified':
+            return Response({"message": "Application already verified"}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        application.status = 'verified'
+        application.save()
+        
+        return Response({"message": "Application verified successfully"})
+    
+    @action(detail=True, methods=['post'])
+    def reject(self, request, pk=None):
+        
+        application = get_object_or_404(Application, pk=pk)
+        
+        if application.status == 'rejected':
+            return Response({"message": "Application already rejected"}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        application.status = 'rejected'
+        application.save()
+        
+        return Response({"message": "Application rejected"})
+    
+    @action(detail=False, methods=['get'])
+    def users(self, request):
+       
+        role_filter = request.GET.get('role')
+        users = User.objects.all()
+        
+        if role_filter:
+            users = users.filter(role=role_filter)
+        
+        paginator = UserCursorPagination()
+        context = {'request': request}
+        users = UserSerializer.setup_eager_loading(users, context, keep=paginator.ordering)
+        page = paginator.paginate_queryset(users, request, view=self)
+        serializer = UserSerializer(page, many=True, context=context)
+        return paginator.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        # hit/miss counters of the teacher analytics response cache, for the worker answering
+        return Response(response_cache.stats())
+    
+    # ?output=csv|ndjson (`format` is taken by DRF's renderer negotiation)
+    def _export(self, request, name, columns, rows):
+        fmt = request.GET.get('output', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return Response({"error": f"output must be one of {', '.join(EXPORT_FORMATS)}"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(stream_rows(columns, rows, fmt), content_type=EXPORT_FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{name}.{fmt}"'
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='export-applications')
+    def export_applications(self, request):
+        
+        columns, rows = application_rows(
+            status=request.GET.get('status'),
+            role=request.GET.get('role'),
+            standard=request.GET.get('standard'),
+        )
+        return self._export(request, 'applications', columns, rows)
+    
+    @action(detail=False, methods=['get'], url_path='export-enrollments')
+    def export_enrollments(self, request):
+        course_id = request.GET.get('course_id')
+        if course_id:
+            try:
+                course_id = int(course_id)
+            except ValueError:
+                return Response({"error": "course_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns, rows = enrollment_rows(
+            academic_year=request.GET.get('academic_year'),
+            standard=request.GET.get('standard'),
+            course_id=course_id,
+        )
+        return self._export(request, 'enrollments', columns, rows)
+    
+
+class ApplicationViewSet(viewsets.GenericViewSet):
+    # Only the review actions below are routed: no generic list/retrieve/create/
+    # update/destroy, since applications carry applicants' personal data.
+    # Applicants submit through AuthViewSet.register.
+    queryset = Application.objects.all().order_by("-applied_on")
+    serializer_class = ApplicationSerializer
+    pagination_class = ApplicationQueueCursorPagination
+    permission_classes = [IsAuthenticated]  # base gate; per-action overrides below
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.method in SAFE_METHODS:
+            # ?fields= / ?omit= narrow the SELECT as well as the response
+            qs = self.get_serializer_class().setup_eager_loading(
+                qs, self.get_serializer_context(), keep=self.pagination_class.ordering
+            )
+        return qs
+
+    def _list_page(self, qs):
+        # page rows come from values_list(), not model instances (account.compiled)
+        reader = self.get_serializer_class().compiled_reader(self.get_serializer_context())
+        page = self.paginate_queryset(reader.values(qs, keep=self.pagination_class.ordering))
+        return self.get_paginated_response(reader.data(page))
+
+    # ---------------------------
+    # SCHOOL ADMIN: list pending
+    # ---------------------------
+    @action(detail=False, methods=["get"], url_path="pending", permission_classes=[IsAuthenticated, IsSchoolAdmin])
+    def list_pending(self, request):
+        return self._list_page(self.get_queryset().filter(status="pending"))
+
+    # ---------------------------------
+    # SCHOOL ADMIN: verify (pending -> school_verified)
+    # ---------------------------------
+    @action(detail=True, methods=["patch"], url_path="school-verify", permission_classes=[IsAuthenticated, IsSchoolAdmin])
+    def school_verify(self, request, pk=None):
+        app = self.get_object()
+        if not app.transition("pending", "school_verified"):
+            return Response(
+                {"detail": "Only 'pending' applications can be school-verified."},
+                status=drf_status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(self.get_serializer(app).data, status=drf_status.HTTP_200_OK)
+
+    # ------------------------------
+    # SUPER ADMIN: list school_verified
+    # ------------------------------
+    @action(detail=False, methods=["get"], url_path="awaiting-super", permission_classes=[IsAuthenticated, IsSuperAdmin])
+    def list_school_verified(self, request):
+        return self._list_page(self.get_queryset().filter(status="school_verified"))
+
+    # ---------------------------------------
+    # SUPER ADMIN: verify (school_verified -> super_verified)
+    # (The winning transition queues a job that creates User + Student/Teacher;
+    #  poll provisioning_job.url for the outcome)
+    # ---------------------------------------
+    @action(detail=True, methods=["patch"], url_path="super-verify", permission_classes=[IsAuthenticated, IsSuperAdmin])
+    def super_verify(self, request, pk=None):
+        app = self.get_object()
+        if not app.transition("school_verified", "super_verified"):  # signals fire here
+            return Response(
+                {"detail": "Application must be 'school_verified' before super verification."},
+                status=drf_status.HTTP_400_BAD_REQUEST,
+            )
+        data = self.get_serializer(app).data
+        job = app.provisioning_job
+        data["provisioning_job"] = {
+            "id": job.pk,
+            "status": job.status,
+            "url": reverse("jobs-detail", args=[job.pk], request=request),
+        }
+        return Response(data, status=drf_status.HTTP_200_OK)
+
+    # ---------------------------------------
+    # SUPER ADMIN: bulk verify (school_verified -> super_verified)
+    # One transaction, bulk inserts for User + Student/Teacher.
+    # ---------------------------------------
+    @action(detail=False, methods=["post"], url_path="bulk-super-verify", permission_classes=[IsAuthenticated, IsSuperAdmin])
+    def bulk_super_verify(self, request):
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            return Response({"detail": "'ids' must be a non-empty list of application ids."},
+                            status=drf_status.HTTP_400_BAD_REQUEST)
+        # JSON integers only: int() would also take "12", 12.9 and true
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return Response({"detail": "'ids' must contain integers only."},
+                            status=drf_status.HTTP_400_BAD_REQUEST)
+        ids = set(ids)
+
+        with transaction.atomic():
+            apps = list(
+                Application.objects.select_for_update()
+                .filter(pk__in=ids, status="school_verified")
+            )
+            verified = [app.pk for app in apps]
+            # conditional update: skips the per-row signals (provisioning runs in bulk
+            # below) and refuses rows another admin moved since we read them
+            updated = Application.objects.filter(
+                pk__in=verified, status="school_verified"
+            ).update(status="super_verified")
+            if updated != len(verified):
+                transaction.set_rollback(True)
+                return Response({"detail": "Some applications changed during verification; retry."},
+                                status=drf_status.HTTP_409_CONFLICT)
+            result = provision_applications(apps)
+
+        return Response({
+            "verified": sorted(verified),
+            "skipped": sorted(ids - set(verified)),
+            **result,
+        }, status=drf_status.HTTP_200_OK)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Background job status (account.jobs); filter the list with ?status= and ?kind=."""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        for param in ("status", "kind"):
+            value = self.request.query_params.get(param)
+            if value:
+                qs = qs.filter(**{param: value})
+        return qs
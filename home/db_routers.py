@@ -0,0 +1,74 @@
+# home/db_routers.py
+"""
+Read/write connection routing for the production SQLite profile.
+
+With DJANGO_SQLITE_PROFILE=production, settings add a "replica" alias on the
+same database file. Its connections are opened with `PRAGMA query_only`, so
+they can never take the write lock. Under WAL, readers on it never wait for
+writers on "default". Reads go to the replica only inside `read_replica()`,
+which the read-only viewsets (ReadReplicaMixin) and the async endpoints enter
+for the length of a request. Everything else, including any read that follows
+a write in the same request, stays on "default". Writes always go to
+"default", including saves of instances loaded through the replica.
+
+Both aliases open the same file, so the replica has no replication lag: once a
+write commits, the next request that reads from the replica sees it.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_enabled():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def read_replica():
+    """Route reads made in this context (and sync_to_async calls from it) to the replica."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_enabled():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # two names for one database
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA:
+            return False
+        return None
+
+
+class ReadReplicaMixin:
+    """
+    Viewset mixin: GET/HEAD/OPTIONS requests read through the replica. Only for
+    viewsets whose safe-method actions never write, since reads inside
+    them cannot see the request's own uncommitted writes.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_replica():
+            return super().dispatch(request, *args, **kwargs)
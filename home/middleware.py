@@ -0,0 +1,127 @@
+# home/middleware.py
+"""
+Per-request SQL instrumentation.
+
+Every statement run on any database alias while a request is handled is
+counted and timed through a connection execute wrapper. The totals go out as
+`X-DB-Queries` and `Server-Timing` headers, and requests over the configured
+budget are logged with their statements grouped by fingerprint, which makes
+N+1 loops show up as one line with a large count.
+"""
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("home.sql")
+
+SQL_QUERY_BUDGET = getattr(settings, "SQL_QUERY_BUDGET", 30)
+SQL_TIME_BUDGET_MS = getattr(settings, "SQL_TIME_BUDGET_MS", 200)
+SQL_LOG_FINGERPRINTS = getattr(settings, "SQL_LOG_FINGERPRINTS", 10)
+
+_PLACEHOLDER_LIST = re.compile(r"\bIN\s*\(\s*%s(?:\s*,\s*%s)*\s*\)", re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """SQL with literals and IN (...) lists collapsed, so repeats of one query group together."""
+    sql = _PLACEHOLDER_LIST.sub("IN (...)", sql)
+    sql = _LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryCounter:
+    """Execute wrapper that counts and times statements, grouped by fingerprint."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.durations = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            key = fingerprint(sql)
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[key] += 1
+            self.durations[key] += elapsed
+
+    def summary(self, limit=None):
+        lines = []
+        for key, count in self.fingerprints.most_common(limit):
+            lines.append(f"{count:5d}x {self.durations[key] * 1000:8.1f}ms  {key}")
+        return "\n".join(lines)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Adds `X-DB-Queries` and `Server-Timing` (db and total) to every response and
+    logs requests over SQL_QUERY_BUDGET statements or SQL_TIME_BUDGET_MS of DB
+    time to the "home.sql" logger. Streaming responses run their queries after
+    this returns, so only the set-up queries are counted for them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self.instrument(stack, counter)
+            response = self.get_response(request)
+        return self.finish(request, response, counter, start)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        # connections are per thread, and the async ORM runs its queries on the
+        # request's thread-sensitive executor thread, so wrap that thread's
+        # connections (ASGIHandler gives every request its own)
+        with ExitStack() as stack:
+            await sync_to_async(self.instrument)(stack, counter)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        return self.finish(request, response, counter, start)
+
+    @staticmethod
+    def instrument(stack, counter):
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(counter))
+
+    def finish(self, request, response, counter, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = counter.duration * 1000
+
+        response["X-DB-Queries"] = str(counter.count)
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{counter.count} queries", total;dur={total_ms:.1f}'
+        )
+
+        if counter.count > SQL_QUERY_BUDGET or db_ms > SQL_TIME_BUDGET_MS:
+            logger.warning(
+                "%s %s: %d queries, %.1fms in DB, %.1fms total (budget %d queries / %dms)\n%s",
+                request.method, request.get_full_path(), counter.count, db_ms, total_ms,
+                SQL_QUERY_BUDGET, SQL_TIME_BUDGET_MS, counter.summary(SQL_LOG_FINGERPRINTS),
+            )
+        return response
@@ -0,0 +1,138 @@
+import re
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.authtoken.models import Token
+
+from account.models import User
+from account.tests import LOCAL_CACHES, CacheResetMixin, token_client
+from home import db_routers, middleware
+from home.settings import SQLITE_PRAGMAS
+from student.models import Student
+
+
+class FingerprintTests(TestCase):
+
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            middleware.fingerprint("SELECT * FROM t WHERE a = 12 AND b = 'it''s'  AND c in (%s, %s, %s)"),
+            "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...)",
+        )
+        self.assertEqual(middleware.fingerprint('SELECT 1 FROM t WHERE id IN (%s)'),
+                         middleware.fingerprint('SELECT 2 FROM t  WHERE id IN (%s, %s)'))
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class QueryInstrumentationMiddlewareTests(CacheResetMixin, TestCase):
+    PROFILE = '/api/student/profile/'
+    SERVER_TIMING = re.compile(r'^db;dur=\d+\.\d;desc="(\d+) queries", total;dur=\d+\.\d$')
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='s@example.com', name='Student', role='student')
+        Student.objects.create(user=self.user, student_id='S1', standard='5')
+        self.client = token_client(self.user)
+
+    def test_headers_count_the_request_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.PROFILE)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-DB-Queries'], str(len(queries)))
+        match = self.SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        self.assertEqual(match.group(1), str(len(queries)))
+
+    def test_errors_are_instrumented_too(self):
+        response = self.client.get('/api/teacher/profile/')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('X-DB-Queries', response)
+
+    def test_over_budget_is_logged_by_fingerprint(self):
+        with mock.patch.object(middleware, 'SQL_QUERY_BUDGET', 0), self.assertLogs('home.sql', 'WARNING') as logs:
+            self.client.get(self.PROFILE)
+        [message] = logs.output
+        self.assertIn(f'GET {self.PROFILE}', message)
+        self.assertRegex(message, r'\n\s+\d+x\s+\d+\.\dms  SELECT ')
+
+    def test_within_budget_is_not_logged(self):
+        with self.assertNoLogs('home.sql', 'WARNING'):
+            self.client.get(self.PROFILE)
+
+    async def test_async_endpoints(self):
+        key = (await Token.objects.aget(user=self.user)).key
+        response = await self.async_client.get('/api/async/student/profile/', headers={'Authorization': f'Token {key}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-DB-Queries']), 0)
+        self.assertRegex(response['Server-Timing'], self.SERVER_TIMING)
+
+
+class ReadReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = db_routers.ReadReplicaRouter()
+
+    def test_reads_use_the_replica_only_inside_read_replica(self):
+        with mock.patch.object(db_routers, 'replica_enabled', return_value=True):
+            self.assertIsNone(self.router.db_for_read(User))
+            with db_routers.read_replica():
+                self.assertEqual(self.router.db_for_read(User), 'replica')
+                self.assertEqual(self.router.db_for_write(User), 'default')
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_no_replica_configured(self):
+        with mock.patch.object(db_routers, 'replica_enabled', return_value=False), db_routers.read_replica():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_never_migrates_the_replica(self):
+        self.assertIs(self.router.allow_migrate('replica', 'account'), False)
+        self.assertIsNone(self.router.allow_migrate('default', 'account'))
+
+    def test_mixin_routes_safe_methods_only(self):
+        class View:
+            def dispatch(self, request, *args, **kwargs):
+                return db_routers._use_replica.get()
+
+        class ReplicaView(db_routers.ReadReplicaMixin, View):
+            pass
+
+        for method, expected in [('GET', True), ('HEAD', True), ('POST', False), ('PATCH', False)]:
+            with self.subTest(method=method):
+                self.assertIs(ReplicaView().dispatch(mock.Mock(method=method)), expected)
+        self.assertIs(db_routers._use_replica.get(), False)
+
+
+class ProductionSQLiteTests(SimpleTestCase):
+    """The aliases settings builds for DJANGO_SQLITE_PROFILE=production."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        init_command = ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items())
+        name = Path(directory.name) / 'db.sqlite3'
+        self.connections = ConnectionHandler({
+            # 'default' is required but never opened; SimpleTestCase only blocks the project's aliases
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'},
+            'writer': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name,
+                       'OPTIONS': {'init_command': init_command, 'transaction_mode': 'IMMEDIATE'}},
+            'reader': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name,
+                       'OPTIONS': {'init_command': init_command + ';PRAGMA query_only=ON'}},
+        })
+        self.addCleanup(self.connections.close_all)
+
+    def test_replica_reads_but_never_writes(self):
+        with self.connections['writer'].cursor() as cursor:
+            cursor.execute('CREATE TABLE t (n integer)')
+            cursor.execute('INSERT INTO t VALUES (1)')
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone(), ('wal',))
+        with self.connections['reader'].cursor() as cursor:
+            cursor.execute('SELECT n FROM t')
+            self.assertEqual(cursor.fetchall(), [(1,)])
+            with self.assertRaises(OperationalError):
+                cursor.execute('INSERT INTO t VALUES (2)')
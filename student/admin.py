@@ -1,7 +1,8 @@
-from django.contrib import admin
-from .models import *
-
-# Register your models here.
-
-admin.site.register(Student)
-admin.site.register(Enrollment)
+from django.contrib import admin
+from .models import *
+
+# Register your models here.
+
+admin.site.register(Student)
+admin.site.register(Enrollment)
+admin.site.register(YearRollover)
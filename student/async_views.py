@@ -0,0 +1,57 @@
+# student/async_views.py
+"""Async counterparts of the student read endpoints (see account.async_api)."""
+from asgiref.sync import sync_to_async
+
+from account.async_api import async_endpoint, render
+from account.conditional import aconditional_get
+from account.school_year import current_academic_year
+from account.serializers import EnrollmentSerializer, StudentSerializer
+from teacher.assignments import teaches
+from .models import Enrollment, Student
+
+
+@async_endpoint('student')
+@aconditional_get
+async def profile(request):
+    context = {'request': request}
+    student = await StudentSerializer.setup_eager_loading(
+        Student.objects.filter(user_id=request.user.pk), context
+    ).afirst()
+    if student is None:
+        return render({"error": "Student profile not found"}, 404)
+    return render(StudentSerializer(student, context=context).data)
+
+
+@async_endpoint('student')
+@aconditional_get
+async def my_performance(request):
+    # the token identity already knows whether a Student profile exists
+    student = getattr(request.user, 'student', None)
+    if student is None:
+        return render({"error": "Student profile not found"}, 404)
+    reader = EnrollmentSerializer.compiled_reader({'request': request})
+    rows = [row async for row in reader.values(Enrollment.objects.filter(student_id=student.pk))]
+    return render(reader.data(rows))
+
+
+@async_endpoint('teacher')
+async def class_results(request):
+    standard = request.GET.get('standard')
+    course_id = request.GET.get('course_id')
+    academic_year = request.GET.get('academic_year') or await sync_to_async(current_academic_year)()
+
+    if not standard or not course_id:
+        return render({"error": "standard and course_id parameters are required"}, 400)
+
+    # a cache miss reads CourseTeaching
+    if not await sync_to_async(teaches)(request.user.teacher.pk, course_id, standard, academic_year):
+        return render({"error": "Not authorized to access these results. You don't teach this course to this class."}, 403)
+
+    reader = EnrollmentSerializer.compiled_reader({'request': request})
+    enrollments = reader.values(Enrollment.objects.filter(
+        standard=standard,
+        course_id=course_id,
+        academic_year=academic_year
+    ))
+    rows = [row async for row in enrollments]
+    return render(reader.data(rows))
@@ -0,0 +1,61 @@
+# student/enrollment.py
+"""
+Bulk class enrollment: every Student of a standard into one or more courses
+for an academic year, with one INSERT per batch instead of a validated create
+per row. Shared by the enroll-standard endpoint and the enroll_standard
+command.
+"""
+from django.db import transaction
+
+from account.conditional import bump_user_versions
+from teacher import response_cache
+from .models import Enrollment, Student
+from .statistics import refresh_course_statistics
+
+
+def enroll_standard(standard, course_ids, academic_year, batch_size=500):
+    """
+    Create the missing (student, course, academic_year) rows for every student
+    now in `standard` who has not left school. Existing rows are left alone.
+
+    Returns {"students", "courses", "created", "skipped"}. created + skipped is
+    students * courses; see the note on concurrent writers below.
+    """
+    course_ids = sorted(set(course_ids))
+    in_class = Enrollment.objects.filter(
+        student__standard=standard, course_id__in=course_ids, academic_year=academic_year
+    )
+
+    with transaction.atomic():
+        student_ids = list(
+            Student.objects.filter(standard=standard, left_in__isnull=True).values_list("pk", flat=True)
+        )
+        existing = set(in_class.values_list("student_id", "course_id"))
+        new = [
+            Enrollment(student_id=student_id, course_id=course_id, academic_year=academic_year,
+                       standard=standard)
+            for course_id in course_ids
+            for student_id in student_ids
+            if (student_id, course_id) not in existing
+        ]
+        # ignore_conflicts: a row inserted concurrently since the read is skipped,
+        # not an IntegrityError. bulk_create cannot say which rows it inserted, so
+        # `created` also counts rows another writer committed for this class in
+        # the meantime (none on SQLite, whose writers are serialized).
+        Enrollment.objects.bulk_create(new, batch_size=batch_size, ignore_conflicts=True)
+        created = in_class.count() - len(existing)
+
+        if created:
+            # bulk_create sends no signals
+            keys = [(course_id, standard, academic_year) for course_id in course_ids]
+            refresh_course_statistics(keys)
+            bump_user_versions(*{enrollment.student_id for enrollment in new})
+            response_cache.invalidate_classes(keys)
+
+    total = len(student_ids) * len(course_ids)
+    return {
+        "students": len(student_ids),
+        "courses": len(course_ids),
+        "created": created,
+        "skipped": total - created,
+    }
@@ -0,0 +1,79 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from account.models import User
+from student.models import Enrollment
+from student.views import EnrollmentViewSet
+
+COLUMNS = EnrollmentViewSet.LIST_COLUMNS
+
+
+def model_pages(page_size):
+    """The previous list(): full model instances, attributes copied into dicts."""
+    last = 0
+    while True:
+        page = list(Enrollment.objects.filter(id__gt=last).order_by('id')[:page_size])
+        if not page:
+            return
+        yield [{key: getattr(e, column) for key, column in COLUMNS.items()} for e in page]
+        last = page[-1].id
+
+
+def values_pages(page_size):
+    """The current list(): only the listed columns, straight from values()."""
+    last = 0
+    qs = Enrollment.objects.values(*COLUMNS.values())
+    while True:
+        page = list(qs.filter(id__gt=last).order_by('id')[:page_size])
+        if not page:
+            return
+        yield [{key: row[column] for key, column in COLUMNS.items()} for row in page]
+        last = page[-1]['id']
+
+
+def endpoint_pages(client, page_size):
+    """GET /api/enrollments/ following the cursor `next` links to the end."""
+    url, params = reverse('enrollments-list'), {'page_size': page_size}
+    while url:
+        body = client.get(url, params).json()
+        yield body['results']
+        url, params = body['next'], None
+
+
+class Command(BaseCommand):
+    help = ("Measure rows/second of a full walk over the enrollment list: model instances vs "
+            "values() vs the endpoint. Seed 100k+ rows first, e.g. "
+            "`seed_school --students-per-standard 1000 --courses 10 --years 1`.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=500)
+        parser.add_argument('--min-rows', type=int, default=100000,
+                            help="Refuse to run on fewer enrollments than this.")
+
+    def handle(self, *args, **options):
+        total = Enrollment.objects.count()
+        if total < options['min_rows']:
+            raise CommandError(f"Only {total} enrollments; seed more or lower --min-rows.")
+
+        teacher = User.objects.filter(role='teacher', is_active=True).order_by('id').first()
+        if teacher is None:
+            raise CommandError("Needs a teacher account to call the endpoint.")
+        client = APIClient(HTTP_HOST='localhost')
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get_or_create(user=teacher)[0].key)
+
+        page_size = options['page_size']
+        self.stdout.write(f"{total} enrollments, page size {page_size}")
+        runs = [
+            ('model instances', lambda: model_pages(page_size)),
+            ('values()', lambda: values_pages(page_size)),
+            ('endpoint', lambda: endpoint_pages(client, page_size)),
+        ]
+        for name, pages in runs:
+            start = time.perf_counter()
+            rows = sum(len(page) for page in pages())
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{name:16} {rows:8d} rows {elapsed:8.2f}s {rows / elapsed:12.0f} rows/s")
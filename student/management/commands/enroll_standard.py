@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from account.school_year import current_academic_year, is_academic_year
+from student.enrollment import enroll_standard
+from student.models import Student
+from teacher.models import Course
+
+
+class Command(BaseCommand):
+    help = ("Enroll every student of a standard into one or more courses for an academic year. "
+            "Students already enrolled in a course that year are skipped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('standard', choices=[value for value, _ in Student.STANDARD_CHOICES])
+        parser.add_argument('--course', action='append', required=True, dest='courses',
+                            help="Course code or id (repeatable).")
+        parser.add_argument('--academic-year', help="Defaults to the current academic year.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        course_ids = set()
+        for value in options['courses']:
+            lookup = {'pk': int(value)} if value.isdigit() else {'course_code': value}
+            pk = Course.objects.filter(**lookup).values_list('pk', flat=True).first()
+            if pk is None:
+                raise CommandError(f"No course {value!r}.")
+            course_ids.add(pk)
+
+        academic_year = options['academic_year'] or current_academic_year()
+        if not is_academic_year(academic_year):
+            raise CommandError(f"{academic_year!r} is not an academic year like '2024-2025'.")
+        result = enroll_standard(options['standard'], course_ids, academic_year,
+                                 batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Class {options['standard']}, {academic_year}: {result['students']} students x "
+            f"{result['courses']} courses, {result['created']} enrollments created, {result['skipped']} skipped."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from student.statistics import rebuild_course_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the CourseStatistics summary table from Enrollment."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--academic-year', help="Only rebuild rows for this year, e.g. 2024-2025.")
+
+    def handle(self, *args, **options):
+        count = rebuild_course_statistics(academic_year=options['academic_year'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} course statistics rows."))
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from account.caching import is_process_local
+from account.school_year import current_academic_year, is_academic_year, next_academic_year
+from student import rollover as engine
+from student.models import Enrollment, Student, YearRollover
+from teacher import response_cache
+from teacher.models import CourseTeaching
+
+
+class Command(BaseCommand):
+    help = ("Roll the school over into the next academic year: copy teaching assignments and "
+            "continuing students' enrollments into the new year, promote every student one "
+            "standard (Class 10 leaves), then make the new year current. Works in committed "
+            "chunks; if interrupted, run it again with the same years to resume.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from-year', help="Defaults to the current academic year.")
+        parser.add_argument('--to-year', help="Defaults to the year after --from-year.")
+        parser.add_argument('--leavers', choices=[value for value, _ in YearRollover.LEAVER_CHOICES],
+                            help="What happens to Class 10 accounts (default: deactivate).")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would change.")
+
+    def handle(self, *args, **options):
+        from_year = options['from_year'] or current_academic_year()
+        to_year = options['to_year'] or next_academic_year(from_year)
+        for year in (from_year, to_year):
+            if not is_academic_year(year):
+                raise CommandError(f"{year!r} is not an academic year like '2024-2025'.")
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        existing = YearRollover.objects.filter(to_year=to_year).first()
+        if existing is not None:
+            if existing.step == 'done':
+                raise CommandError(f"The rollover into {to_year} finished at {existing.finished_at}.")
+            if existing.from_year != from_year:
+                raise CommandError(f"An unfinished rollover from {existing.from_year} into {to_year} exists.")
+            if options['leavers'] and options['leavers'] != existing.leavers:
+                raise CommandError(f"The unfinished rollover was started with --leavers {existing.leavers}.")
+
+        if options['dry_run']:
+            self.report(from_year, to_year)
+            return
+
+        if is_process_local() or response_cache.is_process_local():
+            # the rollover drops cached tokens, assignments, responses and the current
+            # year; with LocMemCache that only clears this command's own copy
+            raise CommandError("CACHES is process-local (LocMemCache), so the running workers would keep "
+                               "serving the old year. Configure a shared cache backend first.")
+
+        rollover = engine.start(from_year, to_year, options['leavers'] or 'deactivate')
+        if existing is not None:
+            self.stdout.write(f"Resuming {rollover} after pk {rollover.last_pk}.")
+
+        def progress(rollover, processed):
+            if processed and options['verbosity'] > 1:
+                self.stdout.write(f"{rollover.step}: up to pk {rollover.last_pk}")
+            elif not processed and options['verbosity']:
+                self.stdout.write(f"-> {rollover.step}")
+
+        engine.run(rollover, options['chunk_size'], progress)
+        counts = ', '.join(f"{name}={value}" for name, value in sorted(rollover.counts.items()))
+        self.stdout.write(self.style.SUCCESS(f"Rolled over {from_year} -> {to_year}: {counts}."))
+
+    def report(self, from_year, to_year):
+        on_roll = Student.objects.filter(left_in__isnull=True)
+        by_standard = dict(on_roll.values_list('standard').annotate(n=Count('pk')))
+        leaving = by_standard.get(engine.LEAVING_STANDARD, 0)
+        teachings = CourseTeaching.objects.filter(academic_year=from_year).count()
+        enrollments = (
+            Enrollment.objects.filter(academic_year=from_year)
+            .exclude(student__standard=engine.LEAVING_STANDARD).filter(student__left_in__isnull=True).count()
+        )
+        self.stdout.write(
+            f"{from_year} -> {to_year}: {sum(by_standard.values()) - leaving} students promoted, "
+            f"{leaving} leaving, {teachings} teaching assignments and {enrollments} enrollments "
+            f"to copy (existing copies are skipped)."
+        )
@@ -1,55 +1,55 @@
-# Generated by Django 5.2.5 on 2025-08-30 10:31
-
-import django.db.models.deletion
-from django.conf import settings
-from django.db import migrations, models
-
-
-class Migration(migrations.Migration):
-
-    initial = True
-
-    dependencies = [
-        ('account', '0002_application'),
-        ('teacher', '0001_initial'),
-    ]
-
-    operations = [
-        migrations.CreateModel(
-            name='Enrollment',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('enrollment_date', models.DateField(auto_now_add=True)),
-                ('academic_year', models.CharField(default='2024-2025', max_length=9)),
-                ('grade', models.CharField(blank=True, choices=[('A1', 'A1 (91-100)'), ('A2', 'A2 (81-90)'), ('B1', 'B1 (71-80)'), ('B2', 'B2 (61-70)'), ('C1', 'C1 (51-60)'), ('C2', 'C2 (41-50)'), ('D', 'D (33-40)'), ('E', 'E (21-32)'), ('F', 'F (Below 21)')], max_length=2, null=True)),
-                ('marks_obtained', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
-                ('total_marks', models.DecimalField(decimal_places=2, default=100.0, max_digits=5)),
-                ('attendance_percentage', models.DecimalField(decimal_places=2, default=100.0, max_digits=5)),
-                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='teacher.course')),
-            ],
-        ),
-        migrations.CreateModel(
-            name='Student',
-            fields=[
-                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
-                ('student_id', models.CharField(max_length=20, unique=True)),
-                ('date_of_birth', models.DateField(blank=True, null=True)),
-                ('address', models.TextField(blank=True, null=True)),
-                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
-                ('guardian_name', models.CharField(blank=True, max_length=100, null=True)),
-                ('guardian_phone', models.CharField(blank=True, max_length=15, null=True)),
-                ('enrollment_date', models.DateField(auto_now_add=True)),
-                ('standard', models.CharField(choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], max_length=2)),
-                ('courses', models.ManyToManyField(related_name='students_enrolled', through='student.Enrollment', to='teacher.course')),
-            ],
-        ),
-        migrations.AddField(
-            model_name='enrollment',
-            name='student',
-            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='student.student'),
-        ),
-        migrations.AlterUniqueTogether(
-            name='enrollment',
-            unique_together={('student', 'course', 'academic_year')},
-        ),
-    ]
+# Generated by Django 5.2.5 on 2025-08-30 10:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('account', '0002_application'),
+        ('teacher', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Enrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enrollment_date', models.DateField(auto_now_add=True)),
+                ('academic_year', models.CharField(default='2024-2025', max_length=9)),
+                ('grade', models.CharField(blank=True, choices=[('A1', 'A1 (91-100)'), ('A2', 'A2 (81-90)'), ('B1', 'B1 (71-80)'), ('B2', 'B2 (61-70)'), ('C1', 'C1 (51-60)'), ('C2', 'C2 (41-50)'), ('D', 'D (33-40)'), ('E', 'E (21-32)'), ('F', 'F (Below 21)')], max_length=2, null=True)),
+                ('marks_obtained', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('total_marks', models.DecimalField(decimal_places=2, default=100.0, max_digits=5)),
+                ('attendance_percentage', models.DecimalField(decimal_places=2, default=100.0, max_digits=5)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='teacher.course')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Student',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('student_id', models.CharField(max_length=20, unique=True)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('address', models.TextField(blank=True, null=True)),
+                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
+                ('guardian_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('guardian_phone', models.CharField(blank=True, max_length=15, null=True)),
+                ('enrollment_date', models.DateField(auto_now_add=True)),
+                ('standard', models.CharField(choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], max_length=2)),
+                ('courses', models.ManyToManyField(related_name='students_enrolled', through='student.Enrollment', to='teacher.course')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='student.student'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='enrollment',
+            unique_together={('student', 'course', 'academic_year')},
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, Max, Min, Q, Sum
+
+
+def populate_statistics(apps, schema_editor):
+    Enrollment = apps.get_model('student', 'Enrollment')
+    CourseStatistics = apps.get_model('student', 'CourseStatistics')
+    rows = (
+        Enrollment.objects
+        .values('course_id', 'academic_year', standard=F('student__standard'))
+        .annotate(
+            total_students=Count('id'),
+            graded_count=Count('marks_obtained'),
+            marks_sum=Sum('marks_obtained'),
+            marks_sum_squares=Sum(F('marks_obtained') * F('marks_obtained'),
+                                  output_field=DecimalField(max_digits=16, decimal_places=4)),
+            lowest_marks=Min('marks_obtained'),
+            highest_marks=Max('marks_obtained'),
+            pass_count=Count('id', filter=Q(marks_obtained__gte=33)),
+            fail_count=Count('id', filter=Q(marks_obtained__lt=33)),
+        )
+        .order_by()
+    )
+    CourseStatistics.objects.bulk_create(
+        [CourseStatistics(**dict(row, marks_sum=row['marks_sum'] or 0,
+                                 marks_sum_squares=row['marks_sum_squares'] or 0)) for row in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0001_initial'),
+        ('teacher', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('standard', models.CharField(choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], max_length=2)),
+                ('academic_year', models.CharField(max_length=9)),
+                ('total_students', models.PositiveIntegerField(default=0)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('marks_sum', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('marks_sum_squares', models.DecimalField(decimal_places=4, default=0, max_digits=16)),
+                ('lowest_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('highest_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('pass_count', models.PositiveIntegerField(default=0)),
+                ('fail_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='teacher.course')),
+            ],
+            options={
+                'unique_together': {('course', 'standard', 'academic_year')},
+            },
+        ),
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
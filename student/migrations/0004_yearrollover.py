@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:40
+
+import account.school_year
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0003_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YearRollover',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_year', models.CharField(max_length=9)),
+                ('to_year', models.CharField(max_length=9, unique=True)),
+                ('leavers', models.CharField(choices=[('deactivate', 'Deactivate accounts'), ('keep', 'Keep accounts active')], default='deactivate', max_length=10)),
+                ('step', models.CharField(default='teachings', max_length=12)),
+                ('last_pk', models.BigIntegerField(default=0)),
+                ('max_teaching_pk', models.BigIntegerField()),
+                ('max_enrollment_pk', models.BigIntegerField()),
+                ('max_student_pk', models.BigIntegerField()),
+                ('counts', models.JSONField(default=dict)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='academic_year',
+            field=models.CharField(default=account.school_year.current_academic_year, max_length=9),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0004_yearrollover'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='left_in',
+            field=models.CharField(blank=True, max_length=9, null=True),
+        ),
+    ]
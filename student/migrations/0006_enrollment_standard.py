@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_student_standard(apps, schema_editor):
+    # existing rows were all grouped by the student's current class; keep that
+    Enrollment = apps.get_model('student', 'Enrollment')
+    Student = apps.get_model('student', 'Student')
+    Enrollment.objects.update(
+        standard=Subquery(Student.objects.filter(pk=OuterRef('student_id')).values('standard')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0005_student_left_in'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='standard',
+            field=models.CharField(choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], default='', editable=False, max_length=2),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_student_standard, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollment_course_year_idx',
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', 'academic_year', 'standard'], name='enrollment_class_idx'),
+        ),
+    ]
@@ -1,70 +1,188 @@
-from django.db import models
-from account.models import User
-from teacher.models import Course
-
-class Student(models.Model):
-    STANDARD_CHOICES = [
-        ('1', 'Class 1'),
-        ('2', 'Class 2'),
-        ('3', 'Class 3'),
-        ('4', 'Class 4'),
-        ('5', 'Class 5'),
-        ('6', 'Class 6'),
-        ('7', 'Class 7'),
-        ('8', 'Class 8'),
-        ('9', 'Class 9'),
-        ('10', 'Class 10'),
-    ]
-    
-    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
-    student_id = models.CharField(max_length=20, unique=True)
-    date_of_birth = models.DateField(null=True, blank=True)
-    address = models.TextField(null=True, blank=True)
-    phone_number = models.CharField(max_length=15, null=True, blank=True)
-    guardian_name = models.CharField(max_length=100, null=True, blank=True)
-    guardian_phone = models.CharField(max_length=15, null=True, blank=True)
-    enrollment_date = models.DateField(auto_now_add=True)
-    standard = models.CharField(max_length=2, choices=STANDARD_CHOICES)  
-    
-    courses = models.ManyToManyField(Course, through='Enrollment', related_name='students_enrolled')
-        
-    def __str__(self):
-        return f"{self.user.name} ({self.student_id}) - Class {self.standard}"
-
-class Enrollment(models.Model):
-   
-    GRADE_CHOICES = [
-        ('A1', 'A1 (91-100)'),
-        ('A2', 'A2 (81-90)'),
-        ('B1', 'B1 (71-80)'),
-        ('B2', 'B2 (61-70)'),
-        ('C1', 'C1 (51-60)'),
-        ('C2', 'C2 (41-50)'),
-        ('D', 'D (33-40)'),
-        ('E', 'E (21-32)'),
-        ('F', 'F (Below 21)'),
-    ]
-    
-    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
-    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
-    enrollment_date = models.DateField(auto_now_add=True)
-    academic_year = models.CharField(max_length=9, default='2024-2025')
-    grade = models.CharField(max_length=2, choices=GRADE_CHOICES, blank=True, null=True)
-    marks_obtained = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
-    total_marks = models.DecimalField(max_digits=5, decimal_places=2, default=100.00)
-    attendance_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=100.00)
-    
-    class Meta:
-        unique_together = ('student', 'course', 'academic_year')
-    
-    def __str__(self):
-        return f"{self.student.user.name} - {self.course.course_name} ({self.academic_year})"
-    
-    
-    
-    
-    
-class Fee(models.Model):
-    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='fees')
-    #fee
+from django.db import models
+from account.models import User
+from account.school_year import current_academic_year
+from account.tracking import FieldTrackerMixin
+from teacher.models import Course
+
+class Student(FieldTrackerMixin, models.Model):
+    STANDARD_CHOICES = [
+        ('1', 'Class 1'),
+        ('2', 'Class 2'),
+        ('3', 'Class 3'),
+        ('4', 'Class 4'),
+        ('5', 'Class 5'),
+        ('6', 'Class 6'),
+        ('7', 'Class 7'),
+        ('8', 'Class 8'),
+        ('9', 'Class 9'),
+        ('10', 'Class 10'),
+    ]
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    student_id = models.CharField(max_length=20, unique=True)
+    date_of_birth = models.DateField(null=True, blank=True)
+    address = models.TextField(null=True, blank=True)
+    phone_number = models.CharField(max_length=15, null=True, blank=True)
+    guardian_name = models.CharField(max_length=100, null=True, blank=True)
+    guardian_phone = models.CharField(max_length=15, null=True, blank=True)
+    enrollment_date = models.DateField(auto_now_add=True)
+    standard = models.CharField(max_length=2, choices=STANDARD_CHOICES)  
+    # academic year the student left school (Class 10 leavers, set by rollover_year);
+    # null while they are on roll
+    left_in = models.CharField(max_length=9, null=True, blank=True)
+    
+    courses = models.ManyToManyField(Course, through='Enrollment', related_name='students_enrolled')
+
+    tracked_fields = ('standard',)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['standard'], name='student_standard_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.user.name} ({self.student_id}) - Class {self.standard}"
+
+class Enrollment(FieldTrackerMixin, models.Model):
+   
+    GRADE_CHOICES = [
+        ('A1', 'A1 (91-100)'),
+        ('A2', 'A2 (81-90)'),
+        ('B1', 'B1 (71-80)'),
+        ('B2', 'B2 (61-70)'),
+        ('C1', 'C1 (51-60)'),
+        ('C2', 'C2 (41-50)'),
+        ('D', 'D (33-40)'),
+        ('E', 'E (21-32)'),
+        ('F', 'F (Below 21)'),
+    ]
+    # lower bound (percentage) of each band in GRADE_CHOICES, best first
+    GRADE_BANDS = [
+        (91, 'A1'),
+        (81, 'A2'),
+        (71, 'B1'),
+        (61, 'B2'),
+        (51, 'C1'),
+        (41, 'C2'),
+        (33, 'D'),
+        (21, 'E'),
+        (0, 'F'),
+    ]
+    
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
+    enrollment_date = models.DateField(auto_now_add=True)
+    academic_year = models.CharField(max_length=9, default=current_academic_year)
+    grade = models.CharField(max_length=2, choices=GRADE_CHOICES, blank=True, null=True)
+    marks_obtained = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    total_marks = models.DecimalField(max_digits=5, decimal_places=2, default=100.00)
+    attendance_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=100.00)
+    # the student's class in this academic year; filled from Student.standard on
+    # first save and kept when the student is promoted, so past years keep their classes
+    standard = models.CharField(max_length=2, choices=Student.STANDARD_CHOICES, editable=False)
+    
+    tracked_fields = ('student_id', 'course_id', 'academic_year', 'standard', 'marks_obtained')
+    
+    class Meta:
+        unique_together = ('student', 'course', 'academic_year')
+        indexes = [
+            # class_results / course_performance: one class of a course in a year
+            models.Index(fields=['course', 'academic_year', 'standard'], name='enrollment_class_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.student.user.name} - {self.course.course_name} ({self.academic_year})"
+
+    def save(self, *args, **kwargs):
+        moved = self.is_tracked('student_id') and self.has_changed('student_id')
+        # a deferred standard was stored with the row; don't load it just to check
+        unset = 'standard' not in self.get_deferred_fields() and not self.standard
+        if self.student_id is not None and (moved or unset):
+            self.standard = Student.objects.filter(pk=self.student_id).values_list('standard', flat=True).first()
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def grade_for(cls, marks_obtained, total_marks=100):
+        """Grade from GRADE_BANDS for a score, as a percentage of total_marks."""
+        if marks_obtained is None or not total_marks:
+            return None
+        percentage = marks_obtained * 100 / total_marks
+        for lower, grade in cls.GRADE_BANDS:
+            if percentage >= lower:
+                return grade
+        return cls.GRADE_BANDS[-1][1]
+
+
+class CourseStatistics(models.Model):
+    """
+    Running marks summary per (course, standard, academic_year), kept in step
+    with Enrollment writes by student.signals so course statistics are a
+    single-row read. Rebuild with `manage.py rebuild_course_statistics`.
+    """
+    PASS_MARKS = 33
+
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='statistics')
+    standard = models.CharField(max_length=2, choices=Student.STANDARD_CHOICES)
+    academic_year = models.CharField(max_length=9)
+
+    total_students = models.PositiveIntegerField(default=0)   # every enrollment, graded or not
+    graded_count = models.PositiveIntegerField(default=0)     # enrollments with marks_obtained
+    marks_sum = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    marks_sum_squares = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    lowest_marks = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    highest_marks = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    pass_count = models.PositiveIntegerField(default=0)
+    fail_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('course', 'standard', 'academic_year')
+
+    def __str__(self):
+        return f"{self.course_id} / Class {self.standard} ({self.academic_year})"
+
+    @property
+    def average_marks(self):
+        return self.marks_sum / self.graded_count if self.graded_count else None
+
+    @property
+    def variance(self):
+        if not self.graded_count:
+            return None
+        mean = self.average_marks
+        return self.marks_sum_squares / self.graded_count - mean * mean
+
+
+class YearRollover(models.Model):
+    """
+    Progress of one academic-year rollover (student.rollover). Each chunk
+    commits together with `step` / `last_pk`, so an interrupted run resumes
+    exactly where it stopped and never promotes a student twice.
+    """
+    STEPS = ['teachings', 'enrollments', 'students', 'finish', 'done']
+    LEAVER_CHOICES = [('deactivate', 'Deactivate accounts'), ('keep', 'Keep accounts active')]
+
+    from_year = models.CharField(max_length=9)
+    to_year = models.CharField(max_length=9, unique=True)
+    leavers = models.CharField(max_length=10, choices=LEAVER_CHOICES, default='deactivate')
+    step = models.CharField(max_length=12, default='teachings')
+    last_pk = models.BigIntegerField(default=0)
+    # rows created after the rollover started are not part of it
+    max_teaching_pk = models.BigIntegerField()
+    max_enrollment_pk = models.BigIntegerField()
+    max_student_pk = models.BigIntegerField()
+    counts = models.JSONField(default=dict)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.from_year} -> {self.to_year} ({self.step})"
+    
+    
+    
+    
+    
+class Fee(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='fees')
+    #fee
     
\ No newline at end of file
@@ -0,0 +1,170 @@
+# student/rollover.py
+"""
+Academic-year rollover: moves the school from one academic year to the next.
+
+Steps, in order, each done in chunks of primary keys:
+- teachings: copy every CourseTeaching of the old year into the new year.
+- enrollments: copy the old year's enrollments of every student who stays on
+  (not in Class 10) into the new year, without marks.
+- students: promote standards 1-9 by one; Class 10 students leave: they are
+  marked with Student.left_in (so later rollovers and class rosters skip them)
+  and their accounts are deactivated unless leavers="keep".
+- finish: make the new year current, rebuild CourseStatistics for the new
+  year, and drop the caches the bulk writes bypassed. The old year's rows
+  stay as they are: Enrollment.standard keeps the class each was taken in.
+
+Copies come before promotion because "stays on" is decided on the old
+standard. Each chunk commits together with the YearRollover checkpoint, so a
+run that dies is resumed by running it again. Rows inserted after the rollover
+started are left out (see the max_*_pk bounds).
+"""
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from account.authentication import invalidate_user
+from account.conditional import bump_global_version
+from account.models import User
+from account.school_year import set_current_academic_year
+from teacher import response_cache
+from teacher.assignments import invalidate_assignments
+from teacher.models import Course, CourseTeaching
+from .models import Enrollment, Student, YearRollover
+from .statistics import rebuild_course_statistics
+
+LEAVING_STANDARD = Student.STANDARD_CHOICES[-1][0]
+
+# '1' -> '2' ... '9' -> '10' as a single UPDATE; LEAVING_STANDARD is left alone
+_PROMOTED = Case(
+    *[When(standard=value, then=Value(str(int(value) + 1))) for value, _ in Student.STANDARD_CHOICES[:-1]],
+    default=F('standard'),
+)
+
+
+def _max_pk(queryset):
+    return queryset.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+def start(from_year, to_year, leavers='deactivate'):
+    """The rollover into `to_year`: the unfinished one if there is one, else a new one."""
+    rollover = YearRollover.objects.filter(to_year=to_year).first()
+    if rollover is not None:
+        if rollover.from_year != from_year:
+            raise ValueError(f"A rollover from {rollover.from_year} into {to_year} already exists.")
+        return rollover
+    return YearRollover.objects.create(
+        from_year=from_year, to_year=to_year, leavers=leavers,
+        max_teaching_pk=_max_pk(CourseTeaching.objects.all()),
+        max_enrollment_pk=_max_pk(Enrollment.objects.all()),
+        max_student_pk=_max_pk(Student.objects.all()),
+    )
+
+
+def _checkpoint(rollover, last_pk, **counts):
+    rollover.last_pk = last_pk
+    for name, value in counts.items():
+        rollover.counts[name] = rollover.counts.get(name, 0) + value
+    rollover.save(update_fields=['last_pk', 'counts'])
+
+
+def _teachings(rollover, chunk_size):
+    rows = list(
+        CourseTeaching.objects.filter(
+            academic_year=rollover.from_year, pk__gt=rollover.last_pk, pk__lte=rollover.max_teaching_pk,
+        ).order_by('pk').values('pk', 'teacher_id', 'course_id', 'standard', 'is_class_teacher')[:chunk_size]
+    )
+    if not rows:
+        return 0
+    existing = set(
+        CourseTeaching.objects.filter(
+            academic_year=rollover.to_year, teacher_id__in={row['teacher_id'] for row in rows},
+        ).values_list('teacher_id', 'course_id', 'standard')
+    )
+    new = [
+        CourseTeaching(teacher_id=row['teacher_id'], course_id=row['course_id'], standard=row['standard'],
+                       academic_year=rollover.to_year, is_class_teacher=row['is_class_teacher'])
+        for row in rows if (row['teacher_id'], row['course_id'], row['standard']) not in existing
+    ]
+    CourseTeaching.objects.bulk_create(new, ignore_conflicts=True)
+    _checkpoint(rollover, rows[-1]['pk'], teachings_created=len(new), teachings_skipped=len(rows) - len(new))
+    return len(rows)
+
+
+def _enrollments(rollover, chunk_size):
+    rows = list(
+        Enrollment.objects.filter(
+            academic_year=rollover.from_year, pk__gt=rollover.last_pk, pk__lte=rollover.max_enrollment_pk,
+        ).exclude(student__standard=LEAVING_STANDARD).filter(student__left_in__isnull=True)
+        .order_by('pk').values_list('pk', 'student_id', 'course_id', 'student__standard')[:chunk_size]
+    )
+    if not rows:
+        return 0
+    existing = set(
+        Enrollment.objects.filter(
+            academic_year=rollover.to_year, student_id__in={row[1] for row in rows},
+        ).values_list('student_id', 'course_id')
+    )
+    # copies come before promotion, so the new year's class is one above the student's
+    new = [
+        Enrollment(student_id=student_id, course_id=course_id, academic_year=rollover.to_year,
+                   standard=str(int(standard) + 1))
+        for _, student_id, course_id, standard in rows if (student_id, course_id) not in existing
+    ]
+    Enrollment.objects.bulk_create(new, ignore_conflicts=True)
+    _checkpoint(rollover, rows[-1][0], enrollments_created=len(new), enrollments_skipped=len(rows) - len(new))
+    return len(rows)
+
+
+def _students(rollover, chunk_size):
+    rows = list(
+        Student.objects.filter(pk__gt=rollover.last_pk, pk__lte=rollover.max_student_pk, left_in__isnull=True)
+        .order_by('pk').values_list('pk', 'standard')[:chunk_size]
+    )
+    if not rows:
+        return 0
+    leavers = [pk for pk, standard in rows if standard == LEAVING_STANDARD]
+    promoted = Student.objects.filter(pk__in=[pk for pk, _ in rows]).exclude(
+        standard=LEAVING_STANDARD
+    ).update(standard=_PROMOTED)
+    Student.objects.filter(pk__in=leavers).update(left_in=rollover.from_year)
+    if leavers and rollover.leavers == 'deactivate':
+        User.objects.filter(pk__in=leavers).update(is_active=False)
+        # update() sends no signals; their cached token identities must go
+        transaction.on_commit(lambda: invalidate_user(leavers))
+    _checkpoint(rollover, rows[-1][0], students_promoted=promoted, students_left=len(leavers))
+    return len(rows)
+
+
+def _finish(rollover, chunk_size):
+    set_current_academic_year(rollover.to_year)
+    rebuild_course_statistics(academic_year=rollover.to_year)
+    # every class roster and per-user view changed; none of the bulk writes sent signals
+    response_cache.invalidate_courses(*Course.objects.values_list('pk', flat=True))
+    bump_global_version()
+    teacher_ids = set(
+        CourseTeaching.objects.filter(academic_year=rollover.to_year).values_list('teacher_id', flat=True)
+    )
+    transaction.on_commit(lambda: invalidate_assignments(*teacher_ids))
+    rollover.finished_at = timezone.now()
+    rollover.save(update_fields=['finished_at'])
+    return 0
+
+
+_STEPS = {'teachings': _teachings, 'enrollments': _enrollments, 'students': _students, 'finish': _finish}
+
+
+def run(rollover, chunk_size=1000, progress=None):
+    """
+    Run (or resume) `rollover` to completion. `progress(rollover, processed)`
+    is called after every committed chunk.
+    """
+    while rollover.step != 'done':
+        with transaction.atomic():
+            processed = _STEPS[rollover.step](rollover, chunk_size)
+            if not processed:
+                rollover.step = YearRollover.STEPS[YearRollover.STEPS.index(rollover.step) + 1]
+                rollover.last_pk = 0
+                rollover.save(update_fields=['step', 'last_pk'])
+        if progress is not None:
+            progress(rollover, processed)
+    return rollover
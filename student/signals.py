@@ -0,0 +1,71 @@
+# student/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from account.conditional import bump_user_versions
+from student.models import Enrollment, Student
+from student import statistics
+from teacher import response_cache
+
+
+# --- CourseStatistics maintenance ---
+@receiver(post_save, sender=Enrollment)
+def _update_statistics_on_enrollment_save(sender, instance, created: bool, **kwargs):
+    statistics.enrollment_saved(instance, created)
+
+
+@receiver(post_delete, sender=Enrollment)
+def _update_statistics_on_enrollment_delete(sender, instance, **kwargs):
+    statistics.enrollment_deleted(instance)
+
+
+@receiver(post_save, sender=Student)
+def _update_statistics_on_standard_change(sender, instance, created: bool, **kwargs):
+    if not created and instance.has_changed("standard"):
+        statistics.student_standard_changed(instance)
+
+
+# --- Conditional GET versions (student profile, my-performance) ---
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def _bump_version_on_student_change(sender, instance, **kwargs):
+    bump_user_versions(instance.user_id)
+
+
+@receiver(post_save, sender=Enrollment)
+def _bump_version_on_enrollment_save(sender, instance, **kwargs):
+    student_ids = {instance.student_id}
+    if instance.is_tracked("student_id"):
+        student_ids.add(instance.previous_value("student_id"))
+    bump_user_versions(*student_ids)
+
+
+@receiver(post_delete, sender=Enrollment)
+def _bump_version_on_enrollment_delete(sender, instance, **kwargs):
+    bump_user_versions(instance.student_id)
+
+
+# --- Teacher analytics response cache (course_performance / course_statistics) ---
+def _class_of(enrollment, previous=False):
+    get = enrollment.previous_value if previous else (lambda f: getattr(enrollment, f))
+    return (get("course_id"), get("standard"), get("academic_year"))
+
+
+@receiver(post_save, sender=Enrollment)
+def _invalidate_responses_on_enrollment_save(sender, instance, created: bool, **kwargs):
+    classes = [_class_of(instance)]
+    moved = ("course_id", "standard", "academic_year")
+    if not created and all(instance.is_tracked(f) for f in moved) and any(instance.has_changed(f) for f in moved):
+        classes.append(_class_of(instance, previous=True))
+    response_cache.invalidate_classes(classes)
+
+
+@receiver(post_delete, sender=Enrollment)
+def _invalidate_responses_on_enrollment_delete(sender, instance, **kwargs):
+    response_cache.invalidate_classes([_class_of(instance)])
+
+
+@receiver(post_save, sender=Student)
+def _invalidate_responses_on_standard_change(sender, instance, created: bool, **kwargs):
+    if not created and instance.is_tracked("standard") and instance.has_changed("standard"):
+        response_cache.invalidate_student(instance.pk, {instance.standard, instance.previous_value("standard")})
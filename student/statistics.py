@@ -0,0 +1,182 @@
+# student/statistics.py
+"""
+Keeps the CourseStatistics summary table in step with Enrollment.
+
+Single-row writes go through `enrollment_saved` / `enrollment_deleted`
+(called from student.signals) and adjust the running totals in place. Bulk
+writes, which send no signals, call `refresh_course_statistics` with the keys
+they touched, and `rebuild_course_statistics` recomputes everything.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, Min, Q, Sum
+
+from account.school_year import current_academic_year
+
+from .models import CourseStatistics, Enrollment
+
+PASS_MARKS = CourseStatistics.PASS_MARKS
+
+
+def aggregate_statistics(enrollments):
+    """GROUP BY (course, standard, academic_year) over an Enrollment queryset."""
+    return (
+        enrollments
+        .values('course_id', 'academic_year', 'standard')
+        .annotate(
+            total_students=Count('id'),
+            graded_count=Count('marks_obtained'),
+            marks_sum=Sum('marks_obtained'),
+            marks_sum_squares=Sum(
+                F('marks_obtained') * F('marks_obtained'),
+                output_field=DecimalField(max_digits=16, decimal_places=4),
+            ),
+            lowest_marks=Min('marks_obtained'),
+            highest_marks=Max('marks_obtained'),
+            pass_count=Count('id', filter=Q(marks_obtained__gte=PASS_MARKS)),
+            fail_count=Count('id', filter=Q(marks_obtained__lt=PASS_MARKS)),
+        )
+        .order_by()
+    )
+
+
+def _from_aggregate(row):
+    return CourseStatistics(
+        course_id=row['course_id'],
+        standard=row['standard'],
+        academic_year=row['academic_year'],
+        total_students=row['total_students'],
+        graded_count=row['graded_count'],
+        marks_sum=row['marks_sum'] or 0,
+        marks_sum_squares=row['marks_sum_squares'] or 0,
+        lowest_marks=row['lowest_marks'],
+        highest_marks=row['highest_marks'],
+        pass_count=row['pass_count'],
+        fail_count=row['fail_count'],
+    )
+
+
+def _key_filter(keys):
+    q = Q()
+    for course_id, standard, academic_year in keys:
+        q |= Q(course_id=course_id, standard=standard, academic_year=academic_year)
+    return q
+
+
+def refresh_course_statistics(keys, chunk_size=200):
+    """Recompute the given (course_id, standard, academic_year) rows from Enrollment."""
+    keys = list(set(keys))
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        with transaction.atomic():
+            rows = aggregate_statistics(Enrollment.objects.filter(_key_filter(chunk)))
+            CourseStatistics.objects.filter(_key_filter(chunk)).delete()
+            CourseStatistics.objects.bulk_create([_from_aggregate(row) for row in rows])
+
+
+def rebuild_course_statistics(academic_year=None, batch_size=500):
+    """Drop and recompute every summary row (optionally for one academic year)."""
+    enrollments = Enrollment.objects.all()
+    existing = CourseStatistics.objects.all()
+    if academic_year:
+        enrollments = enrollments.filter(academic_year=academic_year)
+        existing = existing.filter(academic_year=academic_year)
+    with transaction.atomic():
+        existing.delete()
+        created = CourseStatistics.objects.bulk_create(
+            (_from_aggregate(row) for row in aggregate_statistics(enrollments).iterator()),
+            batch_size=batch_size,
+        )
+    return len(created)
+
+
+# --- Incremental maintenance ---
+
+def _apply(key, marks, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one enrollment's contribution to a summary
+    row. Returns True when the row had to be recomputed from Enrollment instead,
+    in which case it already reflects what is in the database.
+    """
+    course_id, standard, academic_year = key
+    if standard is None:
+        return False
+    lookup = dict(course_id=course_id, standard=standard, academic_year=academic_year)
+    with transaction.atomic():
+        rows = CourseStatistics.objects.select_for_update()
+        if sign > 0:
+            stats, _ = rows.get_or_create(**lookup)
+        else:
+            stats = rows.filter(**lookup).first()
+            if stats is None:
+                return False
+
+        stats.total_students += sign
+        if marks is not None:
+            marks = Decimal(str(marks))
+            if sign < 0 and marks in (stats.lowest_marks, stats.highest_marks):
+                # the extreme may have been unique; min/max cannot be un-merged
+                refresh_course_statistics([key])
+                return True
+            stats.graded_count += sign
+            stats.marks_sum += sign * marks
+            stats.marks_sum_squares += sign * marks * marks
+            if marks >= PASS_MARKS:
+                stats.pass_count += sign
+            else:
+                stats.fail_count += sign
+            if sign > 0:
+                if stats.lowest_marks is None or marks < stats.lowest_marks:
+                    stats.lowest_marks = marks
+                if stats.highest_marks is None or marks > stats.highest_marks:
+                    stats.highest_marks = marks
+        stats.save()
+    return False
+
+
+def enrollment_saved(enrollment, created):
+    new_key = (enrollment.course_id, enrollment.standard, enrollment.academic_year)
+    if created:
+        _apply(new_key, enrollment.marks_obtained, 1)
+        return
+    if not enrollment.changed_fields():
+        return
+    if not all(enrollment.is_tracked(f) for f in enrollment.tracked_fields):
+        # saved without being loaded first: the old contribution is unknown
+        refresh_course_statistics([new_key])
+        return
+
+    old_key = (
+        enrollment.previous_value('course_id'),
+        enrollment.previous_value('standard'),
+        enrollment.previous_value('academic_year'),
+    )
+    with transaction.atomic():
+        refreshed = _apply(old_key, enrollment.previous_value('marks_obtained'), -1)
+        if not (refreshed and old_key == new_key):
+            _apply(new_key, enrollment.marks_obtained, 1)
+
+
+def enrollment_deleted(enrollment):
+    def stored(field):
+        return enrollment.previous_value(field) if enrollment.is_tracked(field) else getattr(enrollment, field)
+
+    key = (stored('course_id'), stored('standard'), stored('academic_year'))
+    _apply(key, stored('marks_obtained'), -1)
+
+
+def student_standard_changed(student):
+    """
+    A student moved class (a correction; rollover promotes in bulk): their
+    enrollments in the current academic year move with them, earlier years
+    keep the class they were taken in.
+    """
+    year = current_academic_year()
+    enrollments = Enrollment.objects.filter(student=student, academic_year=year)
+    course_ids = set(enrollments.values_list('course_id', flat=True))
+    enrollments.update(standard=student.standard)
+    old = student.previous_value('standard')
+    refresh_course_statistics(
+        (course_id, std, year) for course_id in course_ids for std in (old, student.standard)
+    )
@@ -1,3 +1,266 @@
-from django.test import TestCase
-
-# Create your tests here.
+from decimal import Decimal
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from account.models import User
+from account.school_year import current_academic_year
+from account.tests import LOCAL_CACHES, CacheResetMixin, token_client
+from student import rollover
+from student.models import CourseStatistics, Enrollment, Student
+from student.statistics import rebuild_course_statistics
+from teacher.models import Course, CourseTeaching, Teacher
+
+STATISTICS_COLUMNS = (
+    'course_id', 'standard', 'academic_year', 'total_students', 'graded_count', 'marks_sum',
+    'marks_sum_squares', 'lowest_marks', 'highest_marks', 'pass_count', 'fail_count',
+)
+
+
+def statistics():
+    return sorted(CourseStatistics.objects.values_list(*STATISTICS_COLUMNS))
+
+
+def make_student(n, standard):
+    user = User.objects.create_user(email=f's{n}@example.com', name=f'Student {n}', role='student')
+    return Student.objects.create(user=user, student_id=f'S{n}', standard=standard)
+
+
+def make_teacher(n=0):
+    user = User.objects.create_user(email=f't{n}@example.com', name=f'Teacher {n}', role='teacher')
+    return Teacher.objects.create(user=user, teacher_id=f'T{n}', department='primary')
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class CourseStatisticsTests(TestCase):
+    """The incrementally maintained rows must always equal a full rebuild."""
+
+    def setUp(self):
+        self.year = current_academic_year()
+        self.maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        self.science = Course.objects.create(course_code='SCI', course_name='Science')
+        self.students = [make_student(n, '5' if n < 3 else '6') for n in range(5)]
+
+    def enroll(self, student, course, marks=None, year=None):
+        return Enrollment.objects.create(student=student, course=course, academic_year=year or self.year,
+                                         marks_obtained=marks)
+
+    def assertMatchesRebuild(self):
+        incremental = statistics()
+        rebuild_course_statistics()
+        self.assertEqual(incremental, statistics())
+
+    def test_creates_and_mark_updates(self):
+        enrollments = [self.enroll(s, self.maths) for s in self.students]
+        self.enroll(self.students[0], self.science, Decimal('12.25'))
+        for enrollment, marks in zip(enrollments, ['91', '33', '32.99', None, '70']):
+            enrollment.marks_obtained = None if marks is None else Decimal(marks)
+            enrollment.save()
+        self.assertMatchesRebuild()
+
+        row = CourseStatistics.objects.get(course=self.maths, standard='5', academic_year=self.year)
+        self.assertEqual((row.total_students, row.graded_count, row.pass_count, row.fail_count), (3, 3, 2, 1))
+        self.assertEqual((row.lowest_marks, row.highest_marks), (Decimal('32.99'), Decimal('91')))
+
+    def test_removing_the_extreme_marks(self):
+        enrollments = [self.enroll(s, self.maths, Decimal(m)) for s, m in zip(self.students[:3], ['40', '80', '80'])]
+        enrollments[0].marks_obtained = Decimal('60')  # the unique minimum moves up
+        enrollments[0].save()
+        enrollments[1].delete()  # one of two equal maxima goes
+        self.assertMatchesRebuild()
+        enrollments[2].marks_obtained = None
+        enrollments[2].save()
+        self.assertMatchesRebuild()
+
+    def test_moves_between_courses_years_and_students(self):
+        enrollment = self.enroll(self.students[0], self.maths, Decimal('55'))
+        enrollment.course = self.science
+        enrollment.save()
+        self.assertMatchesRebuild()
+        enrollment.academic_year = '2023-2024'
+        enrollment.save()
+        self.assertMatchesRebuild()
+        # a student in another class: the row moves to that class
+        enrollment.student = self.students[4]
+        enrollment.save()
+        self.assertEqual(enrollment.standard, '6')
+        self.assertMatchesRebuild()
+
+    def test_saved_with_deferred_fields(self):
+        enrollment = self.enroll(self.students[0], self.maths, Decimal('20'))
+        partial = Enrollment.objects.only('id', 'marks_obtained').get(pk=enrollment.pk)
+        partial.marks_obtained = Decimal('95')
+        partial.save()
+        self.assertMatchesRebuild()
+        self.assertEqual(CourseStatistics.objects.get(course=self.maths, standard='5').highest_marks, 95)
+
+    def test_standard_change_moves_only_the_current_year(self):
+        student = self.students[0]
+        current = self.enroll(student, self.maths, Decimal('75'))
+        past = self.enroll(student, self.maths, Decimal('65'), year='2023-2024')
+        student.standard = '7'
+        student.save()
+
+        current.refresh_from_db()
+        past.refresh_from_db()
+        self.assertEqual((current.standard, past.standard), ('7', '5'))
+        self.assertMatchesRebuild()
+
+    def test_rollover_leaves_the_old_year_alone(self):
+        for student in self.students:
+            self.enroll(student, self.maths, Decimal('50'))
+        before = [row for row in statistics() if row[2] == self.year]
+
+        to_year = f"{int(self.year[:4]) + 1}-{int(self.year[:4]) + 2}"
+        rollover.run(rollover.start(self.year, to_year))
+
+        self.assertEqual([row for row in statistics() if row[2] == self.year], before)
+        self.assertEqual(
+            sorted(Enrollment.objects.filter(academic_year=to_year).values_list('standard', flat=True)),
+            ['6', '6', '6', '7', '7'],
+        )
+        self.assertMatchesRebuild()
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class UpdateMarksTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.year = current_academic_year()
+        self.maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        self.science = Course.objects.create(course_code='SCI', course_name='Science')
+        teacher = make_teacher()
+        CourseTeaching.objects.create(teacher=teacher, course=self.maths, standard='5', academic_year=self.year)
+        self.student = make_student(0, '5')
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.maths, academic_year=self.year)
+        self.client = token_client(teacher.user)
+
+    def update(self, enrollment, data, method='patch'):
+        return getattr(self.client, method)(f'/api/enrollments/{enrollment.pk}/update_marks/', data, format='json')
+
+    def test_sets_marks_and_grade(self):
+        response = self.update(self.enrollment, {'marks_obtained': '95'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['data']['marks_obtained'], response.data['data']['grade']), ('95.00', 'A1'))
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.marks_obtained, self.enrollment.grade), (Decimal('95'), 'A1'))
+        # the grade follows a change of total_marks too
+        self.update(self.enrollment, {'total_marks': '200'})
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.grade, 'C2')
+
+    def test_cannot_move_the_enrollment(self):
+        other = make_student(1, '5')
+        response = self.update(self.enrollment, {
+            'course': self.science.pk, 'student': other.pk, 'academic_year': '2020-2021',
+            'grade': 'A1', 'marks_obtained': '40',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(
+            (self.enrollment.course_id, self.enrollment.student_id, self.enrollment.academic_year),
+            (self.maths.pk, self.student.pk, self.year),
+        )
+        self.assertEqual(self.enrollment.grade, 'D')
+
+    def test_rejects_out_of_range_marks(self):
+        for marks in ('100.01', '-1', 'NaN', '12.345'):
+            with self.subTest(marks=marks):
+                self.assertEqual(self.update(self.enrollment, {'marks_obtained': marks}).status_code, 400)
+        self.enrollment.refresh_from_db()
+        self.assertIsNone(self.enrollment.marks_obtained)
+
+    def test_other_classes_are_forbidden(self):
+        science = Enrollment.objects.create(student=self.student, course=self.science, academic_year=self.year)
+        self.assertEqual(self.update(science, {'marks_obtained': '50'}).status_code, 403)
+
+    def test_post_does_not_overwrite_marks(self):
+        self.assertEqual(self.update(self.enrollment, {'marks_obtained': '50'}, 'post').status_code, 200)
+        self.assertEqual(self.update(self.enrollment, {'marks_obtained': '60'}, 'post').status_code, 400)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class BulkMarksUploadTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.year = current_academic_year()
+        self.maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        teacher = make_teacher()
+        CourseTeaching.objects.create(teacher=teacher, course=self.maths, standard='5', academic_year=self.year)
+        for n in range(2):
+            Enrollment.objects.create(student=make_student(n, '5'), course=self.maths, academic_year=self.year)
+        self.client = token_client(teacher.user)
+
+    def upload(self, content):
+        return self.client.post('/api/enrollments/bulk-marks/', {
+            'course_id': self.maths.pk, 'standard': '5', 'academic_year': self.year,
+            'file': SimpleUploadedFile('marks.csv', content, content_type='text/csv'),
+        }, format='multipart')
+
+    def test_reads_the_csv(self):
+        response = self.upload('\ufeffstudent_id,marks_obtained\r\nS0,91\r\nS1,\r\n'.encode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(Enrollment.objects.values_list('student__student_id', 'grade')), [('S0', 'A1'), ('S1', None)]
+        )
+
+    def test_undecodable_file_is_a_bad_request(self):
+        response = self.upload(b'student_id,marks_obtained\nS0,91\nS1,\xe9\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+
+    def test_malformed_csv_is_a_bad_request(self):
+        response = self.upload(b'student_id,marks_obtained\nS0,91\nS1,' + b'9' * 200000 + b'\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+        self.assertFalse(Enrollment.objects.exclude(marks_obtained=None).exists())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class EnrollStandardCommandTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.year = current_academic_year()
+        self.maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        self.science = Course.objects.create(course_code='SCI', course_name='Science')
+        for n in range(3):
+            make_student(n, '5')
+        make_student(3, '6')
+
+    def enroll(self, *args):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('enroll_standard', '5', *args, stdout=out)
+        return out.getvalue()
+
+    def test_rejects_bad_arguments(self):
+        for args, message in [
+            (['--course', 'MATH', '--academic-year', '2024'], 'not an academic year'),
+            (['--course', 'MATH', '--academic-year', '2024-2026'], 'not an academic year'),
+            (['--course', 'ART'], "No course 'ART'"),
+            (['--course', '999'], "No course '999'"),
+        ]:
+            with self.subTest(args=args):
+                with self.assertRaisesMessage(CommandError, message):
+                    self.enroll(*args)
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_rerun_is_idempotent(self):
+        self.assertIn('3 students x 2 courses, 6 enrollments created, 0 skipped',
+                      self.enroll('--course', 'MATH', '--course', str(self.science.pk)))
+        self.assertIn('0 enrollments created, 6 skipped',
+                      self.enroll('--course', 'MATH', '--course', 'SCI'))
+        self.assertEqual(Enrollment.objects.filter(academic_year=self.year, standard='5').count(), 6)
+        self.assertEqual(
+            CourseStatistics.objects.get(course=self.maths, standard='5', academic_year=self.year).total_students, 3
+        )
+
+    def test_rerun_fills_gaps_only(self):
+        self.enroll('--course', 'MATH')
+        make_student(4, '5')
+        self.assertIn('4 students x 1 courses, 1 enrollments created, 3 skipped', self.enroll('--course', 'MATH'))
@@ -1,155 +1,336 @@
-from rest_framework import viewsets, status
-from rest_framework.response import Response
-from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from .models import Student, Enrollment
-from account.serializers import EnrollmentCreateSerializer, EnrollmentSerializer, StudentSerializer
-from account.permissions import IsStudent, IsTeacher
-from teacher.models import CourseTeaching
-
-class StudentViewSet(viewsets.ViewSet):
-    permission_classes = [IsAuthenticated]
-    
-    @action(detail=False, methods=['get'], permission_classes=[IsStudent])
-    def profile(self, request):
-        try:
-            student = Student.objects.get(user=request.user)
-            serializer = StudentSerializer(student)
-            return Response(serializer.data)
-        except Student.DoesNotExist:
-            return Response({"error": "Student profile not found"}, status=status.HTTP_404_NOT_FOUND)
-
-class StudentPerformanceViewSet(viewsets.ViewSet):
-    permission_classes = [IsAuthenticated]
-    
-    @action(detail=False, methods=['get'], permission_classes=[IsStudent], url_path='my-performance')
-    def my_performance(self, request):
-        try:
-            student = Student.objects.get(user=request.user)
-            enrollments = Enrollment.objects.filter(student=student)
-            serializer = EnrollmentSerializer(enrollments, many=True)
-            return Response(serializer.data)
-        except Student.DoesNotExist:
-            return Response({"error": "Student profile not found"}, status=status.HTTP_404_NOT_FOUND)
-    
-    @action(detail=False, methods=['get'], permission_classes=[IsTeacher], url_path='class-results')
-    def class_results(self, request):
-        standard = request.GET.get('standard')
-        course_id = request.GET.get('course_id')
-        academic_year = request.GET.get('academic_year', '2024-2025')
-        
-        if not standard or not course_id:
-            return Response({"error": "standard and course_id parameters are required"}, 
-                        status=status.HTTP_400_BAD_REQUEST)
-        
-        if not CourseTeaching.objects.filter(
-            teacher=request.user.teacher,
-            course_id=course_id,
-            standard=standard,
-            academic_year=academic_year
-        ).exists():
-            return Response({"error": "Not authorized to access these results. You don't teach this course to this class."}, 
-                        status=status.HTTP_403_FORBIDDEN)
-        
-        enrollments = Enrollment.objects.filter(
-            student__standard=standard,
-            course_id=course_id,
-            academic_year=academic_year
-        ).select_related('student__user', 'course')
-        
-        serializer = EnrollmentSerializer(enrollments, many=True)
-        return Response(serializer.data)
-    
-@action(detail=True, methods=['patch', 'post'], permission_classes=[IsTeacher])
-def update_marks(self, request, pk=None):
-    enrollment = get_object_or_404(Enrollment, pk=pk)
-    
-    # Check if teacher is authorized to update these marks
-    if not CourseTeaching.objects.filter(
-        teacher=request.user.teacher,
-        course=enrollment.course,
-        standard=enrollment.student.standard,
-        academic_year=enrollment.academic_year
-    ).exists():
-        return Response({"error": "Not authorized to update these marks"}, 
-                      status=status.HTTP_403_FORBIDDEN)
-    
-    # Handle both PATCH (update) and POST (create marks)
-    if request.method == 'POST' and enrollment.marks_obtained is not None:
-        return Response({"error": "Marks already exist. Use PATCH to update."},
-                      status=status.HTTP_400_BAD_REQUEST)
-    
-    serializer = EnrollmentSerializer(enrollment, data=request.data, partial=True)
-    if serializer.is_valid():
-        serializer.save()
-        return Response({
-            "message": "Marks updated successfully",
-            "data": serializer.data
-        })
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    @action(detail=False, methods=['get'], permission_classes=[IsTeacher], url_path='student-performance')
-    def student_performance(self, request):
-        student_id = request.GET.get('student_id')
-        
-        if not student_id:
-            return Response({"error": "student_id parameter is required"}, 
-                        status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            # FIX: Use the correct field name - student has user_id, not id
-            student = Student.objects.get(user_id=student_id)
-            enrollments = Enrollment.objects.filter(student=student)
-            
-            # Check if teacher teaches any of this student's courses
-            student_standards = enrollments.values_list('student__standard', flat=True).distinct()
-            authorized = CourseTeaching.objects.filter(
-                teacher=request.user.teacher,
-                standard__in=student_standards
-            ).exists()
-            
-            if not authorized:
-                return Response({"error": "Not authorized to view this student's performance"}, 
-                            status=status.HTTP_403_FORBIDDEN)
-            
-            serializer = EnrollmentSerializer(enrollments, many=True)
-            return Response(serializer.data)
-            
-        except Student.DoesNotExist:
-            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
-        
-# class EnrollmentViewSet(viewsets.ModelViewSet):
-#     queryset = Enrollment.objects.all()
-#     permission_classes = [IsAuthenticated, IsTeacher]
-#     serializer_class = EnrollmentCreateSerializer
-    
-#     def create(self, request):
-#         serializer = self.get_serializer(data=request.data)
-#         if serializer.is_valid():
-#             enrollment = serializer.save()
-#             return Response(EnrollmentSerializer(enrollment).data, status=status.HTTP_201_CREATED)
-#         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-class EnrollmentViewSet(viewsets.ModelViewSet):
-    queryset = Enrollment.objects.all()
-    permission_classes = [IsAuthenticated, IsTeacher]
-    serializer_class = EnrollmentCreateSerializer
-    
-    def list(self, request):
-        # Simple response without related fields first
-        enrollments = self.get_queryset()
-        data = []
-        for enrollment in enrollments:
-            data.append({
-                "enrollment_id": enrollment.id,
-                "student": enrollment.student_id,  # Just use ID instead of name
-                "course": enrollment.course_id,    # Just use ID instead of name
-                "enrollment_date": enrollment.enrollment_date,
-                "academic_year": enrollment.academic_year,
-                "grade": enrollment.grade,
-                "marks_obtained": enrollment.marks_obtained,
-                "total_marks": enrollment.total_marks,
-
-            })
-        return Response(data)
\ No newline at end of file
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+from django.db import transaction
+from .models import Student, Enrollment
+from teacher.models import Course
+from account.serializers import (
+    EnrollmentCreateSerializer, EnrollmentMarksSerializer, EnrollmentSerializer, StudentSerializer,
+)
+from account.school_year import current_academic_year, is_academic_year
+from account.conditional import bump_user_versions, conditional_get
+from account.fieldsets import sparse_fields
+from account.pagination import EnrollmentCursorPagination
+from account.permissions import IsSchoolAdmin, IsStudent, IsSuperAdmin, IsTeacher
+from teacher import response_cache
+from teacher.assignments import teaches, taught_standards
+from .enrollment import enroll_standard
+from .statistics import refresh_course_statistics
+from home.db_routers import ReadReplicaMixin
+
+
+class MarksFileError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+
+
+def _read_marks_csv(upload):
+    """Rows of an uploaded marks CSV; MarksFileError names the 1-based line it cannot read."""
+    data = upload.read()
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError as exc:
+        raise MarksFileError(data.count(b'\n', 0, exc.start) + 1, "File is not UTF-8 encoded") from exc
+    reader = csv.DictReader(io.StringIO(text, newline=''))
+    try:
+        return list(reader)
+    except csv.Error as exc:
+        # line_num counts the lines parsed before the failing one
+        raise MarksFileError(reader.line_num + 1, f"Malformed CSV: {exc}") from exc
+
+class StudentViewSet(ReadReplicaMixin, viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsStudent])
+    @conditional_get
+    def profile(self, request):
+        try:
+            context = {'request': request}
+            student = StudentSerializer.setup_eager_loading(Student.objects.filter(user=request.user), context).get()
+            serializer = StudentSerializer(student, context=context)
+            return Response(serializer.data)
+        except Student.DoesNotExist:
+            return Response({"error": "Student profile not found"}, status=status.HTTP_404_NOT_FOUND)
+
+class StudentPerformanceViewSet(ReadReplicaMixin, viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsStudent], url_path='my-performance')
+    @conditional_get
+    def my_performance(self, request):
+        try:
+            student = Student.objects.get(user=request.user)
+            enrollments = Enrollment.objects.filter(student=student)
+            return Response(EnrollmentSerializer.read_many(enrollments, {'request': request}))
+        except Student.DoesNotExist:
+            return Response({"error": "Student profile not found"}, status=status.HTTP_404_NOT_FOUND)
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsTeacher], url_path='class-results')
+    def class_results(self, request):
+        standard = request.GET.get('standard')
+        course_id = request.GET.get('course_id')
+        academic_year = request.GET.get('academic_year') or current_academic_year()
+        
+        if not standard or not course_id:
+            return Response({"error": "standard and course_id parameters are required"}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+        
+        if not teaches(request.user.teacher.pk, course_id, standard, academic_year):
+            return Response({"error": "Not authorized to access these results. You don't teach this course to this class."}, 
+                        status=status.HTTP_403_FORBIDDEN)
+        
+        enrollments = Enrollment.objects.filter(
+            standard=standard,
+            course_id=course_id,
+            academic_year=academic_year
+        )
+        
+        return Response(EnrollmentSerializer.read_many(enrollments, {'request': request}))
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsTeacher], url_path='student-performance')
+    def student_performance(self, request):
+        student_id = request.GET.get('student_id')
+        
+        if not student_id:
+            return Response({"error": "student_id parameter is required"}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            # FIX: Use the correct field name - student has user_id, not id
+            student = Student.objects.get(user_id=student_id)
+            enrollments = list(EnrollmentSerializer.setup_eager_loading(
+                Enrollment.objects.filter(student=student), {'request': request}
+            ))
+            
+            # Check if teacher teaches any of this student's courses
+            authorized = bool(enrollments) and student.standard in taught_standards(request.user.teacher.pk)
+            
+            if not authorized:
+                return Response({"error": "Not authorized to view this student's performance"}, 
+                            status=status.HTTP_403_FORBIDDEN)
+            
+            serializer = EnrollmentSerializer(enrollments, many=True, context={'request': request})
+            return Response(serializer.data)
+            
+        except Student.DoesNotExist:
+            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+# class EnrollmentViewSet(viewsets.ModelViewSet):
+#     queryset = Enrollment.objects.all()
+#     permission_classes = [IsAuthenticated, IsTeacher]
+#     serializer_class = EnrollmentCreateSerializer
+    
+#     def create(self, request):
+#         serializer = self.get_serializer(data=request.data)
+#         if serializer.is_valid():
+#             enrollment = serializer.save()
+#             return Response(EnrollmentSerializer(enrollment).data, status=status.HTTP_201_CREATED)
+#         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class EnrollmentViewSet(viewsets.ModelViewSet):
+    queryset = Enrollment.objects.all()
+    permission_classes = [IsAuthenticated, IsTeacher]
+    serializer_class = EnrollmentCreateSerializer
+    pagination_class = EnrollmentCursorPagination
+    
+    # response key -> column; rows come straight from values(), no model instances
+    LIST_COLUMNS = {
+        "enrollment_id": "id",
+        "student": "student_id",
+        "course": "course_id",
+        "enrollment_date": "enrollment_date",
+        "academic_year": "academic_year",
+        "grade": "grade",
+        "marks_obtained": "marks_obtained",
+        "total_marks": "total_marks",
+    }
+    
+    def list(self, request):
+        enrollments = self.get_queryset()
+        
+        for param, lookup in (('student', 'student_id'), ('course', 'course_id')):
+            value = request.GET.get(param)
+            if value:
+                try:
+                    enrollments = enrollments.filter(**{lookup: int(value)})
+                except ValueError:
+                    return Response({"error": f"{param} must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        academic_year = request.GET.get('academic_year')
+        if academic_year:
+            enrollments = enrollments.filter(academic_year=academic_year)
+        
+        standard = request.GET.get('standard')
+        if standard:
+            enrollments = enrollments.filter(standard=standard)
+        
+        # ?fields= / ?omit= pick the columns; `id` is always read for the cursor
+        keys = sparse_fields(request, self.LIST_COLUMNS)
+        columns = {self.LIST_COLUMNS[key] for key in keys} | {'id'}
+        rows = self.paginate_queryset(enrollments.values(*columns))
+        data = [{key: row[self.LIST_COLUMNS[key]] for key in keys} for row in rows]
+        return self.get_paginated_response(data)
+    
+    @action(detail=True, methods=['patch', 'post'], permission_classes=[IsTeacher])
+    def update_marks(self, request, pk=None):
+        enrollment = get_object_or_404(Enrollment, pk=pk)
+        
+        # Check if teacher is authorized to update these marks
+        if not teaches(request.user.teacher.pk, enrollment.course_id,
+                       enrollment.standard, enrollment.academic_year):
+            return Response({"error": "Not authorized to update these marks"}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        # Handle both PATCH (update) and POST (create marks)
+        if request.method == 'POST' and enrollment.marks_obtained is not None:
+            return Response({"error": "Marks already exist. Use PATCH to update."},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        # only the marks are writable here: the course, student and year stay as authorized
+        serializer = EnrollmentMarksSerializer(enrollment, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response({
+                "message": "Marks updated successfully",
+                "data": EnrollmentSerializer(enrollment, context={'request': request}).data
+            })
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Bulk marks entry for one class: authorize once, validate every row in
+    # memory, then write all changes with a single bulk_update.
+    # JSON: {"course_id", "standard", "academic_year", "marks": [{"student": <pk> | "student_id": "STU0001", "marks_obtained": 78.5}, ...]}
+    # or multipart with the same fields and a CSV `file` (columns student/student_id, marks_obtained).
+    @action(detail=False, methods=['post'], permission_classes=[IsTeacher], url_path='bulk-marks')
+    def bulk_marks(self, request):
+        course_id = request.data.get('course_id')
+        standard = request.data.get('standard')
+        academic_year = request.data.get('academic_year') or current_academic_year()
+        
+        if not course_id or not standard:
+            return Response({"error": "course_id and standard are required"}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        try:
+            course_id = int(course_id)
+        except (TypeError, ValueError):
+            return Response({"error": "course_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not teaches(request.user.teacher.pk, course_id, standard, academic_year):
+            return Response({"error": "Not authorized to update these marks"}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        upload = request.FILES.get('file')
+        if upload is not None:
+            try:
+                rows = _read_marks_csv(upload)
+            except MarksFileError as exc:
+                return Response({"errors": [{"line": exc.line, "error": str(exc)}]},
+                              status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = request.data.get('marks')
+        if not isinstance(rows, list) or not rows:
+            return Response({"error": "Provide a non-empty 'marks' list or a CSV 'file'"}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        enrollments = list(
+            Enrollment.objects.filter(
+                course_id=course_id,
+                standard=standard,
+                academic_year=academic_year
+            ).select_related('student').only(
+                'id', 'student_id', 'marks_obtained', 'grade', 'total_marks', 'student__student_id'
+            )
+        )
+        by_pk = {str(e.student_id): e for e in enrollments}
+        by_code = {e.student.student_id: e for e in enrollments}
+        
+        errors, seen, changed = [], set(), []
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors.append({"row": index, "error": "Expected an object"})
+                continue
+            key = row.get('student') or row.get('student_id')
+            enrollment = by_pk.get(str(key)) or by_code.get(str(key))
+            if enrollment is None:
+                errors.append({"row": index, "error": f"Student {key!r} is not enrolled in this class"})
+                continue
+            if enrollment.pk in seen:
+                errors.append({"row": index, "error": f"Duplicate row for student {key!r}"})
+                continue
+            seen.add(enrollment.pk)
+            
+            marks = row.get('marks_obtained')
+            try:
+                marks = None if marks in (None, '') else Decimal(str(marks))
+            except InvalidOperation:
+                errors.append({"row": index, "error": f"Invalid marks {marks!r}"})
+                continue
+            # Decimal() also accepts 'NaN' and 'Infinity', which cannot be compared
+            if marks is not None and not marks.is_finite():
+                errors.append({"row": index, "error": f"Invalid marks {row.get('marks_obtained')!r}"})
+                continue
+            if marks is not None and (marks < 0 or marks > enrollment.total_marks
+                                      or marks != marks.quantize(Decimal('0.01'))):
+                errors.append({"row": index, "error": f"Marks must be between 0 and {enrollment.total_marks} with at most 2 decimals"})
+                continue
+            
+            grade = Enrollment.grade_for(marks, enrollment.total_marks)
+            if marks != enrollment.marks_obtained or grade != enrollment.grade:
+                enrollment.marks_obtained = marks
+                enrollment.grade = grade
+                changed.append(enrollment)
+        
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            Enrollment.objects.bulk_update(changed, ['marks_obtained', 'grade'], batch_size=500)
+            # bulk_update sends no signals
+            refresh_course_statistics([(course_id, standard, academic_year)])
+            bump_user_versions(*(e.student_id for e in changed))
+            response_cache.invalidate_classes([(course_id, standard, academic_year)])
+        
+        return Response({
+            "message": "Marks updated successfully",
+            "updated": len(changed),
+            "unchanged": len(rows) - len(changed),
+        })
+    
+    # Enroll a whole class for a year in one INSERT per 500 rows; students
+    # already enrolled in a course that year are skipped.
+    # JSON: {"standard": "5", "course_ids": [1, 2], "academic_year": "2024-2025"}
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated, IsSchoolAdmin | IsSuperAdmin],
+            url_path='enroll-standard')
+    def enroll_standard(self, request):
+        standard = request.data.get('standard')
+        course_ids = request.data.get('course_ids')
+        academic_year = request.data.get('academic_year') or current_academic_year()
+        
+        if str(standard) not in dict(Student.STANDARD_CHOICES):
+            return Response({"error": "standard must be one of 1-10"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if not is_academic_year(academic_year):
+            return Response({"error": "academic_year must look like '2024-2025'"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(course_ids, list) or not course_ids:
+            return Response({"error": "course_ids must be a non-empty list"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        try:
+            course_ids = {int(pk) for pk in course_ids}
+        except (TypeError, ValueError):
+            return Response({"error": "course_ids must contain integers only"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        missing = course_ids - set(Course.objects.filter(pk__in=course_ids).values_list('pk', flat=True))
+        if missing:
+            return Response({"error": f"Unknown course ids: {sorted(missing)}"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        result = enroll_standard(str(standard), course_ids, academic_year)
+        return Response(result, status=status.HTTP_201_CREATED if result["created"] else status.HTTP_200_OK)
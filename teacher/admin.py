@@ -1,8 +1,8 @@
-from django.contrib import admin
-from .models import *
-
-# Register your models here.
-
-admin.site.register(Teacher)
-admin.site.register(Course)
+from django.contrib import admin
+from .models import *
+
+# Register your models here.
+
+admin.site.register(Teacher)
+admin.site.register(Course)
 admin.site.register(CourseTeaching)
\ No newline at end of file
@@ -1,6 +1,9 @@
-from django.apps import AppConfig
-
-
-class TeacherConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'teacher'
+from django.apps import AppConfig
+
+
+class TeacherConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'teacher'
+
+    def ready(self):
+        import teacher.signals
@@ -0,0 +1,64 @@
+# teacher/assignments.py
+"""
+Cached set of each teacher's (course_id, standard, academic_year) assignments.
+
+Authorization checks in the teacher and student views become set lookups
+instead of a CourseTeaching query per request. teacher.signals drops a
+teacher's entry whenever one of their CourseTeaching rows is saved or deleted;
+other workers see that once their local copy (30s) expires, which needs the
+shared cache from settings.CACHES.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from account.caching import LRUCache, shared_ttl
+from .models import CourseTeaching
+
+ASSIGNMENT_CACHE_TTL = shared_ttl(getattr(settings, 'TEACHER_ASSIGNMENT_CACHE_TTL', 3600))
+
+_local_assignments = LRUCache(
+    maxsize=getattr(settings, 'TEACHER_ASSIGNMENT_LOCAL_CACHE_SIZE', 2000),
+    ttl=getattr(settings, 'TEACHER_ASSIGNMENT_LOCAL_CACHE_TTL', 30),
+)
+
+
+def _cache_key(teacher_id):
+    return f'teacher:assignments:{teacher_id}'
+
+
+def teaching_assignments(teacher_id):
+    """frozenset of (course_id, standard, academic_year) the teacher is assigned to."""
+    assignments = _local_assignments.get(teacher_id)
+    if assignments is None:
+        assignments = cache.get(_cache_key(teacher_id))
+        if assignments is None:
+            assignments = frozenset(
+                CourseTeaching.objects.filter(teacher_id=teacher_id)
+                .values_list('course_id', 'standard', 'academic_year')
+            )
+            cache.set(_cache_key(teacher_id), assignments, ASSIGNMENT_CACHE_TTL)
+        _local_assignments.set(teacher_id, assignments)
+    return assignments
+
+
+def teaches(teacher_id, course_id, standard, academic_year):
+    """True if the teacher teaches `course_id` to `standard` in `academic_year`."""
+    try:
+        course_id = int(course_id)
+    except (TypeError, ValueError):
+        return False
+    return (course_id, str(standard), academic_year) in teaching_assignments(teacher_id)
+
+
+def taught_standards(teacher_id):
+    return {standard for _, standard, _ in teaching_assignments(teacher_id)}
+
+
+def taught_course_ids(teacher_id):
+    return {course_id for course_id, _, _ in teaching_assignments(teacher_id)}
+
+
+def invalidate_assignments(*teacher_ids):
+    for teacher_id in teacher_ids:
+        _local_assignments.delete(teacher_id)
+        cache.delete(_cache_key(teacher_id))
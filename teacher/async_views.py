@@ -0,0 +1,25 @@
+# teacher/async_views.py
+"""Async counterparts of the teacher read endpoints (see account.async_api)."""
+from account.async_api import async_endpoint, render
+from account.conditional import aconditional_get
+from account.serializers import CourseTeachingSerializer, TeacherSerializer
+from .models import CourseTeaching, Teacher
+
+
+@async_endpoint('teacher')
+@aconditional_get
+async def profile(request):
+    teacher = await TeacherSerializer.setup_eager_loading(
+        Teacher.objects.filter(user_id=request.user.pk)
+    ).afirst()
+    if teacher is None:
+        return render({"error": "Teacher profile not found"}, 404)
+    return render(TeacherSerializer(teacher).data)
+
+
+@async_endpoint('teacher')
+@aconditional_get
+async def my_courses(request):
+    reader = CourseTeachingSerializer.compiled_reader()
+    rows = [row async for row in reader.values(CourseTeaching.objects.filter(teacher_id=request.user.teacher.pk))]
+    return render(reader.data(rows))
@@ -1,58 +1,58 @@
-# Generated by Django 5.2.5 on 2025-08-30 10:31
-
-import django.db.models.deletion
-from django.conf import settings
-from django.db import migrations, models
-
-
-class Migration(migrations.Migration):
-
-    initial = True
-
-    dependencies = [
-        ('account', '0002_application'),
-    ]
-
-    operations = [
-        migrations.CreateModel(
-            name='Course',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('course_code', models.CharField(max_length=10, unique=True)),
-                ('course_name', models.CharField(max_length=100)),
-                ('description', models.TextField(blank=True, null=True)),
-                ('created_at', models.DateTimeField(auto_now_add=True)),
-            ],
-        ),
-        migrations.CreateModel(
-            name='Teacher',
-            fields=[
-                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
-                ('teacher_id', models.CharField(max_length=20, unique=True)),
-                ('date_of_birth', models.DateField(blank=True, null=True)),
-                ('address', models.TextField(blank=True, null=True)),
-                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
-                ('hire_date', models.DateField(auto_now_add=True)),
-                ('department', models.CharField(choices=[('primary', 'Primary Section'), ('secondary', 'Secondary Section')], max_length=100)),
-            ],
-        ),
-        migrations.CreateModel(
-            name='CourseTeaching',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('standard', models.CharField(choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], max_length=2)),
-                ('academic_year', models.CharField(default='2024-2025', max_length=9)),
-                ('is_class_teacher', models.BooleanField(default=False)),
-                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teacher.course')),
-                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teacher.teacher')),
-            ],
-            options={
-                'unique_together': {('teacher', 'course', 'standard', 'academic_year')},
-            },
-        ),
-        migrations.AddField(
-            model_name='course',
-            name='teachers',
-            field=models.ManyToManyField(related_name='courses_taught', through='teacher.CourseTeaching', to='teacher.teacher'),
-        ),
-    ]
+# Generated by Django 5.2.5 on 2025-08-30 10:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('account', '0002_application'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Course',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_code', models.CharField(max_length=10, unique=True)),
+                ('course_name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Teacher',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('teacher_id', models.CharField(max_length=20, unique=True)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('address', models.TextField(blank=True, null=True)),
+                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
+                ('hire_date', models.DateField(auto_now_add=True)),
+                ('department', models.CharField(choices=[('primary', 'Primary Section'), ('secondary', 'Secondary Section')], max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CourseTeaching',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('standard', models.CharField(choices=[('1', 'Class 1'), ('2', 'Class 2'), ('3', 'Class 3'), ('4', 'Class 4'), ('5', 'Class 5'), ('6', 'Class 6'), ('7', 'Class 7'), ('8', 'Class 8'), ('9', 'Class 9'), ('10', 'Class 10')], max_length=2)),
+                ('academic_year', models.CharField(default='2024-2025', max_length=9)),
+                ('is_class_teacher', models.BooleanField(default=False)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teacher.course')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teacher.teacher')),
+            ],
+            options={
+                'unique_together': {('teacher', 'course', 'standard', 'academic_year')},
+            },
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='teachers',
+            field=models.ManyToManyField(related_name='courses_taught', through='teacher.CourseTeaching', to='teacher.teacher'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courseteaching',
+            index=models.Index(fields=['course', 'standard', 'academic_year'], name='courseteaching_class_idx'),
+        ),
+    ]
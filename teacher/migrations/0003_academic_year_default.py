@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:40
+
+import account.school_year
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='courseteaching',
+            name='academic_year',
+            field=models.CharField(default=account.school_year.current_academic_year, max_length=9),
+        ),
+    ]
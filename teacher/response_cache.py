@@ -0,0 +1,128 @@
+# teacher/response_cache.py
+"""
+Response cache for the per-class analytics endpoints (course_performance,
+course_statistics).
+
+Entries are keyed on (endpoint, course, standard, academic_year, query
+string) plus two version tokens: one per class ("cell") and one per course.
+teacher.signals drops a cell's token when an Enrollment in it or the standard
+or name of one of its students changes, and a course's token when the course
+or its teaching assignments change. Entries under a dropped token are never
+read again and age out. Authorization is not cached; views check it first.
+
+Uses the TEACHER_RESPONSE_CACHE alias when it is configured in CACHES, and
+otherwise a cache private to this process. That fallback only sees
+invalidations from its own process, so it is only accurate with a single worker.
+
+Hit/miss counters are kept per process: counting in the shared cache would
+add two round trips to every lookup.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from account import caching
+from student.models import Enrollment
+
+RESPONSE_CACHE_ALIAS = getattr(settings, 'TEACHER_RESPONSE_CACHE', 'default')
+RESPONSE_CACHE_TTL = getattr(settings, 'TEACHER_RESPONSE_CACHE_TTL', 600)
+
+_local = None
+_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def _cache():
+    global _local
+    if RESPONSE_CACHE_ALIAS in settings.CACHES:
+        return caches[RESPONSE_CACHE_ALIAS]
+    if _local is None:
+        _local = LocMemCache('teacher-responses', {'TIMEOUT': RESPONSE_CACHE_TTL})
+    return _local
+
+
+def is_process_local():
+    """True if invalidations from other processes (management commands) never reach this cache."""
+    return RESPONSE_CACHE_ALIAS not in settings.CACHES or caching.is_process_local(RESPONSE_CACHE_ALIAS)
+
+
+def _token(key):
+    cache = _cache()
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        token = cache.get(key) or uuid.uuid4().hex
+    return token
+
+
+def _cell_key(course_id, standard, academic_year):
+    return f'teacher:response:cell:{course_id}:{standard}:{academic_year}'
+
+
+def _course_key(course_id):
+    return f'teacher:response:course:{course_id}'
+
+
+def _count(outcome):
+    with _counts_lock:
+        _counts[outcome] += 1
+
+
+def cache_key(endpoint, course_id, standard, academic_year, request):
+    """Key for this class as of now; compute it before reading the data it will hold."""
+    params = urlencode(sorted(request.GET.lists()), doseq=True)
+    query = hashlib.md5(params.encode(), usedforsecurity=False).hexdigest()
+    return ':'.join([
+        'teacher:response', endpoint, str(course_id), str(standard), academic_year, query,
+        _token(_course_key(course_id)), _token(_cell_key(course_id, standard, academic_year)),
+    ])
+
+
+def lookup(key):
+    """Cached response data or None, counting the hit or miss."""
+    data = _cache().get(key)
+    _count('hits' if data is not None else 'misses')
+    return data
+
+
+def store(key, data):
+    _cache().set(key, data, RESPONSE_CACHE_TTL)
+
+
+def invalidate_classes(keys):
+    """Drop cached responses for these (course_id, standard, academic_year) once the write commits."""
+    cache_keys = [_cell_key(*key) for key in set(keys) if None not in key]
+    if cache_keys:
+        transaction.on_commit(lambda: _cache().delete_many(cache_keys))
+
+
+def invalidate_student(student_id, standards):
+    """Every class roster the student appears in, under each of `standards`."""
+    rows = (
+        Enrollment.objects.filter(student_id=student_id)
+        .values_list('course_id', 'academic_year').distinct()
+    )
+    invalidate_classes((course_id, standard, year) for course_id, year in rows for standard in standards)
+
+
+def invalidate_courses(*course_ids):
+    cache_keys = [_course_key(course_id) for course_id in course_ids if course_id is not None]
+    if cache_keys:
+        transaction.on_commit(lambda: _cache().delete_many(cache_keys))
+
+
+def stats():
+    """Lookups answered by this worker process since it started."""
+    with _counts_lock:
+        hits, misses = _counts['hits'], _counts['misses']
+    total = hits + misses
+    return {'process': os.getpid(), 'hits': hits, 'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None}
@@ -0,0 +1,50 @@
+# teacher/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from account.conditional import bump_global_version, bump_user_versions
+from teacher import response_cache
+from teacher.assignments import invalidate_assignments
+from teacher.models import Course, CourseTeaching, Teacher
+
+
+# --- Keep the per-teacher assignment cache in step with CourseTeaching ---
+# Dropped on commit: dropped earlier, a concurrent request could cache the
+# pre-commit assignments again for the full TTL.
+@receiver(post_save, sender=CourseTeaching)
+def _forget_assignments_on_save(sender, instance, **kwargs):
+    teacher_ids = {instance.teacher_id}
+    if instance.is_tracked("teacher_id"):
+        # reassigned rows also leave the previous teacher's set
+        teacher_ids.add(instance.previous_value("teacher_id"))
+    transaction.on_commit(lambda: invalidate_assignments(*teacher_ids))
+    bump_user_versions(*teacher_ids)
+    # Course.teachers is part of the cached analytics responses
+    course_ids = {instance.course_id}
+    if instance.is_tracked("course_id"):
+        course_ids.add(instance.previous_value("course_id"))
+    response_cache.invalidate_courses(*course_ids)
+
+
+@receiver(post_delete, sender=CourseTeaching)
+def _forget_assignments_on_delete(sender, instance, **kwargs):
+    teacher_id = instance.teacher_id
+    transaction.on_commit(lambda: invalidate_assignments(teacher_id))
+    bump_user_versions(instance.teacher_id)
+    response_cache.invalidate_courses(instance.course_id)
+
+
+# --- Conditional GET versions (teacher profile, my-courses) ---
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+def _bump_version_on_teacher_change(sender, instance, **kwargs):
+    bump_user_versions(instance.user_id)
+
+
+# course names appear in every user's enrollments and assignments
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def _bump_global_version_on_course_change(sender, instance, **kwargs):
+    bump_global_version()
+    response_cache.invalidate_courses(instance.pk)
@@ -1,3 +1,81 @@
-from django.test import TestCase
-
-# Create your tests here.
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from account.models import User
+from account.school_year import current_academic_year
+from account.tests import LOCAL_CACHES, CacheResetMixin, token_client
+from student.models import Enrollment, Student
+from teacher import assignments, response_cache
+from teacher.models import Course, CourseTeaching, Teacher
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class AssignmentCacheTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user(email='t@example.com', name='Teacher', role='teacher')
+        self.teacher = Teacher.objects.create(user=user, teacher_id='T1', department='primary')
+        self.maths = Course.objects.create(course_code='MATH', course_name='Maths')
+
+    def test_dropped_only_once_the_change_commits(self):
+        self.assertEqual(assignments.teaching_assignments(self.teacher.pk), frozenset())
+        with self.captureOnCommitCallbacks() as callbacks:
+            teaching = CourseTeaching.objects.create(teacher=self.teacher, course=self.maths, standard='5',
+                                                     academic_year='2024-2025')
+            self.assertIsNotNone(cache.get(assignments._cache_key(self.teacher.pk)))
+        for callback in callbacks:
+            callback()
+        self.assertTrue(assignments.teaches(self.teacher.pk, self.maths.pk, '5', '2024-2025'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            teaching.delete()
+        self.assertFalse(assignments.teaches(self.teacher.pk, self.maths.pk, '5', '2024-2025'))
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ResponseCacheTests(CacheResetMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.year = current_academic_year()
+        user = User.objects.create_user(email='t@example.com', name='Teacher', role='teacher')
+        teacher = Teacher.objects.create(user=user, teacher_id='T1', department='primary')
+        self.maths = Course.objects.create(course_code='MATH', course_name='Maths')
+        CourseTeaching.objects.create(teacher=teacher, course=self.maths, standard='5', academic_year=self.year)
+        student_user = User.objects.create_user(email='s@example.com', name='Student', role='student')
+        self.student = Student.objects.create(user=student_user, student_id='S1', standard='5')
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.maths,
+                                                    academic_year=self.year, marks_obtained=Decimal('50'))
+        self.client = token_client(user)
+        self.performance = f'/api/teacher/course_performance/?course_id={self.maths.pk}&standard=5'
+        self.statistics = '/api/teacher/course-statistics/?course_code=MATH&standard=5'
+
+    def get(self, url, expected):
+        response = self.client.get(url)
+        self.assertEqual((response.status_code, response['X-Cache']), (200, expected))
+        return response.data
+
+    def test_repeat_is_a_hit(self):
+        before = response_cache.stats()
+        self.assertEqual(self.get(self.performance, 'MISS'), self.get(self.performance, 'HIT'))
+        after = response_cache.stats()
+        self.assertEqual((after['hits'] - before['hits'], after['misses'] - before['misses']), (1, 1))
+
+    def test_marks_change_is_a_miss(self):
+        self.get(self.performance, 'MISS')
+        self.get(self.statistics, 'MISS')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollment.marks_obtained = Decimal('80')
+            self.enrollment.save()
+        self.assertEqual(self.get(self.performance, 'MISS')['enrollments'][0]['marks_obtained'], '80.00')
+        self.assertEqual(self.get(self.statistics, 'MISS')['statistics']['highest_marks'], 80.0)
+
+    def test_student_rename_is_a_miss(self):
+        self.get(self.performance, 'MISS')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.user.name = 'Renamed'
+            self.student.user.save()
+        self.assertEqual(self.get(self.performance, 'MISS')['enrollments'][0]['student_name'], 'Renamed')
@@ -1,129 +1,134 @@
-from rest_framework import viewsets, status
-from rest_framework.response import Response
-from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from .models import Course, CourseTeaching
-from account.serializers import CourseSerializer, CourseTeachingSerializer, EnrollmentSerializer, TeacherSerializer
-from student.models import Enrollment, Student
-from account.permissions import IsTeacher
-from django.db.models import Avg, Max, Min, Count, Q
-
-class TeacherViewSet(viewsets.ViewSet):
-    permission_classes = [IsAuthenticated, IsTeacher]
-    
-    @action(detail=False, methods=['get'])
-    def profile(self, request):
-        try:
-            teacher = request.user.teacher
-            serializer = TeacherSerializer(teacher)
-            return Response(serializer.data)
-        except:
-            return Response({"error": "Teacher profile not found"}, status=status.HTTP_404_NOT_FOUND)
-    
-    @action(detail=False, methods=['get'], url_path='my-courses')
-    def my_courses(self, request):
-        teachings = CourseTeaching.objects.filter(teacher=request.user.teacher)
-        serializer = CourseTeachingSerializer(teachings, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def course_performance(self, request):
-        course_id = request.GET.get('course_id')
-        standard = request.GET.get('standard')
-        academic_year = request.GET.get('academic_year', '2024-2025')
-        
-        if not course_id or not standard:
-            return Response({"error": "course_id and standard parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        if not CourseTeaching.objects.filter(
-            teacher=request.user.teacher,
-            course_id=course_id,
-            standard=standard,
-            academic_year=academic_year
-        ).exists():
-            return Response({"error": "Not authorized to access this course"}, status=status.HTTP_403_FORBIDDEN)
-        
-        enrollments = Enrollment.objects.filter(
-            course_id=course_id,
-            student__standard=standard,
-            academic_year=academic_year
-        ).select_related('student__user')
-        
-        course = get_object_or_404(Course, id=course_id)
-        
-        return Response({
-            'course': CourseSerializer(course).data,
-            'enrollments': EnrollmentSerializer(enrollments, many=True).data
-        })
-    
-    @action(detail=False, methods=['get'], url_path='my-students')
-    def my_students(self, request):
-        teachings = CourseTeaching.objects.filter(teacher=request.user.teacher)
-        standards = teachings.values_list('standard', flat=True).distinct()
-        course_ids = teachings.values_list('course_id', flat=True).distinct()
-        
-        students = Student.objects.filter(standard__in=standards).select_related('user')
-        
-        enrollments = Enrollment.objects.filter(
-            student__in=students,
-            course_id__in=course_ids
-        ).select_related('student__user', 'course')
-        
-        serializer = EnrollmentSerializer(enrollments, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'], url_path='course-statistics')
-    def course_statistics(self, request):
-        course_code = request.GET.get('course_code')
-        standard = request.GET.get('standard')
-        academic_year = request.GET.get('academic_year', '2024-2025')
-        
-        if not course_code or not standard:
-            return Response({"error": "course_code and standard parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            course = Course.objects.get(course_code=course_code)
-        except Course.DoesNotExist:
-            return Response({"error": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
-        
-        if not CourseTeaching.objects.filter(
-            teacher=request.user.teacher,
-            course=course,
-            standard=standard,
-            academic_year=academic_year
-        ).exists():
-            return Response({"error": "Not authorized to access this course"}, status=status.HTTP_403_FORBIDDEN)
-        
-        enrollments = Enrollment.objects.filter(
-            course=course,
-            student__standard=standard,
-            academic_year=academic_year
-        ).select_related('student__user')
-        
-        stats = enrollments.aggregate(
-            total_students=Count('id'),
-            average_marks=Avg('marks_obtained'),
-            highest_marks=Max('marks_obtained'),
-            lowest_marks=Min('marks_obtained'),
-            pass_count=Count('id', filter=Q(marks_obtained__gte=33)),
-            fail_count=Count('id', filter=Q(marks_obtained__lt=33))
-        )
-        
-        serializer = EnrollmentSerializer(enrollments, many=True)
-        
-        response_data = {
-            'course': CourseSerializer(course).data,
-            'statistics': {
-                'total_students': stats['total_students'] or 0,
-                'average_marks': float(stats['average_marks'] or 0),
-                'highest_marks': float(stats['highest_marks'] or 0),
-                'lowest_marks': float(stats['lowest_marks'] or 0),
-                'pass_count': stats['pass_count'] or 0,
-                'fail_count': stats['fail_count'] or 0,
-                'pass_percentage': round((stats['pass_count'] / stats['total_students'] * 100), 2) if stats['total_students'] and stats['total_students'] > 0 else 0
-            },
-            'student_performance': serializer.data
-        }
-        
-        return Response(response_data)
\ No newline at end of file
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+from .models import Course, CourseTeaching, Teacher
+from account.serializers import CourseSerializer, CourseTeachingSerializer, EnrollmentSerializer, TeacherSerializer
+from student.models import CourseStatistics, Enrollment, Student
+from . import response_cache
+from .assignments import teaches, taught_course_ids, taught_standards
+from account.school_year import current_academic_year
+from account.conditional import conditional_get
+from account.permissions import IsTeacher
+from home.db_routers import ReadReplicaMixin
+
+class TeacherViewSet(ReadReplicaMixin, viewsets.ViewSet):
+    permission_classes = [IsAuthenticated, IsTeacher]
+    
+    @action(detail=False, methods=['get'])
+    @conditional_get
+    def profile(self, request):
+        try:
+            teacher = Teacher.objects.select_related('user').get(user=request.user)
+            serializer = TeacherSerializer(teacher)
+            return Response(serializer.data)
+        except Teacher.DoesNotExist:
+            return Response({"error": "Teacher profile not found"}, status=status.HTTP_404_NOT_FOUND)
+    
+    @action(detail=False, methods=['get'], url_path='my-courses')
+    @conditional_get
+    def my_courses(self, request):
+        teachings = CourseTeaching.objects.filter(teacher=request.user.teacher)
+        return Response(CourseTeachingSerializer.read_many(teachings))
+    
+    @action(detail=False, methods=['get'])
+    def course_performance(self, request):
+        course_id = request.GET.get('course_id')
+        standard = request.GET.get('standard')
+        academic_year = request.GET.get('academic_year') or current_academic_year()
+        
+        if not course_id or not standard:
+            return Response({"error": "course_id and standard parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not teaches(request.user.teacher.pk, course_id, standard, academic_year):
+            return Response({"error": "Not authorized to access this course"}, status=status.HTTP_403_FORBIDDEN)
+        
+        key = response_cache.cache_key('course_performance', int(course_id), standard, academic_year, request)
+        cached = response_cache.lookup(key)
+        if cached is not None:
+            return Response(cached, headers={'X-Cache': 'HIT'})
+        
+        enrollments = Enrollment.objects.filter(
+            course_id=course_id,
+            standard=standard,
+            academic_year=academic_year
+        )
+        
+        course = get_object_or_404(Course, id=course_id)
+        
+        response_data = {
+            'course': CourseSerializer(course).data,
+            'enrollments': EnrollmentSerializer.read_many(enrollments, {'request': request})
+        }
+        response_cache.store(key, response_data)
+        return Response(response_data, headers={'X-Cache': 'MISS'})
+    
+    @action(detail=False, methods=['get'], url_path='my-students')
+    def my_students(self, request):
+        standards = taught_standards(request.user.teacher.pk)
+        course_ids = taught_course_ids(request.user.teacher.pk)
+        
+        # students who have left school (Student.left_in) are off every roster
+        students = Student.objects.filter(standard__in=standards, left_in__isnull=True).select_related('user')
+        
+        enrollments = Enrollment.objects.filter(
+            student__in=students,
+            course_id__in=course_ids
+        )
+        
+        return Response(EnrollmentSerializer.read_many(enrollments, {'request': request}))
+    
+    @action(detail=False, methods=['get'], url_path='course-statistics')
+    def course_statistics(self, request):
+        course_code = request.GET.get('course_code')
+        standard = request.GET.get('standard')
+        academic_year = request.GET.get('academic_year') or current_academic_year()
+        
+        if not course_code or not standard:
+            return Response({"error": "course_code and standard parameters are required"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            course = Course.objects.get(course_code=course_code)
+        except Course.DoesNotExist:
+            return Response({"error": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        if not teaches(request.user.teacher.pk, course.pk, standard, academic_year):
+            return Response({"error": "Not authorized to access this course"}, status=status.HTTP_403_FORBIDDEN)
+        
+        key = response_cache.cache_key('course_statistics', course.pk, standard, academic_year, request)
+        cached = response_cache.lookup(key)
+        if cached is not None:
+            return Response(cached, headers={'X-Cache': 'HIT'})
+        
+        enrollments = Enrollment.objects.filter(
+            course=course,
+            standard=standard,
+            academic_year=academic_year
+        )
+        
+        # maintained incrementally from Enrollment writes (student.statistics)
+        stats = CourseStatistics.objects.filter(
+            course=course,
+            standard=standard,
+            academic_year=academic_year
+        ).first() or CourseStatistics()
+        
+        enrollment_data = EnrollmentSerializer.read_many(enrollments, {'request': request})
+        
+        response_data = {
+            'course': CourseSerializer(course).data,
+            'statistics': {
+                'total_students': stats.total_students,
+                'average_marks': float(stats.average_marks or 0),
+                'highest_marks': float(stats.highest_marks or 0),
+                'lowest_marks': float(stats.lowest_marks or 0),
+                'pass_count': stats.pass_count,
+                'fail_count': stats.fail_count,
+                'pass_percentage': round((stats.pass_count / stats.total_students * 100), 2) if stats.total_students > 0 else 0
+            },
+            'student_performance': enrollment_data
+        }
+        
+        response_cache.store(key, response_data)
+        return Response(response_data, headers={'X-Cache': 'MISS'})
\ No newline at end of file